@@ -0,0 +1,3 @@
+"""
+Benchmarks for the hot paths of django-validator, see run.py.
+"""
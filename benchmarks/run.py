@@ -0,0 +1,264 @@
+"""Benchmark suite for the decorators, converters and validators.
+
+It runs locally without any service, and reports the time and the peak allocated memory of each operation.
+
+Usage:
+    scripts/benchmark.sh                             # Run all the benchmarks.
+    scripts/benchmark.sh -k view.get                 # Run the benchmarks whose name contains view.get.
+    scripts/benchmark.sh --save baseline.json        # Save the result as a baseline.
+    scripts/benchmark.sh --compare baseline.json     # Compare with a baseline, exit with 1 on regressions.
+"""
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+
+import django
+
+django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+
+from django_validator.converters import ConverterRegistry  # noqa: E402
+from django_validator.decorators import GET, POST, URI, options  # noqa: E402
+from django_validator.validators import ValidatorRegistry  # noqa: E402
+from tests.tests import FakeRequest  # noqa: E402
+
+PARAM_COUNTS = (1, 10, 50)
+# Modules whose import time is measured in fresh interpreters.
+IMPORTS = ('django_validator', 'django_validator.decorators')
+MANY_SIZES = (10, 100, 1000)
+
+# Validator string and a valid value for each default validator.
+VALIDATORS = OrderedDict([
+    ('required', ('required', 'value')),
+    ('required_with', ('required_with: other', 'value')),
+    ('required_without', ('required_without: other', 'value')),
+    ('required_if', ('required_if: other, 1', 'value')),
+    ('max', ('max: 10', 'value')),
+    ('min', ('min: 1', 'value')),
+    ('between', ('between: 1, 10', 'value')),
+    ('regex', (r'regex: ^\w+$', 'value')),
+    ('integer', ('integer', '12345')),
+    ('numeric', ('numeric', '-1.5e3')),
+    ('in', ('in: a, b, value', 'value')),
+    ('not_in', ('not_in: a, b, c', 'value')),
+    ('ext_in', ('ext_in: jpg, png', SimpleUploadedFile('test.png', b'test'))),
+    ('ext_not_in', ('ext_not_in: exe', SimpleUploadedFile('test.png', b'test'))),
+])
+
+# A valid value for each default converter.
+CONVERTERS = OrderedDict([
+    ('string', 'value'),
+    ('int', '12345'),
+    ('float', '-1.5e3'),
+    ('bool', 'true'),
+    ('file', SimpleUploadedFile('test.png', b'test')),
+])
+
+
+def _view(request, **kwargs):
+    return kwargs
+
+
+def _decorated_view(decorator, count, **kwargs):
+    # A new function for each view, the decorators keep the params on it.
+    def view(*args, **view_kwargs):
+        return view_kwargs
+
+    for index in range(count):
+        view = decorator('p%d' % index, type='int', validators='required | min: 0', **kwargs)(view)
+    return view
+
+
+def view_benchmarks(codegen=False):
+    benchmarks = OrderedDict()
+    suffix = '.codegen' if codegen else ''
+    wrap = options(codegen=True) if codegen else (lambda view: view)
+    for count in PARAM_COUNTS:
+        params = {'p%d' % index: index for index in range(count)}
+
+        view = wrap(_decorated_view(GET, count))
+        request = FakeRequest(get=params)
+        benchmarks['view.get.%d%s' % (count, suffix)] = (lambda view, request: lambda: view(request))(view, request)
+
+        view = wrap(_decorated_view(POST, count))
+        request = FakeRequest(method='POST', post=params)
+        benchmarks['view.post.%d%s' % (count, suffix)] = (lambda view, request: lambda: view(request))(view, request)
+
+        view = wrap(_decorated_view(URI, count))
+        request = FakeRequest()
+        uri_kwargs = {key: str(value) for key, value in params.items()}
+        benchmarks['view.uri.%d%s' % (count, suffix)] = (
+            lambda view, request, uri_kwargs: lambda: view(request, **uri_kwargs)
+        )(view, request, uri_kwargs)
+
+    for size in MANY_SIZES:
+        view = wrap(GET('ids', type='int', many=True, validators='required')(_view))
+        request = FakeRequest(get={'ids': ','.join(str(index) for index in range(size))})
+        benchmarks['view.many.%d%s' % (size, suffix)] = (lambda view, request: lambda: view(request))(view, request)
+    return benchmarks
+
+
+def validator_benchmarks():
+    benchmarks = OrderedDict()
+    for name, (validator_str, value) in VALIDATORS.items():
+        validator = ValidatorRegistry.get_validators(validator_str)[0]
+        params = {'test': value, 'other': '1'}
+        benchmarks['validator.%s' % name] = (
+            lambda validator, params: lambda: validator('test', params)
+        )(validator, params)
+    return benchmarks
+
+
+def converter_benchmarks():
+    benchmarks = OrderedDict()
+    for name, value in CONVERTERS.items():
+        convert = ConverterRegistry.get(name).convert
+        benchmarks['converter.%s' % name] = (lambda convert, value: lambda: convert('test', value))(convert, value)
+    return benchmarks
+
+
+def all_benchmarks():
+    benchmarks = OrderedDict()
+    benchmarks.update(view_benchmarks())
+    benchmarks.update(view_benchmarks(codegen=True))
+    benchmarks.update(validator_benchmarks())
+    benchmarks.update(converter_benchmarks())
+    return benchmarks
+
+
+def measure_time(func, min_time=0.1, repeat=5):
+    """Measure the best time of a function.
+
+    Returns:
+        float: Nanoseconds per call.
+    """
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat:
+            break
+        number *= 2
+
+    best = elapsed
+    gc.disable()
+    try:
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best / number * 1e9
+
+
+def measure_memory(func):
+    """Measure the memory allocated by a function.
+
+    Returns:
+        int: Peak bytes allocated during a single call.
+    """
+    func()
+    tracemalloc.start()
+    try:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - current
+
+
+_IMPORT_TIME_SCRIPT = 'import time; start = time.perf_counter(); import {0}; print(time.perf_counter() - start)'
+_IMPORT_MEMORY_SCRIPT = 'import tracemalloc; tracemalloc.start(); import {0}; print(tracemalloc.get_traced_memory()[1])'
+
+
+def _run_script(script):
+    return float(subprocess.check_output([sys.executable, '-c', script]))
+
+
+def measure_import(module, repeat=5):
+    """Measure the import of a module in fresh interpreters.
+
+    Returns:
+        Tuple[float, int]: The best nanoseconds and the peak bytes allocated.
+    """
+    seconds = min(_run_script(_IMPORT_TIME_SCRIPT.format(module)) for _ in range(repeat))
+    return seconds * 1e9, int(_run_script(_IMPORT_MEMORY_SCRIPT.format(module)))
+
+
+def _report(results, name, ns, peak):
+    results[name] = {'ns': ns, 'peak_bytes': peak}
+    print('%-32s %12.0f ns/op %10d B/op' % (name, ns, peak))
+    sys.stdout.flush()
+
+
+def run(keyword=None):
+    results = OrderedDict()
+    for name, func in all_benchmarks().items():
+        if keyword and keyword not in name:
+            continue
+        _report(results, name, measure_time(func), measure_memory(func))
+    for module in IMPORTS:
+        name = 'import.%s' % module
+        if keyword and keyword not in name:
+            continue
+        _report(results, name, *measure_import(module))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the changes against the baseline.
+
+    Returns:
+        List[str]: Names of the benchmarks which are slower than the threshold.
+    """
+    regressions = []
+    print('\n%-32s %12s %12s %8s' % ('benchmark', 'baseline', 'current', 'change'))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['ns'], result['ns']
+        change = (new - old) / old
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('%-32s %12.0f %12.0f %+7.1f%%%s' % (name, old, new, change * 100, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks for django-validator.')
+    parser.add_argument('-k', dest='keyword', help='Only run the benchmarks whose name contains this keyword.')
+    parser.add_argument('--save', help='Save the result to this json file.')
+    parser.add_argument('--compare', help='Compare the result with this json file.')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Slowdown ratio which is reported as a regression, defaults to 0.2.')
+    args = parser.parse_args(argv)
+
+    results = run(args.keyword)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
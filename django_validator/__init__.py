@@ -1 +1,46 @@
+"""
+The common names can be imported from the package on Python 3.7 and above, the modules are loaded when the names
+are first used. On older versions, import them from the modules.
+
+Example:
+    from django_validator import GET, ValidationError
+"""
+import sys
+
 VERSION = '0.3.0'
+
+# Names exported by the package and the modules which define them.
+_EXPORTS = {
+    'param': 'decorators',
+    'options': 'decorators',
+    'GET': 'decorators',
+    'POST': 'decorators',
+    'FILE': 'decorators',
+    'POST_OR_GET': 'decorators',
+    'HEADER': 'decorators',
+    'URI': 'decorators',
+    'field': 'schema',
+    'ValidationError': 'exceptions',
+    'BaseConverter': 'converters',
+    'ConverterRegistry': 'converters',
+    'BaseValidator': 'validators',
+    'ValidatorRegistry': 'validators',
+    'get_plan': 'plans',
+    'freeze': 'plans',
+    'memory_report': 'plans',
+}
+
+if sys.version_info >= (3, 7):
+    __all__ = ['VERSION'] + sorted(_EXPORTS)
+
+    def __getattr__(name):
+        if name not in _EXPORTS:
+            raise AttributeError('module %r has no attribute %r' % (__name__, name))
+        from importlib import import_module
+
+        value = getattr(import_module('.' + _EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return __all__
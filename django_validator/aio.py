@@ -0,0 +1,127 @@
+"""Module that supports async views and async validators, Python 3 only.
+
+Decorated coroutine functions get an async wrapper automatically, and the validators which inherit
+AsyncValidator are awaited concurrently after all the sync validators passed.
+
+Example:
+    class UniqueNameValidator(AsyncValidator):
+        async def is_valid(self, value, params):
+            return not await name_exists(value)
+
+    @POST('name', validators='required', validator_classes=UniqueNameValidator())
+    async def view(request, name):
+        pass
+
+The async validators of a field run only when the sync validators of the field passed. When several async
+validators fail, the first one in the declaration order wins, so the raised error doesn't depend on timing.
+"""
+import asyncio
+from collections import OrderedDict
+from functools import wraps
+
+from .exceptions import ValidationError
+from .plans import get_plan
+from .validators import BaseValidator
+
+
+class AsyncValidator(BaseValidator):
+    """
+    Super class for async validators, is_valid must be a coroutine function.
+    """
+    __slots__ = ()
+    is_async = True
+
+    async def __call__(self, key, params, verbose_key=None):
+        value = params.get(key)
+        if value is None and self.nullable:
+            return True
+        if verbose_key is None:
+            verbose_key = key
+
+        cleaned = self.clean(value)
+        if not await self.is_valid(cleaned, params):
+            self.raise_error(value, cleaned, verbose_key)
+        return True
+
+    async def is_valid(self, value, params):
+        raise NotImplementedError
+
+
+def _run_sync_checks(plan, request, kwargs, extra_kwargs):
+    """
+    Run the sync part of the plan, return the aggregated error if the async checks should still run.
+    """
+    try:
+        plan.run(request, kwargs, extra_kwargs)
+    except ValidationError as e:
+        if not plan.collect_all:
+            raise
+        return e
+    return None
+
+
+async def _run_async_checks(plan, kwargs, sync_error):
+    skip = set(sync_error.error_dict) if sync_error is not None else ()
+    checks = [check for check in plan.async_checks if plan.get_field_name(check[1]) not in skip]
+    results = await asyncio.gather(
+        *[validator(key, kwargs, verbose_key) for validator, key, verbose_key in checks], return_exceptions=True
+    )
+    errors = OrderedDict()
+    for (validator, key, verbose_key), result in zip(checks, results):
+        if isinstance(result, ValidationError):
+            errors.setdefault(plan.get_field_name(key), []).append(result)
+        elif isinstance(result, BaseException):
+            raise result
+    return errors
+
+
+def _raise_errors(plan, sync_error, errors):
+    if sync_error is not None:
+        merged = OrderedDict(sync_error.error_dict)
+        for field, field_errors in errors.items():
+            merged.setdefault(field, []).extend(field_errors)
+        raise ValidationError.aggregate(merged)
+    if errors:
+        if plan.collect_all:
+            raise ValidationError.aggregate(errors)
+        raise next(iter(errors.values()))[0]
+
+
+async def validate(plan, request, kwargs, extra_kwargs):
+    sync_error = _run_sync_checks(plan, request, kwargs, extra_kwargs)
+    _raise_errors(plan, sync_error, await _run_async_checks(plan, kwargs, sync_error))
+
+
+def validate_sync(plan, request, kwargs, extra_kwargs):
+    """
+    Run a plan with async validators for a sync view, the sync part still runs in the current thread.
+    """
+    from asgiref.sync import async_to_sync
+
+    sync_error = _run_sync_checks(plan, request, kwargs, extra_kwargs)
+    _raise_errors(plan, sync_error, async_to_sync(_run_async_checks)(plan, kwargs, sync_error))
+
+
+def async_view_decorator(func, build_request_finder):
+    """Wrap a coroutine function with an async wrapper which validates the params.
+
+    Args:
+        func (function): The coroutine function.
+        build_request_finder (function): Build the function which finds the request and the extra kwargs from the
+            (args, kwargs) of the view, it's called with the wrapper on the first call.
+    """
+
+    @wraps(func)
+    async def _decorator(*args, **kwargs):
+        find_request = _decorator.__find_request__ or build_request_finder(_decorator)
+        request, extra_kwargs = find_request(args, kwargs)
+        if request:
+            plan = get_plan(_decorator)
+            if plan.async_checks:
+                await validate(plan, request, kwargs, extra_kwargs)
+            else:
+                plan.run(request, kwargs, extra_kwargs)
+
+        return await func(*args, **kwargs)
+
+    return _decorator
@@ -0,0 +1,150 @@
+"""Module that validates bulk payloads with the same params as the decorators.
+
+The records are validated field by field, each converter and validator makes one pass over a whole column.
+The records can be a list of dicts, or a dict of columns.
+
+Example:
+    validator = BatchValidator([
+        param('id', type='int', validators='required'),
+        param('name', validators='required | max: 32'),
+    ])
+    result = validator.validate([{'id': '1', 'name': 'a'}, {'id': 'x'}])
+    result.columns['id']  # [1, None]
+    result.errors  # {1: {'id': [...], 'name': [...]}}
+"""
+from collections import OrderedDict
+
+from .exceptions import ValidationError
+from .plans import ParamStep
+
+
+class BatchResult(object):
+    """
+    Result of a batch validation.
+
+    Attributes:
+        columns (dict): Related name to the list of converted values, failed values are None.
+        errors (dict): Row index to a field to a list of ValidationError mapping, only failed rows are present.
+        size (int): Number of the records.
+    """
+
+    def __init__(self, columns, errors, size):
+        self.columns = columns
+        self.errors = errors
+        self.size = size
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+    def get_error(self, index):
+        """Get the aggregated error of a row.
+
+        Returns:
+            Optional[ValidationError]: The aggregated error, None if the row is valid.
+        """
+        errors = self.errors.get(index)
+        return ValidationError.aggregate(errors) if errors else None
+
+    def rows(self):
+        """
+        Build the converted records, including the failed ones.
+        """
+        names = list(self.columns)
+        columns = [self.columns[name] for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+class BatchValidator(object):
+    """
+    Validate a list of records with params, the lookups of the params are ignored.
+    """
+
+    def __init__(self, params):
+        self.steps = tuple(ParamStep(_param) for _param in params)
+        for step in self.steps:
+            if any(getattr(validator, 'is_async', False) for validator in step.validators):
+                raise ValueError('Async validators are not supported in batch validation: %s.' % step.name)
+
+    def validate(self, data):
+        """Convert and validate all the records.
+
+        Args:
+            data (Union[list, dict]): A list of dicts, or a dict of lists which have the same length.
+
+        Returns:
+            BatchResult: Converted columns and the errors of each row.
+        """
+        if isinstance(data, dict):
+            size = len(next(iter(data.values()))) if data else 0
+            get_column = self._dict_column
+        else:
+            size = len(data)
+            get_column = self._list_column
+
+        errors = {}
+        failed = {}
+        columns = OrderedDict()
+        for step in self.steps:
+            columns[step.related_name], failed[step.related_name] = self._convert(
+                step, get_column(step, data, size), errors
+            )
+        for step in self.steps:
+            for validator in step.validators:
+                self._validate(step, validator, columns, failed[step.related_name], errors)
+        return BatchResult(columns, errors, size)
+
+    @staticmethod
+    def _list_column(step, data, size):
+        name = step.name
+        default = step.default
+        return [record.get(name, default) for record in data]
+
+    @staticmethod
+    def _dict_column(step, data, size):
+        column = data.get(step.name)
+        if column is None:
+            return [step.default] * size
+        if len(column) != size:
+            raise ValueError('All the columns must have the same length.')
+        return column
+
+    @staticmethod
+    def _convert(step, column, errors):
+        failed = set()
+        if not step.many and step.passthrough:
+            return list(column), failed
+
+        convert_value = step.convert_value
+        converted = []
+        append = converted.append
+        for index, value in enumerate(column):
+            try:
+                append(convert_value(value))
+            except ValidationError as e:
+                append(None)
+                failed.add(index)
+                errors.setdefault(index, OrderedDict()).setdefault(step.name, []).append(e)
+        return converted, failed
+
+    @staticmethod
+    def _validate(step, validator, columns, failed, errors):
+        key = step.related_name
+        verbose_key = step.verbose_name
+        column = columns[key]
+        dependencies = getattr(validator, 'dependencies', None)
+        if dependencies is None:
+            dependencies = [name for name in columns if name != key]
+        dependency_columns = [(name, columns[name]) for name in dependencies if name in columns]
+        # Reuse the same params dict for all the rows.
+        params = {}
+        for index, value in enumerate(column):
+            if index in failed:
+                continue
+            params[key] = value
+            for name, dependency_column in dependency_columns:
+                params[name] = dependency_column[index]
+            try:
+                validator(key, params, verbose_key)
+            except ValidationError as e:
+                errors.setdefault(index, OrderedDict()).setdefault(step.name, []).append(e)
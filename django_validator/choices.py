@@ -0,0 +1,179 @@
+"""Module that stores large choice sets for the in_file and in_source validators.
+
+The choices are lower cased, sorted and joined by newlines into a single bytes buffer, with a sparse index of
+every 64th line. It takes about the size of the text itself, and the buffer isn't touched by reference counting,
+so its pages stay shared by the workers forked after it's loaded.
+
+A file which is already normalized can be memory-mapped instead, then all the processes share the page cache.
+
+Example:
+    @GET('sku', validators='required | in_file: /data/skus.txt')
+    @GET('country', validators='in_file: /data/countries.txt, 3600, mmap')
+    @GET('region', validators='in_source: myproject.regions.load_regions, 300')
+    def view(request, sku, country, region):
+        pass
+
+The second argument is the reload interval in seconds, it can be empty. When it has passed, the next lookup starts a background
+thread to reload the source, and the requests keep using the old choices until the new ones are ready.
+"""
+import mmap
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_right
+
+import six
+from django.utils.module_loading import import_string
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+
+def _normalize(choice):
+    if isinstance(choice, six.binary_type):
+        choice = choice.decode('utf-8')
+    return choice.strip().lower().encode('utf-8')
+
+
+class ChoiceSet(object):
+    """
+    Immutable set of lower cased choices in a sorted, newline separated buffer.
+
+    The first line of every BLOCK_SIZE lines is kept in a small index. A lookup bisects the index, then finds
+    the value in a single block of the buffer.
+    """
+    BLOCK_SIZE = 64
+
+    def __init__(self, buffer, lines):
+        self.buffer = buffer
+        self.size = len(lines)
+        self.index = lines[::self.BLOCK_SIZE]
+        self.offsets = array('L')
+        offset = 0
+        for number, line in enumerate(lines):
+            if number % self.BLOCK_SIZE == 0:
+                self.offsets.append(offset)
+            offset += len(line) + 1
+        self.offsets.append(offset)
+
+    @classmethod
+    def from_iterable(cls, choices):
+        lines = sorted({_normalize(choice) for choice in choices} - {b''})
+        return cls(b''.join(line + b'\n' for line in lines), lines)
+
+    @classmethod
+    def from_file(cls, path, use_mmap=False):
+        """Load the choices from a file with one choice per line.
+
+        Args:
+            path (str): Path of the file.
+            use_mmap (bool): Map the file instead of loading it, the file must be normalized already:
+                lower cased, sorted by the UTF-8 bytes, without duplicates and ending with a newline.
+
+        Raises:
+            ValueError: When use_mmap is set but the file isn't normalized.
+        """
+        if not use_mmap:
+            with open(path, 'rb') as f:
+                return cls.from_iterable(f.read().splitlines())
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b'', [])
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        lines = buffer[:].split(b'\n')
+        last, lines = lines[-1], lines[:-1]
+        if last or any(not line or _normalize(line) != line for line in lines) or any(
+            previous >= line for previous, line in zip(lines, lines[1:])
+        ):
+            buffer.close()
+            raise ValueError('The choices file %s is not normalized.' % path)
+        return cls(buffer, lines)
+
+    def __contains__(self, value):
+        if isinstance(value, six.text_type):
+            value = value.encode('utf-8')
+        if not value or b'\n' in value:
+            return False
+        block = bisect_right(self.index, value) - 1
+        if block < 0:
+            return False
+        start, end = self.offsets[block], self.offsets[block + 1]
+        line = value + b'\n'
+        if self.buffer[start:start + len(line)] == line:
+            return True
+        return self.buffer.find(b'\n' + line, start, end) != -1
+
+    def __len__(self):
+        return self.size
+
+
+class ChoiceSource(object):
+    """
+    Load a ChoiceSet from a loader function, and reload it in the background after each interval.
+    """
+
+    def __init__(self, loader, interval=None):
+        self.loader = loader
+        self.interval = interval
+        self.choices = loader()
+        self.loaded_at = _monotonic()
+        self._reloading = threading.Lock()
+
+    def get(self):
+        """
+        Get the current choices, start a background reload if the interval has passed.
+        """
+        if self.interval is not None and _monotonic() - self.loaded_at >= self.interval:
+            if self._reloading.acquire(False):
+                thread = threading.Thread(target=self._reload)
+                thread.daemon = True
+                thread.start()
+        return self.choices
+
+    def _reload(self):
+        try:
+            self.choices = self.loader()
+        finally:
+            # Wait for another interval even if the loader failed, the old choices are still used.
+            self.loaded_at = _monotonic()
+            self._reloading.release()
+
+    def reload(self):
+        """
+        Reload the choices in the current thread.
+        """
+        with self._reloading:
+            self.choices = self.loader()
+            self.loaded_at = _monotonic()
+
+
+# Sources shared by all the validators, keyed by the kind, the location and the interval.
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def _get_source(key, loader, interval):
+    with _sources_lock:
+        source = _sources.get(key)
+        if source is None:
+            source = _sources[key] = ChoiceSource(loader, interval)
+        return source
+
+
+def file_source(path, interval=None, use_mmap=False):
+    """
+    Get the shared ChoiceSource of a file.
+    """
+    return _get_source(('file', path, interval, use_mmap), lambda: ChoiceSet.from_file(path, use_mmap), interval)
+
+
+def callable_source(func, interval=None):
+    """Get the shared ChoiceSource of a callable which returns an iterable of choices.
+
+    Args:
+        func (Union[str, function]): The callable or a dotted path to it.
+    """
+    key = ('callable', func, interval)
+    if isinstance(func, six.string_types):
+        func = import_string(func)
+    return _get_source(key, lambda: ChoiceSet.from_iterable(func()), interval)
@@ -0,0 +1,209 @@
+"""Module that generates specialized validate functions for validation plans.
+
+The generated function unrolls the param loop of a plan, inlines the default lookups and the
+required, min, max, between, in and not_in checks as plain comparisons. Other validators are called as usual.
+
+An inlined check only decides whether the value is valid. When it fails, the validator instance is called
+to raise the error, so the raised ValidationError is the same as the generic path.
+
+Enable it with the CODEGEN option, and read the generated source from the source attribute of the plan.
+
+Example:
+    @options(codegen=True)
+    @GET('limit', type='int', validators='max: 100')
+    def view(request, limit):
+        pass
+
+    print(get_plan(view).source)
+"""
+import linecache
+import re
+
+import six
+from django.core.files.base import File
+
+from .exceptions import ValidationError
+from .lookups import get_lookup_sources, get_source
+from .validators import RequiredValidator, MinValidator, MaxValidator, BetweenValidator, InValidator, NotInValidator
+
+_source_counter = [0]
+
+
+class _Writer(object):
+    """
+    Collect source lines and the constants used by the generated function.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {
+            'ValidationError': ValidationError,
+            'File': File,
+            'string_types': six.string_types,
+            'get_source': get_source,
+        }
+
+    def line(self, text, indent=1):
+        self.lines.append('    ' * indent + text)
+
+    def const(self, prefix, index, value):
+        name = '%s%d' % (prefix, index)
+        self.namespace[name] = value
+        return name
+
+
+def _write_lookup(writer, index, step, loaded):
+    sources = get_lookup_sources(step.lookup)
+    name = writer.const('name', index, step.name)
+    default = writer.const('default', index, step.default)
+    if sources is None:
+        lookup = writer.const('lookup', index, step.lookup)
+        writer.line('value = %s(request, %s, %s, kwargs, extra_kwargs)' % (lookup, name, default))
+        return
+
+    for source in sources:
+        if source not in loaded:
+            writer.line("_%s = get_source(request, '%s')" % (source, source))
+            loaded.add(source)
+
+    if sources == ('query',) or sources == ('body',) or sources == ('files',):
+        writer.line('value = _%s.get(%s, %s)' % (sources[0], name, default))
+    elif sources == ('body', 'query'):
+        writer.line('value = _body.get(%s, None)' % name)
+        writer.line('if value is None:')
+        writer.line('value = _query.get(%s, %s)' % (name, default), 2)
+    elif sources == ('meta',):
+        writer.line('value = _meta.get(%s, %s) if _meta is not None else %s' % (name, default, default))
+    else:
+        writer.line('value = kwargs[%s] if %s in kwargs else extra_kwargs.get(%s, %s)' % (name, name, name, default))
+
+
+def _write_convert(writer, index, step):
+    related_name = writer.const('related_name', index, step.related_name)
+    if step.many:
+        _step = writer.const('step', index, step)
+        writer.line('kwargs[%s] = %s.convert_value(value)' % (related_name, _step))
+        return
+    if step.passthrough:
+        writer.line('kwargs[%s] = value' % related_name)
+        return
+
+    convert = writer.const('convert', index, step.convert)
+    writer.line('try:')
+    writer.line('kwargs[%s] = %s(name%d, value)' % (related_name, convert, index), 2)
+    writer.line('except ValidationError:')
+    writer.line('raise', 2)
+    writer.line('except Exception as e:')
+    writer.line("raise ValidationError('Type Convert error: %s' % e)", 2)
+
+
+def _size_expression(value_name, string_name, file_name, number_name):
+    """
+    Build the expression of min, max and between validators for strings, files and numbers.
+    """
+    return '(%s if isinstance(%s, string_types) else (%s if isinstance(%s, File) else %s))' % (
+        string_name, value_name, file_name, value_name, number_name
+    )
+
+
+def _check_expression(writer, index, validator):
+    """
+    Build the inlined expression which is True when the value is invalid, None if it can't be inlined.
+    """
+    validator_class = type(validator)
+    if validator_class is RequiredValidator:
+        return 'value is None or (isinstance(value, string_types) and value.strip() == \'\')'
+
+    if validator_class in (MinValidator, MaxValidator, BetweenValidator):
+        if validator_class is MinValidator:
+            bound = writer.const('min', index, validator.min_value)
+            template = '%s >= ' + bound
+        elif validator_class is MaxValidator:
+            bound = writer.const('max', index, validator.max_value)
+            template = '%s <= ' + bound
+        else:
+            min_bound = writer.const('min', index, validator.min_value)
+            max_bound = writer.const('max', index, validator.max_value)
+            template = min_bound + ' <= %s <= ' + max_bound
+        return 'value is not None and not %s' % _size_expression(
+            'value', template % 'len(value)', template % 'value.size', template % 'value'
+        )
+
+    if validator_class in (InValidator, NotInValidator):
+        choices = writer.const('choices', index, validator.choices)
+        operator = 'not in' if validator_class is InValidator else 'in'
+        return 'value is not None and str(value).lower() %s %s' % (operator, choices)
+
+    return None
+
+
+def _write_check(writer, index, validator, key, verbose_key):
+    _validator = writer.const('validator', index, validator)
+    _key = writer.const('key', index, key)
+    _verbose_key = writer.const('verbose_key', index, verbose_key)
+    call = '%s(%s, kwargs, %s)' % (_validator, _key, _verbose_key)
+
+    expression = _check_expression(writer, index, validator)
+    if expression is None:
+        writer.line(call)
+    else:
+        writer.line('value = kwargs.get(%s)' % _key)
+        writer.line('if %s:' % expression)
+        # Let the validator raise the error, so the message is the same as the generic path.
+        writer.line(call, 2)
+
+
+def generate_source(plan, name='view'):
+    """Generate the source of the validate function for a plan.
+
+    Args:
+        plan (ValidationPlan): The compiled plan.
+        name (str): Name of the decorated view, used in the function name.
+
+    Returns:
+        Tuple[str, dict]: The source and the namespace to execute it.
+    """
+    name = re.sub(r'\W', '_', name)
+    writer = _Writer()
+    loaded = set()
+    writer.lines.append('def validate_%s(request, kwargs, extra_kwargs):' % name)
+    schedule = plan.schedule
+    if schedule is None:
+        schedule = [(index, ()) for index in range(len(plan.steps))] + [(None, range(len(plan.checks)))]
+    for step_index, check_indexes in schedule:
+        if step_index is not None:
+            step = plan.steps[step_index]
+            writer.line('# Param: %s' % step.name)
+            _write_lookup(writer, step_index, step, loaded)
+            _write_convert(writer, step_index, step)
+        for index in check_indexes:
+            validator, key, verbose_key = plan.checks[index]
+            writer.line('# Validator: %s of %s' % (type(validator).__name__, key))
+            _write_check(writer, index, validator, key, verbose_key)
+    writer.line('return None')
+    return '\n'.join(writer.lines) + '\n', writer.namespace
+
+
+def generate_function(plan, name='view'):
+    """Generate and compile the validate function for a plan.
+
+    The source is registered in linecache, so tracebacks and debuggers can show the generated code.
+
+    Returns:
+        Tuple[str, function]: The source and the compiled function.
+    """
+    name = re.sub(r'\W', '_', name)
+    source, namespace = generate_source(plan, name)
+    _source_counter[0] += 1
+    filename = '<django_validator:%s:%d>' % (name, _source_counter[0])
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    six.exec_(compile(source, filename, 'exec'), namespace)
+    return source, namespace['validate_%s' % name]
+
+
+def forget_source(filename):
+    """
+    Remove the source of a replaced generated function from linecache, the plans are rebuilt after each registry
+    change and the sources would pile up otherwise.
+    """
+    linecache.cache.pop(filename, None)
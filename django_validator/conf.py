@@ -0,0 +1,79 @@
+"""Module that provides the settings of django-validator.
+
+All the settings are read from the DJANGO_VALIDATOR dict in django settings.
+
+Example:
+    DJANGO_VALIDATOR = {
+        'CODEGEN': True,
+    }
+
+And a single view can override these settings with the options decorator, names are case insensitive.
+
+Example:
+    @options(codegen=True)
+    @GET('a')
+    def view(request, a):
+        pass
+"""
+
+DEFAULTS = {
+    # Generate a specialized validate function for each decorated view.
+    'CODEGEN': False,
+    # Run all the params and validators, then raise a single error with all the failures.
+    'COLLECT_ERRORS': False,
+    # Check the rules of FILE params while the files are uploading, see the uploadhandlers module.
+    'STREAM_UPLOADS': False,
+    # Check the extension rules of FILE params with the first bytes of the files too.
+    'SNIFF_UPLOADS': False,
+    # Validate each param as soon as the params its validators read are converted, and stop at the first failure.
+    'SCHEDULE_CHECKS': False,
+    # Run the validators of each param cheapest first, the raised error stays the same.
+    'ORDER_BY_COST': False,
+    # Read the declared fields of JSON bodies while they arrive, see the jsonstream module.
+    'STREAM_JSON': False,
+    # Cache the converted params of the views with only GET and URI params, True, a size or an LRUCache instance.
+    'RESULT_CACHE': False,
+    # Instrument instances or dotted paths to them, which receive the timings, see the instrumentation module.
+    'INSTRUMENTS': (),
+}
+
+# Increased when the DJANGO_VALIDATOR setting changes, compiled validation plans use it to detect changes.
+_version = 0
+# Whether _setting_changed is connected, it's connected when the first option is read.
+_connected = False
+
+
+def get_option(name, options=None):
+    """Get the value of an option.
+
+    Args:
+        name (str): Upper case name of the option.
+        options (Optional[dict]): Options of a single view, which override the settings.
+
+    Returns:
+        The value of the option.
+    """
+    if not _connected:
+        _connect()
+    if options:
+        lower_name = name.lower()
+        if lower_name in options:
+            return options[lower_name]
+    # Importing django.conf is slow, it's only needed when the plans are compiled.
+    from django.conf import settings
+
+    return getattr(settings, 'DJANGO_VALIDATOR', {}).get(name, DEFAULTS.get(name))
+
+
+def _setting_changed(setting, **kwargs):
+    global _version
+    if setting == 'DJANGO_VALIDATOR':
+        _version += 1
+
+
+def _connect():
+    global _connected
+    from django.core.signals import setting_changed
+
+    setting_changed.connect(_setting_changed)
+    _connected = True
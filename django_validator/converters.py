@@ -19,9 +19,36 @@ Example:
     ConverterExample.register()
     ConverterExample.register('example')
 """
+import warnings
+
 import six
 
-from .validators import IntegerValidator, NumericValidator
+from .exceptions import ValidationError
+from .validators import IntegerValidator, NumericValidator, _
+
+
+def _is_integer(string):
+    """
+    Same as the regex of IntegerValidator, isdecimal accepts the same unicode digits as the regex.
+    """
+    if string[:1] == '-':
+        string = string[1:]
+    return string.isdecimal()
+
+
+def _is_numeric(string):
+    """
+    Same as the regex of NumericValidator.
+    """
+    if string[:1] == '-':
+        string = string[1:]
+    mantissa, e, exponent = string.partition('e')
+    if e and not _is_integer(exponent):
+        return False
+    integer, dot, fraction = mantissa.partition('.')
+    if dot and not fraction.isdecimal():
+        return False
+    return not integer or integer.isdecimal()
 
 
 class ConverterRegistry(object):
@@ -29,6 +56,10 @@ class ConverterRegistry(object):
     Registry for all converters.
     """
     _registry = {}
+    # Increased on every register, compiled validation plans use it to detect changes.
+    _version = 0
+    # Set by plans.freeze, registering after it compiles the plans again in each worker.
+    _frozen = False
 
     @classmethod
     def register(cls, name, _class):
@@ -43,6 +74,10 @@ class ConverterRegistry(object):
                 cls._registry[_name] = _class
         else:
             cls._registry[name] = _class
+        cls._version += 1
+        if cls._frozen:
+            warnings.warn('The converter %s is registered after freeze, the plans will be compiled again in each '
+                          'worker.' % (name,), RuntimeWarning)
 
     @classmethod
     def get(cls, name):
@@ -112,6 +147,8 @@ class StringConverter(BaseConverter):
 class IntegerConverter(BaseConverter):
     """
     Convert the value to an integer value.
+
+    Strings are checked without the regex, other values and invalid strings go through IntegerValidator.
     """
     integer_validator = IntegerValidator()
 
@@ -119,7 +156,8 @@ class IntegerConverter(BaseConverter):
     def convert(key, string):
         if string is None:
             return None
-        IntegerConverter.integer_validator(key, {key: string})
+        if type(string) is not six.text_type or not _is_integer(string):
+            IntegerConverter.integer_validator(key, {key: string})
         return int(string)
 
     class Meta:
@@ -129,6 +167,8 @@ class IntegerConverter(BaseConverter):
 class FloatConverter(BaseConverter):
     """
     Convert the value to a float value.
+
+    Strings are checked without the regex, other values and invalid strings go through NumericValidator.
     """
     numeric_validator = NumericValidator()
 
@@ -136,7 +176,8 @@ class FloatConverter(BaseConverter):
     def convert(key, string):
         if string is None:
             return None
-        FloatConverter.numeric_validator(key, {key: string})
+        if type(string) is not six.text_type or not _is_numeric(string):
+            FloatConverter.numeric_validator(key, {key: string})
         return float(string)
 
     class Meta:
@@ -170,3 +211,44 @@ class FileConverter(BaseConverter):
 
     class Meta:
         name = ('file',)
+
+
+class JSONConverter(BaseConverter):
+    """
+    Decode a JSON string, the values which are decoded already, like the fields of a JSON body, are passed.
+    """
+    message = _('The {key} is not a valid JSON.')
+    code = 'json_validator'
+
+    @staticmethod
+    def convert(key, string):
+        if not isinstance(string, (six.text_type, six.binary_type)):
+            return string
+        # Importing json is only paid by the views which use it.
+        import json
+
+        try:
+            return json.loads(string)
+        except ValueError:
+            raise ValidationError(JSONConverter.message.format(key=key), JSONConverter.code)
+
+    class Meta:
+        name = 'json'
+
+
+class ObjectConverter(JSONConverter):
+    """
+    Decode a JSON object, other JSON values are rejected.
+    """
+    message = _('The {key} is not a valid JSON object.')
+    code = 'object_validator'
+
+    @staticmethod
+    def convert(key, string):
+        value = JSONConverter.convert(key, string)
+        if value is not None and not isinstance(value, dict):
+            raise ValidationError(ObjectConverter.message.format(key=key), ObjectConverter.code)
+        return value
+
+    class Meta:
+        name = 'object'
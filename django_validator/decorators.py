@@ -1,156 +1,274 @@
 from functools import wraps, partial
-import six
 
-from django.http import HttpRequest
-from django.views.generic import View
+from .lookups import _get_lookup, _post_lookup, _file_lookup, _post_or_get_lookup, _header_lookup, _uri_lookup
+from .plans import get_plan, register_view
+from .utils import LRUCache
+from .validators import ValidatorRegistry
 
-try:
-    from rest_framework.request import Request as RestRequest
-    from rest_framework.views import APIView
-except ImportError:
-    """
-    Fake class for rest_framework
+# Same as inspect.CO_COROUTINE, importing asyncio or inspect to check it is slow.
+_CO_COROUTINE = 0x80
+
+# The view and request classes of Django and Django REST framework, they are imported on the first request.
+_request_classes = None
+
+
+def iscoroutinefunction(func):
+    code = getattr(func, '__code__', None)
+    if code is not None and code.co_flags & _CO_COROUTINE:
+        return True
+    func_dict = getattr(func, '__dict__', ())
+    # Functions marked by asgiref or asyncio.coroutine, asyncio must be loaded already in this case.
+    if '_is_coroutine' in func_dict:
+        from asyncio import iscoroutinefunction as _iscoroutinefunction
+        return _iscoroutinefunction(func)
+    # Functions marked by inspect.markcoroutinefunction, which asgiref uses on Python 3.12 and above.
+    if '_is_coroutine_marker' in func_dict:
+        from inspect import iscoroutinefunction as _iscoroutinefunction
+        return _iscoroutinefunction(func)
+    return False
+
+
+def _get_request_classes():
+    """Import the view and request classes.
+
+    Returns:
+        tuple: (View, APIView, (RestRequest, HttpRequest)), APIView and RestRequest are fake classes when
+            Django REST framework is not installed.
     """
-    class RestRequest(object):
-        pass
+    global _request_classes
+    if _request_classes is None:
+        from django.http import HttpRequest
+        from django.views.generic import View
 
-    class APIView(object):
-        pass
+        try:
+            from rest_framework.request import Request as RestRequest
+            from rest_framework.views import APIView
+        except ImportError:
+            """
+            Fake class for rest_framework
+            """
+            class RestRequest(object):
+                pass
 
-from .converters import ConverterRegistry
-from .exceptions import ValidationError
-from .validators import ValidatorRegistry
+            class APIView(object):
+                pass
 
+        _request_classes = (View, APIView, (RestRequest, HttpRequest))
+    return _request_classes
 
-def _get_lookup(request, name, default, kwargs, extra_kwargs):
-    # Try to be compatible with older django rest framework.
-    if hasattr(request, 'query_params'):
-        return request.query_params.get(name, default)
-    else:
-        return request.GET.get(name, default)
+# Size of the conversion cache of a param with cache=True.
+DEFAULT_CACHE_SIZE = 256
 
 
-def _post_lookup(request, name, default, kwargs, extra_kwargs):
-    if hasattr(request, 'data'):
-        return request.data.get(name, default)
-    elif hasattr(request, 'DATA'):
-        return request.DATA.get(name, default)
+def _find_request(args):
+    """
+    Find the request object and the extra kwargs in the arguments of a view.
+    """
+    View, APIView, request_classes = _request_classes or _get_request_classes()
+    extra_kwargs = {}
+    if isinstance(args[0], View):
+        request = args[0].request
+        # Update the kwargs from Django REST framework's APIView class
+        if isinstance(args[0], APIView):
+            extra_kwargs = args[0].kwargs
+
     else:
-        return request.POST.get(name, default)
+        # Find the first request object
+        for arg in args:
+            if isinstance(arg, request_classes):
+                request = arg
+                break
+        else:
+            request = args[0]
+    return request, extra_kwargs
 
 
-def _file_lookup(request, name, default, kwargs, extra_kwargs):
-    if hasattr(request, 'data'):
-        return request.data.get(name, default)
-    else:
-        return request.FILES.get(name, default)
+def _find_api_view_request(args):
+    return args[0].request, args[0].kwargs
+
+
+def _find_view_request(args):
+    return args[0].request, {}
+
 
+def _find_first_request(args):
+    return args[0], {}
 
-def _post_or_get_lookup(request, name, default, kwargs, extra_kwargs):
-    value = _post_lookup(request, name, None, kwargs, extra_kwargs)
-    return value if value is not None else _get_lookup(request, name, default, kwargs, extra_kwargs)
 
+# The functions which find the request in the args of a view, keyed by the class of the first arg.
+_finders = {}
 
-def _header_lookup(request, name, default, kwargs, extra_kwargs):
-    if request is not None and hasattr(request, 'META'):
-        return request.META.get(name, default)
+
+def _get_finder(arg_class):
+    View, APIView, request_classes = _request_classes or _get_request_classes()
+    if issubclass(arg_class, View):
+        finder = _find_api_view_request if issubclass(arg_class, APIView) else _find_view_request
+    elif issubclass(arg_class, request_classes):
+        finder = _find_first_request
     else:
-        return default
+        # Unusual signatures, search all the args.
+        finder = _find_request
+    _finders[arg_class] = finder
+    return finder
+
+
+def _dispatch_request(args, kwargs):
+    """
+    Find the request with the function for the class of the first arg, the same as _find_request.
+    """
+    if not args:
+        return None, {}
+    finder = _finders.get(type(args[0]))
+    if finder is None:
+        finder = _get_finder(type(args[0]))
+    return finder(args)
+
+
+def _find_extra_kwargs(args):
+    """
+    Get the URI kwargs of an APIView method, the same as the default finder.
+    """
+    if args and isinstance(args[0], (_request_classes or _get_request_classes())[1]):
+        return args[0].kwargs
+    return {}
 
 
-def _uri_lookup(request, name, default, kwargs, extra_kwargs):
-    if name in kwargs:
-        return kwargs.get(name)
+def _build_request_finder(view):
+    """Build the function which finds the request and the extra kwargs in the (args, kwargs) of a decorated view.
+
+    It's built on the first call, so the options decorator can be anywhere in the decorator stack. The request_arg
+    option is the index or the keyword name of the request, when the first request in the args is not the one.
+    """
+    request_arg = (getattr(view, '__options__', None) or {}).get('request_arg')
+    if request_arg is None:
+        find_request = _dispatch_request
+    elif isinstance(request_arg, int):
+        def find_request(args, kwargs):
+            return args[request_arg] if len(args) > request_arg else None, _find_extra_kwargs(args)
     else:
-        return extra_kwargs.get(name, default)
+        def find_request(args, kwargs):
+            return kwargs.get(request_arg), _find_extra_kwargs(args)
+    view.__find_request__ = find_request
+    return find_request
+
+
+def options(**kwargs):
+    """Set the options of a single view, which override the DJANGO_VALIDATOR settings.
+
+    It can be placed anywhere in the decorator stack. The request_arg option is not a setting, it's the index or the
+    keyword name of the request in the arguments of the view, for unusual signatures.
+
+    Example:
+        @options(codegen=True)
+        @GET('a')
+        def view(request, a):
+            pass
+    """
+
+    def decorator(func):
+        view_options = dict(getattr(func, '__options__', None) or {})
+        view_options.update(kwargs)
+        func.__options__ = view_options
+        return func
+
+    return decorator
 
 
 def param(name, related_name=None, verbose_name=None, default=None, type='string', lookup=_get_lookup, many=False,
-          separator=',', validators=None, validator_classes=None):
+          separator=',', validators=None, validator_classes=None, vectorize=False, cache=False, schema=None):
     return _Param(name, related_name, verbose_name, default, type, lookup, many, separator, validators,
-                  validator_classes)
+                  validator_classes, vectorize, cache, schema)
+
+
+def _build_cache(cache):
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return LRUCache(DEFAULT_CACHE_SIZE)
+    if isinstance(cache, LRUCache):
+        return cache
+    return LRUCache(cache)
 
 
 class _Param(object):
+    """
+    Immutable declaration of a param, the attributes are kept in slots because a process may hold thousands of them.
+    """
+    __slots__ = ('name', 'related_name', 'verbose_name', 'default', 'type', 'lookup', 'many', 'separator',
+                 'validator_str', 'validator_classes', 'vectorize', 'cache', 'schema', 'validators')
+
     def __init__(self, name, related_name, verbose_name, default, type, lookup, many, separator, validators,
-                 validator_classes):
-        self.name = name
-        self.related_name = related_name if related_name else name
-        self.verbose_name = verbose_name if verbose_name else name
-        self.default = default
-        self.type = type
-        self.lookup = lookup
-        self.many = many
-        self.separator = separator
-        self.validators = ValidatorRegistry.get_validators(validators)
-        if validator_classes:
-            if hasattr(validator_classes, '__iter__'):
-                self.validators.extend(validator_classes)
+                 validator_classes, vectorize=False, cache=False, schema=None):
+        _set = super(_Param, self).__setattr__
+        _set('name', name)
+        _set('related_name', related_name if related_name else name)
+        _set('verbose_name', verbose_name if verbose_name else name)
+        _set('default', default)
+        _set('type', type)
+        _set('lookup', lookup)
+        _set('many', many)
+        _set('separator', separator)
+        _set('validator_str', validators)
+        _set('validator_classes', validator_classes)
+        _set('vectorize', vectorize)
+        _set('cache', _build_cache(cache))
+        _set('schema', schema)
+        _set('validators', self.get_validators())
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Params are immutable, declare a new param instead.')
+
+    def __delattr__(self, name):
+        raise AttributeError('Params are immutable, declare a new param instead.')
+
+    def get_validators(self):
+        """Resolve the validator string and validator classes to a list of validator instances."""
+        validators = ValidatorRegistry.get_validators(self.validator_str)
+        if self.validator_classes:
+            if hasattr(self.validator_classes, '__iter__'):
+                validators.extend(self.validator_classes)
             else:
-                self.validators.append(validator_classes)
+                validators.append(self.validator_classes)
+        return validators
+
+    def cache_info(self):
+        """Get the statistics of the conversion cache.
+
+        Returns:
+            Optional[dict]: hits, misses, size and maxsize of the cache, None if the cache is disabled.
+        """
+        return self.cache.info() if self.cache is not None else None
 
     def __call__(self, func):
         if hasattr(func, '__params__'):
             func.__params__.append(self)
             return func
 
-        @wraps(func)
-        def _decorator(*args, **kwargs):
-            if len(args) < 1:
-                # Call function immediately, maybe raise an error is better.
-                return func(*args, **kwargs)
-
-            extra_kwargs = {}
-            if isinstance(args[0], View):
-                request = args[0].request
-                # Update the kwargs from Django REST framework's APIView class
-                if isinstance(args[0], APIView):
-                    extra_kwargs = args[0].kwargs
+        if iscoroutinefunction(func):
+            from .aio import async_view_decorator
+            _decorator = async_view_decorator(func, _build_request_finder)
+        else:
+            @wraps(func)
+            def _decorator(*args, **kwargs):
+                find_request = _decorator.__find_request__ or _build_request_finder(_decorator)
+                # The request is None when there are no args, then call function immediately.
+                request, extra_kwargs = find_request(args, kwargs)
+                if request:
+                    plan = get_plan(_decorator)
+                    if plan.async_checks:
+                        from .aio import validate_sync
+                        validate_sync(plan, request, kwargs, extra_kwargs)
+                    else:
+                        plan.run(request, kwargs, extra_kwargs)
 
-            else:
-                # Find the first request object
-                for arg in args:
-                    if isinstance(arg, (RestRequest, HttpRequest)):
-                        request = arg
-                        break
-                else:
-                    request = args[0]
-
-            if request:
-                # Checkout all the params first.
-                for _param in _decorator.__params__:
-                    _param._parse(request, kwargs, extra_kwargs)
-                # Validate after all the params has checked out, because some validators needs all the params.
-                for _param in _decorator.__params__:
-                    for validator in _param.validators:
-                        validator(_param.related_name, kwargs, _param.verbose_name)
-
-            return func(*args, **kwargs)
+                return func(*args, **kwargs)
 
         _decorator.__params__ = [self]
+        _decorator.__plan__ = None
+        _decorator.__find_request__ = None
+        register_view(_decorator)
         return _decorator
 
-    def _parse(self, request, kwargs, extra_kwargs=None):
-        converter = ConverterRegistry.get(self.type)
-        value = self.lookup(request, self.name, self.default, kwargs, extra_kwargs)
-        try:
-            if self.many:
-                if isinstance(value, six.string_types):
-                    values = value.split(self.separator)
-                elif value is None:
-                    values = []
-                else:
-                    values = value
-                converted_value = [converter.convert(self.name, _value) for _value in values]
-            else:
-                converted_value = converter.convert(self.name, value)
-        except ValidationError as e:
-            raise e
-        except Exception as e:
-            raise ValidationError('Type Convert error: %s' % e.message)
-
-        kwargs[self.related_name] = converted_value
-
 
 GET = partial(param, lookup=_get_lookup)
 POST = partial(param, lookup=_post_lookup)
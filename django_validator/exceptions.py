@@ -13,3 +13,23 @@ class ValidationError(DjangoValidationError):
         super(ValidationError, self).__init__(detail)
         self.code = code
         self.status_code = status_code
+
+    @property
+    def code_dict(self):
+        """
+        Field to the error codes mapping of an aggregated error.
+        """
+        return {field: [error.code for error in errors] for field, errors in self.error_dict.items()}
+
+    @classmethod
+    def aggregate(cls, errors):
+        """Aggregate the errors of several fields into a single error.
+
+        Args:
+            errors (dict): Field to a list of ValidationError mapping.
+
+        Returns:
+            ValidationError: The aggregated error, its status_code is the one of the first error.
+        """
+        first_errors = next(iter(errors.values()))
+        return cls(errors, 'invalid_params', first_errors[0].status_code)
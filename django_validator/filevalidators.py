@@ -0,0 +1,42 @@
+"""Module that provides the validators of uploaded files.
+
+The validators are registered by name in the validators module, and this module is imported when they are first
+used.
+"""
+import os
+
+from .validators import BaseValidator, _
+
+
+class ExtInValidator(BaseValidator):
+    """
+    Check if the file extension type is in the choices list.
+    """
+    __slots__ = ('choices',)
+    code = 'ext_in_validator'
+    message = _('The extension type of {key} is invalid.')
+    dependencies = ()
+    cost = 3
+
+    def __init__(self, *choices):
+        super(ExtInValidator, self).__init__()
+        choices = [choice.lower() for choice in choices]
+        self.choices = {choice if choice.startswith('.') else '.' + choice for choice in choices}
+
+    def clean(self, value):
+        _, ext = os.path.splitext(value.name)
+        return ext.lower()
+
+    def is_valid(self, value, params):
+        return value in self.choices
+
+
+class ExtNotInValidator(ExtInValidator):
+    """
+    Check if the file extension type is not in the choices list.
+    """
+    __slots__ = ()
+    code = 'ext_not_in_validator'
+
+    def is_valid(self, value, params):
+        return value not in self.choices
@@ -0,0 +1,246 @@
+"""Module that reports the timings and failures of the validation.
+
+Set the INSTRUMENTS option to a list of Instrument instances, or dotted paths to them. The plans of the views are
+then run by an instrumented function, which reports the time of the lookup, the conversion and each validator of
+every param, the time of the whole validation, and the failures by the error code. When the option is empty, the
+plans run as usual and nothing is measured.
+
+Example:
+    DJANGO_VALIDATOR = {
+        'INSTRUMENTS': ['myproject.metrics.validator_metrics'],
+    }
+
+    # myproject/metrics.py
+    validator_metrics = MetricsCollector()
+
+When another option already replaced the run of a plan, like CODEGEN, SCHEDULE_CHECKS or a conversion cache, the
+instruments wrap that function instead of replacing it. Only the time of the whole validation and the failures are
+reported then, and the param of the failures is None. The async validators are not measured.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import six
+from django.utils.module_loading import import_string
+
+from .exceptions import ValidationError
+from .lookups import RequestSources
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+# Operation name of the whole validation of a view, the param of it is None.
+VALIDATE = 'validate'
+LOOKUP = 'lookup'
+CONVERT = 'convert'
+
+
+class Instrument(object):
+    """
+    Super class for instruments, override the methods to receive the measurements.
+    """
+
+    def timing(self, view, param, operation, seconds):
+        """Receive the time of an operation.
+
+        Args:
+            view (str): Label of the view.
+            param (Optional[str]): Name of the param, None for the whole validation.
+            operation (str): 'validate', 'lookup', 'convert' or the class name of a validator.
+            seconds (float): The time of the operation.
+        """
+        pass
+
+    def failure(self, view, param, code):
+        """Receive a failed param, code is the code of the ValidationError or 'invalid' if it has no code."""
+        pass
+
+
+class MetricsCollector(Instrument):
+    """
+    In-process collector, the metrics can be exported in the Prometheus text format.
+    """
+
+    def __init__(self, prefix='django_validator'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timings = OrderedDict()
+            self.failures = OrderedDict()
+
+    def timing(self, view, param, operation, seconds):
+        key = (view, param, operation)
+        with self._lock:
+            metric = self.timings.get(key)
+            if metric is None:
+                self.timings[key] = [1, seconds, seconds]
+            else:
+                metric[0] += 1
+                metric[1] += seconds
+                if seconds > metric[2]:
+                    metric[2] = seconds
+
+    def failure(self, view, param, code):
+        key = (view, param, code)
+        with self._lock:
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+    def snapshot(self):
+        """Get a copy of the collected metrics.
+
+        Returns:
+            dict: 'timings' maps (view, param, operation) to a dict with count, sum and max seconds,
+                'failures' maps (view, param, code) to the count.
+        """
+        with self._lock:
+            timings = OrderedDict(
+                (key, {'count': count, 'sum': total, 'max': largest})
+                for key, (count, total, largest) in self.timings.items()
+            )
+            failures = OrderedDict(self.failures)
+        return {'timings': timings, 'failures': failures}
+
+    def export(self):
+        """Export the metrics in the Prometheus text format.
+
+        Returns:
+            str: A summary of the timings and a counter of the failures.
+        """
+        snapshot = self.snapshot()
+        duration = '%s_duration_seconds' % self.prefix
+        failures = '%s_failures_total' % self.prefix
+        lines = [
+            '# HELP %s Time of the validation operations.' % duration,
+            '# TYPE %s summary' % duration,
+        ]
+        for (view, param, operation), metric in snapshot['timings'].items():
+            labels = _format_labels(view=view, param=param, operation=operation)
+            lines.append('%s_count{%s} %d' % (duration, labels, metric['count']))
+            lines.append('%s_sum{%s} %r' % (duration, labels, metric['sum']))
+        lines.extend([
+            '# HELP %s Failed params by the error code.' % failures,
+            '# TYPE %s counter' % failures,
+        ])
+        for (view, param, code), count in snapshot['failures'].items():
+            lines.append('%s{%s} %d' % (failures, _format_labels(view=view, param=param, code=code), count))
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(**labels):
+    return ','.join(
+        '%s="%s"' % (name, six.text_type('' if value is None else value).replace('\\', r'\\').replace('"', r'\"'))
+        for name, value in sorted(labels.items())
+    )
+
+
+class StatsdInstrument(Instrument):
+    """
+    Send the metrics to a statsd client, which has timing(stat, milliseconds) and incr(stat) methods.
+
+    The stats are named as prefix.view.param.operation and prefix.view.param.failure.code.
+    """
+
+    def __init__(self, client, prefix='django_validator'):
+        self.client = client
+        self.prefix = prefix
+
+    def _stat(self, *parts):
+        return '.'.join(six.text_type(part).replace('.', '_') for part in parts if part is not None)
+
+    def timing(self, view, param, operation, seconds):
+        self.client.timing('%s.%s' % (self.prefix, self._stat(view, param, operation)), seconds * 1000)
+
+    def failure(self, view, param, code):
+        self.client.incr('%s.%s' % (self.prefix, self._stat(view, param, 'failure', code)))
+
+
+def load_instruments(instruments):
+    """Resolve the dotted paths in the INSTRUMENTS option.
+
+    Returns:
+        tuple: The Instrument instances.
+    """
+    return tuple(
+        import_string(instrument) if isinstance(instrument, six.string_types) else instrument
+        for instrument in instruments or ()
+    )
+
+
+def instrumented_function(plan, instruments):
+    """Build a function which runs the plan and reports to the instruments, it has the same signature as run.
+
+    Args:
+        plan (ValidationPlan): The compiled plan.
+        instruments (tuple): The Instrument instances.
+    """
+    view = plan.label
+    steps = plan.steps
+    checks = [(validator, key, verbose_key, plan.get_field_name(key), type(validator).__name__)
+              for validator, key, verbose_key in plan.checks]
+
+    def timing(param, operation, seconds):
+        for instrument in instruments:
+            instrument.timing(view, param, operation, seconds)
+
+    def failure(param, error):
+        for instrument in instruments:
+            instrument.failure(view, param, error.code or 'invalid')
+
+    def run(request, kwargs, extra_kwargs):
+        started = _clock()
+        try:
+            sources = RequestSources(request)
+            for step in steps:
+                start = _clock()
+                value = step.read(sources, step.name, step.default, kwargs, extra_kwargs)
+                end = _clock()
+                timing(step.name, LOOKUP, end - start)
+                try:
+                    kwargs[step.related_name] = step.convert_value(value)
+                except ValidationError as e:
+                    failure(step.name, e)
+                    raise
+                finally:
+                    timing(step.name, CONVERT, _clock() - end)
+            for validator, key, verbose_key, param, operation in checks:
+                start = _clock()
+                try:
+                    validator(key, kwargs, verbose_key)
+                except ValidationError as e:
+                    failure(param, e)
+                    raise
+                finally:
+                    timing(param, operation, _clock() - start)
+        finally:
+            timing(None, VALIDATE, _clock() - started)
+
+    return run
+
+
+def instrumented_runner(plan, instruments, run):
+    """Wrap a function selected by other options, only the whole validation and the failures are reported.
+
+    Args:
+        plan (ValidationPlan): The compiled plan.
+        instruments (tuple): The Instrument instances.
+        run (function): The function which runs the plan, it has the same signature as run.
+    """
+    view = plan.label
+
+    def wrapper(request, kwargs, extra_kwargs):
+        started = _clock()
+        try:
+            run(request, kwargs, extra_kwargs)
+        except ValidationError as e:
+            for instrument in instruments:
+                instrument.failure(view, None, e.code or 'invalid')
+            raise
+        finally:
+            seconds = _clock() - started
+            for instrument in instruments:
+                instrument.timing(view, None, VALIDATE, seconds)
+
+    return wrapper
@@ -0,0 +1,337 @@
+"""Module that reads the declared fields of a JSON body while it arrives.
+
+With the STREAM_JSON option, a view with POST params reads a JSON object body in chunks instead of parsing it into
+a dict first. Only the values of the declared top-level fields are decoded, the other values are skipped chunk by
+chunk without being kept. The brackets of the skipped values must match and the skipped numbers, true, false and
+null must be valid, but the scalars and strings inside skipped arrays and objects are not decoded. Each declared
+value is converted and checked by the validators of its param which don't read other params, so a max, in or regex
+failure stops reading the rest of the body. A required failure is only known at the end of the object.
+
+Example:
+    @options(stream_json=True)
+    @POST('id', type='int', validators='required')
+    @POST('name', validators='required | max: 64')
+    def ingest(request, id, name):
+        pass
+
+The body is consumed, so the view must read the declared fields from its arguments, not from request.data or
+request.body. Bodies which are not JSON, or which have been read already, are validated as usual.
+"""
+import io
+import json
+import re
+
+import six
+
+from .exceptions import ValidationError
+from .validators import _
+
+try:
+    from rest_framework.request import Empty
+except ImportError:
+    Empty = None
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = b' \t\n\r'
+# The bytes which end a number, true, false or null.
+_SCALAR_END = re.compile(br'[,}\]\s]')
+_SCALAR = re.compile(br'(?:true|false|null|-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?)\Z')
+_NESTED_SPECIAL = re.compile(br'["{}\[\]]')
+_STRING = re.compile(br'"(?:[^"\\]|\\.)*"')
+# The rest of a string after the opening quote.
+_STRING_REST = re.compile(br'(?:[^"\\]|\\.)*"')
+_TRAILING_BACKSLASHES = re.compile(br'\\*\Z')
+_NOT_BRACKET = re.compile(br'[^{}\[\]]+')
+_BRACKET_PAIR = re.compile(br'\{\}|\[\]')
+_OPENERS = b'{['
+
+
+def _reduce_brackets(text):
+    """
+    Remove everything but the unmatched brackets of a text without strings.
+    """
+    text = _NOT_BRACKET.sub(b'', text)
+    while True:
+        reduced = _BRACKET_PAIR.sub(b'', text)
+        if len(reduced) == len(text):
+            return reduced
+        text = reduced
+
+
+def _closers(openers):
+    """
+    Get the closing brackets of the opening ones, in the closing order.
+    """
+    return openers[::-1].replace(b'{', b'}').replace(b'[', b']')
+
+
+def _scan_nested(buffer, pos, stack, in_string):
+    """Scan an array, an object or a string in a buffer from pos.
+
+    The rest of the buffer is skipped at once when the value can't end in it, so a large value is mostly skipped
+    by regular expressions. Only the buffer where it may end is scanned one bracket or string at a time.
+
+    Args:
+        stack (bytes): The opening brackets which are not closed yet.
+
+    Returns:
+        tuple: (end, pos, stack, in_string), end is the position after the value, or None when the value continues
+            after the buffer, then the scan resumes from pos with the next chunk.
+
+    Raises:
+        ValidationError: When a closing bracket doesn't match its opening one.
+    """
+    length = len(buffer)
+    exact = not stack
+    while pos < length:
+        if in_string:
+            match = _STRING_REST.match(buffer, pos)
+            if match is None:
+                # Keep the trailing backslashes, they may escape the first byte of the next chunk.
+                return None, _TRAILING_BACKSLASHES.search(buffer, pos).start(), stack, True
+            pos = match.end()
+            in_string = False
+            if not stack:
+                return pos, pos, stack, False
+            continue
+        if not exact:
+            region = _STRING.sub(b'', buffer[pos:])
+            quote = region.find(b'"')
+            brackets = _reduce_brackets(region if quote == -1 else region[:quote])
+            closing = len(brackets) - len(brackets.lstrip(b'}]'))
+            if closing < len(stack):
+                # The matched pairs are removed, a closing bracket after an opening one doesn't match it.
+                if brackets[:closing] != _closers(stack)[:closing] or brackets[closing:].strip(_OPENERS):
+                    raise _parse_error()
+                stack = stack[:len(stack) - closing] + brackets[closing:]
+                if quote == -1:
+                    return None, length, stack, False
+                # Continue in the string which is not complete in this buffer.
+                pos = length - (len(region) - quote) + 1
+                in_string = True
+                continue
+            exact = True
+        match = _NESTED_SPECIAL.search(buffer, pos)
+        if match is None:
+            return None, length, stack, False
+        byte = match.group()
+        pos = match.end()
+        if byte == b'"':
+            in_string = True
+        elif byte in _OPENERS:
+            stack += byte
+        else:
+            if byte != _closers(stack[-1:]):
+                raise _parse_error()
+            stack = stack[:-1]
+            if not stack:
+                return pos, pos, stack, False
+    return None, pos, stack, in_string
+
+
+class JSONFieldReader(object):
+    """
+    Read the top-level fields of a JSON object from a file-like read function, one chunk at a time.
+    """
+
+    def __init__(self, read, chunk_size=CHUNK_SIZE):
+        self.read = read
+        self.chunk_size = chunk_size
+        self.buffer = b''
+        self.pos = 0
+
+    def _fill(self):
+        chunk = self.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _next_byte(self):
+        """
+        Skip the whitespaces and get the next byte without consuming it, None at the end of the body.
+        """
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while pos < len(buffer) and buffer[pos:pos + 1] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos:pos + 1]
+            if not self._fill():
+                return None
+
+    def _expect(self, expected):
+        byte = self._next_byte()
+        if byte is None or byte not in expected:
+            raise _parse_error()
+        self.pos += 1
+        return byte
+
+    def _scan_value(self, keep):
+        """Scan a value from the current position.
+
+        Args:
+            keep (bool): Return the bytes of the value, otherwise they are dropped as they are scanned.
+        """
+        first = self._next_byte()
+        if first is None or first in b',:}]':
+            raise _parse_error()
+        parts = []
+        start = pos = self.pos
+        scalar = first not in b'"{['
+        stack = b''
+        in_string = False
+        while True:
+            buffer = self.buffer
+            if scalar:
+                match = _SCALAR_END.search(buffer, start)
+                end = match.start() if match is not None else None
+            else:
+                end, pos, stack, in_string = _scan_nested(buffer, pos, stack, in_string)
+            if end is not None:
+                self.pos = end
+                if keep:
+                    parts.append(buffer[start:end])
+                    return b''.join(parts)
+                # The kept values are checked when they are decoded.
+                if scalar and not _SCALAR.match(buffer, start, end):
+                    raise _parse_error()
+                return None
+            if scalar:
+                # The scalar is short, scan it again from the start with the next chunk.
+                self.pos = start
+            else:
+                # Drop what is scanned unless it's kept, the rest is scanned again with the next chunk.
+                if keep:
+                    parts.append(buffer[start:pos])
+                self.pos = pos
+            if not self._fill():
+                raise _parse_error()
+            start = pos = 0
+
+    def fields(self, names):
+        """Yield the (name, value) of the declared fields in the order of the body.
+
+        Args:
+            names (set): The names of the declared fields.
+
+        Raises:
+            ValidationError: When the body is not a JSON object.
+        """
+        self._expect(b'{')
+        if self._next_byte() == b'}':
+            self.pos += 1
+            return
+        while True:
+            key = _decode(self._scan_value(True))
+            if not isinstance(key, six.string_types):
+                raise _parse_error()
+            self._expect(b':')
+            if key in names:
+                yield key, _decode(self._scan_value(True))
+            else:
+                self._scan_value(False)
+            if self._expect(b',}') == b'}':
+                break
+        if self._next_byte() is not None:
+            raise _parse_error()
+
+
+def _decode(raw):
+    try:
+        return json.loads(raw.decode('utf-8'))
+    except ValueError:
+        raise _parse_error()
+
+
+def _parse_error():
+    return ValidationError(_('The request body is not a valid JSON object.'), 'json_parse_error')
+
+
+def _data_loaded(request):
+    # Django REST framework sets _full_data to Empty before parsing the body.
+    data = getattr(request, '_full_data', None)
+    return data is not None and data is not Empty
+
+
+def _is_json(request):
+    content_type = request.META.get('CONTENT_TYPE', '').split(';', 1)[0].strip().lower()
+    return content_type == 'application/json' or content_type.endswith('+json')
+
+
+def get_body_reader(request):
+    """Get the read function of the body of a request which can be streamed.
+
+    Returns:
+        Optional[function]: None if the body is not JSON, or it has been parsed or read already.
+    """
+    django_request = getattr(request, '_request', request)
+    if not hasattr(django_request, 'META') or not _is_json(django_request) or _data_loaded(request):
+        return None
+    body = getattr(django_request, '_body', None)
+    if body is not None:
+        return io.BytesIO(body).read
+    if getattr(django_request, '_read_started', False) or not hasattr(django_request, 'read'):
+        return None
+    return django_request.read
+
+
+class StreamedRequest(object):
+    """
+    The request passed to the validation, data is the declared fields of the streamed body.
+
+    The other attributes are read from the request.
+    """
+    __slots__ = ('_request', 'data')
+
+    def __init__(self, request, data):
+        self._request = request
+        self.data = data
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+
+def build_field_checks(steps):
+    """Map the names of the body params to the checks which run when their values arrive.
+
+    Returns:
+        dict: Name to a list of (step, validators), the validators are the ones which don't read other params.
+    """
+    checks = {}
+    for step in steps:
+        validators = [validator for validator in step.validators
+                      if getattr(validator, 'dependencies', None) == () and not getattr(validator, 'is_async', False)]
+        checks.setdefault(step.name, []).append((step, validators))
+    return checks
+
+
+def read_body(request, read, field_checks, check=True, chunk_size=CHUNK_SIZE):
+    """Read the declared fields of a JSON body, and check each of them when it arrives.
+
+    Args:
+        request: The request of the view.
+        read (function): The read function of the body, see get_body_reader.
+        field_checks (dict): See build_field_checks.
+        check (bool): Run the checks, otherwise the fields are only read.
+
+    Returns:
+        StreamedRequest: The request with the declared fields as data.
+
+    Raises:
+        ValidationError: When the body is not a JSON object, or a field fails a check.
+    """
+    data = {}
+    for name, value in JSONFieldReader(read, chunk_size).fields(field_checks):
+        data[name] = value
+        if not check:
+            continue
+        for step, validators in field_checks[name]:
+            params = {step.related_name: step.convert_value(value)}
+            for validator in validators:
+                validator(step.related_name, params, step.verbose_name)
+    return StreamedRequest(request, data)
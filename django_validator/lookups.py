@@ -0,0 +1,203 @@
+"""
+Lookups that read the value of a param from the request.
+
+A lookup is called with (request, name, default, kwargs, extra_kwargs) and returns the raw value.
+
+The compiled plans don't call the default lookups for each param. They read the values from a RequestSources,
+which resolves each mapping of the request, like the query params or the body, once for all the params.
+"""
+from operator import attrgetter
+
+
+def _query_params(request):
+    # Try to be compatible with older django rest framework.
+    if hasattr(request, 'query_params'):
+        return request.query_params
+    else:
+        return request.GET
+
+
+def _body(request):
+    if hasattr(request, 'data'):
+        return request.data
+    elif hasattr(request, 'DATA'):
+        return request.DATA
+    else:
+        return request.POST
+
+
+def _files(request):
+    if hasattr(request, 'data'):
+        return request.data
+    else:
+        return request.FILES
+
+
+def _meta(request):
+    if request is not None and hasattr(request, 'META'):
+        return request.META
+    else:
+        return None
+
+
+# The functions which find each source, and the attributes which decide it when they are defined by the class.
+_SOURCES = {
+    'query': (_query_params, ('query_params',)),
+    'body': (_body, ('data', 'DATA')),
+    'files': (_files, ('data',)),
+    'meta': (_meta, ()),
+}
+
+# The source getters of each request class, keyed by the source and then the class.
+_getters = {source: {} for source in _SOURCES}
+
+
+def _resolve_getter(source, request_class):
+    probe, attributes = _SOURCES[source]
+    getter = probe
+    for attribute in attributes:
+        # Only a class attribute, like the properties of the request of Django REST framework, is the same for all
+        # the requests of the class. Instance attributes are still checked on each request.
+        if hasattr(request_class, attribute):
+            getter = attrgetter(attribute)
+            break
+    _getters[source][request_class] = getter
+    return getter
+
+
+def get_source(request, source):
+    """Get a source mapping of a request.
+
+    Args:
+        request (HttpRequest): The request, or the request of Django REST framework.
+        source (str): 'query', 'body', 'files' or 'meta'.
+
+    Returns:
+        The mapping, the meta source is None when the request has no META.
+    """
+    getter = _getters[source].get(type(request))
+    if getter is None:
+        getter = _resolve_getter(source, type(request))
+    return getter(request)
+
+
+class RequestSources(object):
+    """
+    The source mappings of a single request, each of them is None until it's loaded.
+
+    The body is only read by the params which need it, and only once, so the lazy parsing of the body in
+    Django REST framework is not triggered by a view which only reads the query params.
+    """
+    __slots__ = ('request', 'query', 'body', 'files', 'meta')
+
+    def __init__(self, request):
+        self.request = request
+        self.query = self.body = self.files = self.meta = None
+
+    def load(self, source):
+        """
+        Resolve a source of the request and keep it for the other params.
+        """
+        value = get_source(self.request, source)
+        setattr(self, source, value)
+        return value
+
+
+def _get_lookup(request, name, default, kwargs, extra_kwargs):
+    return get_source(request, 'query').get(name, default)
+
+
+def _post_lookup(request, name, default, kwargs, extra_kwargs):
+    return get_source(request, 'body').get(name, default)
+
+
+def _file_lookup(request, name, default, kwargs, extra_kwargs):
+    return get_source(request, 'files').get(name, default)
+
+
+def _post_or_get_lookup(request, name, default, kwargs, extra_kwargs):
+    value = _post_lookup(request, name, None, kwargs, extra_kwargs)
+    return value if value is not None else _get_lookup(request, name, default, kwargs, extra_kwargs)
+
+
+def _header_lookup(request, name, default, kwargs, extra_kwargs):
+    meta = get_source(request, 'meta')
+    return meta.get(name, default) if meta is not None else default
+
+
+def _uri_lookup(request, name, default, kwargs, extra_kwargs):
+    if name in kwargs:
+        return kwargs.get(name)
+    else:
+        return extra_kwargs.get(name, default)
+
+
+def _read_query(sources, name, default, kwargs, extra_kwargs):
+    query = sources.query
+    if query is None:
+        query = sources.load('query')
+    return query.get(name, default)
+
+
+def _read_body(sources, name, default, kwargs, extra_kwargs):
+    body = sources.body
+    if body is None:
+        body = sources.load('body')
+    return body.get(name, default)
+
+
+def _read_files(sources, name, default, kwargs, extra_kwargs):
+    files = sources.files
+    if files is None:
+        files = sources.load('files')
+    return files.get(name, default)
+
+
+def _read_body_or_query(sources, name, default, kwargs, extra_kwargs):
+    value = _read_body(sources, name, None, kwargs, extra_kwargs)
+    return value if value is not None else _read_query(sources, name, default, kwargs, extra_kwargs)
+
+
+def _read_meta(sources, name, default, kwargs, extra_kwargs):
+    meta = sources.meta
+    if meta is None:
+        # It stays None for the requests without META, which is cheap to check again.
+        meta = sources.load('meta')
+    return meta.get(name, default) if meta is not None else default
+
+
+def _read_uri(sources, name, default, kwargs, extra_kwargs):
+    return _uri_lookup(None, name, default, kwargs, extra_kwargs)
+
+
+# Map the default lookups to the readers of the same value from a RequestSources, and the sources they read.
+_READERS = {
+    _get_lookup: (_read_query, ('query',)),
+    _post_lookup: (_read_body, ('body',)),
+    _file_lookup: (_read_files, ('files',)),
+    _post_or_get_lookup: (_read_body_or_query, ('body', 'query')),
+    _header_lookup: (_read_meta, ('meta',)),
+    _uri_lookup: (_read_uri, ()),
+}
+
+
+def get_reader(lookup):
+    """Get the function which reads the value of a lookup from a RequestSources.
+
+    The reader is called with (sources, name, default, kwargs, extra_kwargs), custom lookups are called with
+    the request of the sources.
+    """
+    if lookup in _READERS:
+        return _READERS[lookup][0]
+
+    def read(sources, name, default, kwargs, extra_kwargs):
+        return lookup(sources.request, name, default, kwargs, extra_kwargs)
+
+    return read
+
+
+def get_lookup_sources(lookup):
+    """
+    Get the names of the sources a default lookup reads, None for custom lookups.
+    """
+    return _READERS[lookup][1] if lookup in _READERS else None
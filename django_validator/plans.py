@@ -0,0 +1,685 @@
+"""Module that compiles stacked param decorators into a validation plan.
+
+The plan is built the first time a decorated view is called, because all the decorators in the stack
+have been applied by then. You can also call get_plan at import time to compile it ahead, or call freeze
+to compile all the views.
+
+Example:
+    @GET('offset', type='int')
+    @GET('limit', type='int', validators='max: 100')
+    def view(request, offset, limit):
+        pass
+
+    plan = get_plan(view)
+    plan.describe()
+
+The plan will be rebuilt automatically when ConverterRegistry or ValidatorRegistry changes.
+"""
+import gc
+import warnings
+from collections import OrderedDict
+from copy import copy, deepcopy
+from itertools import chain, groupby
+from weakref import WeakSet
+
+import six
+
+from . import conf
+from .converters import ConverterRegistry, StringConverter, FileConverter
+from .exceptions import ValidationError
+from .lookups import _get_lookup, _post_lookup, _file_lookup, _post_or_get_lookup, _header_lookup, _uri_lookup, \
+    RequestSources, get_reader, get_source
+from .utils import LRUCache, get_size
+from .validators import ValidatorRegistry, BaseValidator, combine_regex_validators
+
+
+# The default lookups except URI never read kwargs.
+_KWARGS_FREE_LOOKUPS = frozenset((_get_lookup, _post_lookup, _file_lookup, _post_or_get_lookup, _header_lookup))
+# The lookups which read the body, their fields are read while the body arrives with the STREAM_JSON option.
+_BODY_LOOKUPS = frozenset((_post_lookup, _post_or_get_lookup))
+# The lookups whose values only depend on the query params and the URI kwargs, see the RESULT_CACHE option.
+_CACHEABLE_LOOKUPS = frozenset((_get_lookup, _uri_lookup))
+
+# Size of the result cache of a view with RESULT_CACHE set to True.
+DEFAULT_RESULT_CACHE_SIZE = 4096
+
+
+_MISSING = object()
+
+# The converted values of these types are shared by the requests, the others are copied, see _copy_value.
+_IMMUTABLE_TYPES = frozenset((six.text_type, six.binary_type, bool, float, type(None)) + six.integer_types)
+
+
+def _copy_value(value):
+    """
+    Copy a cached converted value for a request, so the view can change it without changing the cache.
+    """
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES:
+        return value
+    if value_type is list and all(type(item) in _IMMUTABLE_TYPES for item in value):
+        return list(value)
+    return deepcopy(value)
+
+
+def _registry_version():
+    return ConverterRegistry._version, ValidatorRegistry._version, conf._version
+
+
+def build_schedule(steps, checks):
+    """Schedule each check right after the last step it depends on.
+
+    A check depends on the step of its own param and the steps of the params in the dependencies of its validator.
+    The checks whose validator has unknown dependencies run after all the steps.
+
+    Returns:
+        tuple: (step index, check indexes) tuples in the running order, the step index of the last one is None.
+    """
+    positions = {step.related_name: index for index, step in enumerate(steps)}
+    scheduled = [[] for _ in steps]
+    last = []
+    for index, (validator, key, verbose_key) in enumerate(checks):
+        dependencies = getattr(validator, 'dependencies', None)
+        if dependencies is None:
+            last.append(index)
+            continue
+        # Params which are not declared can only come from the URI kwargs, which are ready from the start.
+        position = max([positions[key]] + [positions[other] for other in dependencies if other in positions])
+        scheduled[position].append(index)
+    return tuple((index, tuple(check_indexes)) for index, check_indexes in enumerate(scheduled)) + \
+        ((None, tuple(last)),)
+
+
+class CostOrderedChain(object):
+    """
+    Run the validators of a param cheapest first, see the cost attribute of validators.
+
+    Only the validators which read nothing but their own value are moved, and never across a guard, like integer
+    ahead of min, see _cost_order. The raised error is the one of the first failing validator in this order, which
+    may differ from the written order.
+    """
+    __slots__ = ('validators', 'ordered', 'cost', 'dependencies')
+    is_async = False
+
+    def __init__(self, validators):
+        self.validators = tuple(validators)
+        self.ordered = _cost_order(self.validators)
+        self.cost = sum(_get_cost(validator) for validator in self.validators)
+        dependencies = [getattr(validator, 'dependencies', None) for validator in self.validators]
+        if any(names is None for names in dependencies):
+            self.dependencies = None
+        else:
+            self.dependencies = tuple(OrderedDict.fromkeys(chain.from_iterable(dependencies)))
+
+    def __call__(self, key, params, verbose_key=None):
+        for validator in self.ordered:
+            validator(key, params, verbose_key)
+        return True
+
+
+def _get_cost(validator):
+    return getattr(validator, 'cost', BaseValidator.cost)
+
+
+def _cost_order(validators):
+    """Sort the validators cheapest first between the ones which stay in place.
+
+    The guards and the validators which read other params, or may do so, stay in place, and the others are not
+    moved across them.
+
+    Returns:
+        tuple: The validators in the running order.
+    """
+    ordered = []
+    movable = []
+    for validator in validators:
+        if getattr(validator, 'dependencies', None) == () and not getattr(validator, 'guard', False):
+            movable.append(validator)
+            continue
+        ordered.extend(sorted(movable, key=_get_cost))
+        ordered.append(validator)
+        movable = []
+    ordered.extend(sorted(movable, key=_get_cost))
+    return tuple(ordered)
+
+
+def order_by_cost(checks):
+    """Replace the checks of each param with a CostOrderedChain, when the cheapest first order is different.
+
+    Returns:
+        tuple: The checks in the running order.
+    """
+    ordered = []
+    for (key, verbose_key), group in groupby(checks, key=lambda check: check[1:]):
+        validators = [check[0] for check in group]
+        if any(first is not second for first, second in zip(_cost_order(validators), validators)):
+            ordered.append((CostOrderedChain(validators), key, verbose_key))
+        else:
+            ordered.extend((validator, key, verbose_key) for validator in validators)
+    return tuple(ordered)
+
+
+def combine_checks(checks):
+    """Combine the adjacent regex validators of each param, see combine_regex_validators.
+
+    Returns:
+        tuple: The checks in the running order.
+    """
+    combined = []
+    for (key, verbose_key), group in groupby(checks, key=lambda check: check[1:]):
+        validators = []
+        for validator, _, _ in group:
+            if isinstance(validator, CostOrderedChain):
+                validator.ordered = tuple(combine_regex_validators(validator.ordered))
+            validators.append(validator)
+        combined.extend((validator, key, verbose_key) for validator in combine_regex_validators(validators))
+    return tuple(combined)
+
+
+class ParamStep(object):
+    """
+    Precomputed parse step of a single param, the converter is resolved when the step is built.
+
+    convert_value is a slot, so vectorize_step can replace it on a single step. The schema of a param is compiled
+    with the step, its converter and validator replace the ones of the type, see the schema module.
+    """
+    __slots__ = ('param', 'name', 'related_name', 'verbose_name', 'default', 'lookup', 'read', 'many', 'separator',
+                 'converter', 'convert', 'passthrough', 'validators', 'cache', 'vectorize', 'schema', 'convert_value')
+
+    def __init__(self, param):
+        self.param = param
+        self.name = param.name
+        self.related_name = param.related_name
+        self.verbose_name = param.verbose_name
+        self.default = param.default
+        self.lookup = param.lookup
+        self.read = get_reader(self.lookup)
+        self.many = param.many
+        self.separator = param.separator
+        self.converter = ConverterRegistry.get(param.type)
+        self.convert = self.converter.convert
+        # Converters which return the value as it is.
+        self.passthrough = self.converter in (StringConverter, FileConverter)
+        self.convert_value = self._convert_value
+        self.validators = tuple(param.get_validators())
+        self.schema = param.schema
+        if self.schema is not None:
+            from .schema import compile_schema
+            self.convert, schema_validator = compile_schema(self.schema, self.converter, self.many)
+            self.passthrough = False
+            self.validators += (schema_validator,)
+        self.cache = param.cache
+        if self.cache is not None:
+            # The converter or validators may have changed since the values were cached.
+            self.cache.clear()
+        self.vectorize = param.vectorize
+        if self.vectorize:
+            # Import it only when used, because importing NumPy is slow.
+            from .vectorize import can_vectorize, vectorize_step
+            if can_vectorize(self):
+                vectorize_step(self, self.vectorize)
+
+    def parse(self, sources, kwargs, extra_kwargs):
+        value = self.read(sources, self.name, self.default, kwargs, extra_kwargs)
+        kwargs[self.related_name] = self.convert_value(value)
+
+    def _convert_value(self, value):
+        convert = self.convert
+        try:
+            if self.many:
+                if isinstance(value, six.string_types):
+                    values = value.split(self.separator)
+                elif value is None:
+                    values = []
+                else:
+                    values = value
+                return [convert(self.name, _value) for _value in values]
+            else:
+                return convert(self.name, value)
+        except ValidationError as e:
+            raise e
+        except Exception as e:
+            raise ValidationError('Type Convert error: %s' % e)
+
+    def describe(self):
+        return {
+            'name': self.name,
+            'related_name': self.related_name,
+            'verbose_name': self.verbose_name,
+            'default': self.default,
+            'lookup': getattr(self.lookup, '__name__', repr(self.lookup)),
+            'converter': self.converter.__name__,
+            'many': self.many,
+            'separator': self.separator,
+            'vectorize': self.vectorize,
+            'schema': self.schema is not None,
+            'cache': self.cache.info() if self.cache is not None else None,
+            'validators': [type(validator).__name__ for validator in self.validators],
+        }
+
+
+class ValidationPlan(object):
+    """
+    Flat and ordered representation of all the params of a decorated view.
+
+    With the CODEGEN option, run is replaced by a generated function with the same signature. When a param has
+    a conversion cache, it is replaced by _run_cached instead of the generated function, and a warning is raised
+    when CODEGEN or SCHEDULE_CHECKS is ignored for this reason. With the INSTRUMENTS option, the default run is
+    replaced by an instrumented function, and the functions selected by the other options are wrapped by one
+    which only measures the whole validation, see the instrumentation module.
+
+    With the SCHEDULE_CHECKS option, the checks are interleaved with the steps, see build_schedule. The params
+    after the first failure are not converted at all, and the generated function follows the same order.
+    _run_cached keeps the default order.
+
+    With the COLLECT_ERRORS option, the plan runs as usual first. Only when it fails, all the params
+    and validators are run again to collect the errors, so the success case costs nothing extra.
+
+    With the STREAM_JSON option, the declared fields of a JSON body are read and checked while it arrives, and the
+    run reads them instead of the parsed body, see the jsonstream module.
+
+    With the RESULT_CACHE option, a view whose params are all GET or URI params caches the converted params, or the
+    raised error, by the values of the declared query params and the URI kwargs. The order of the query params and
+    the undeclared ones don't change the key. The lists and dicts of the params are copied for each request, and
+    the option is ignored for other views.
+
+    Attributes:
+        params (tuple): The _Param instances in the order they will be parsed.
+        options (dict): Options of the view, see the conf module.
+        steps (tuple): One ParamStep for each param.
+        checks (tuple): Flattened (validator, key, verbose_key) tuples, the validators of a param are replaced by a
+            CostOrderedChain with the ORDER_BY_COST option. Adjacent regex validators of a param are combined.
+        async_checks (tuple): Flattened checks of the async validators, see the aio module.
+        collect_all (bool): Whether the COLLECT_ERRORS option is enabled.
+        upload_rules (Optional[dict]): FileRules checked while uploading with the STREAM_UPLOADS option.
+        json_fields (Optional[dict]): Checks of the body params with the STREAM_JSON option, keyed by the names.
+        result_cache (Optional[LRUCache]): The results of the RESULT_CACHE option.
+        label (str): Label of the view in the instrumentation metrics.
+        instruments (tuple): Instrument instances of the INSTRUMENTS option.
+        version (tuple): Registry and settings versions when this plan was compiled.
+        source (Optional[str]): Source of the generated function when CODEGEN is enabled.
+        source_file (Optional[str]): The linecache file name of the source, it's dropped when the plan is rebuilt.
+        schedule (Optional[tuple]): The running order when SCHEDULE_CHECKS is enabled, see build_schedule.
+    """
+
+    def __init__(self, params, options=None, name='view', label=None):
+        self.params = tuple(params)
+        self.options = options
+        self.version = _registry_version()
+        self.steps = tuple(ParamStep(_param) for _param in self.params)
+        checks = [
+            (validator, step.related_name, step.verbose_name) for step in self.steps for validator in step.validators
+        ]
+        self.checks = tuple(check for check in checks if not getattr(check[0], 'is_async', False))
+        self.async_checks = tuple(check for check in checks if getattr(check[0], 'is_async', False))
+        # COLLECT_ERRORS reports every failing validator, so it always runs the checks in the written order.
+        self._collect_checks = self.checks
+        if conf.get_option('ORDER_BY_COST', options):
+            self.checks = order_by_cost(self.checks)
+        self.checks = combine_checks(self.checks)
+        self._names = {step.related_name: step.name for step in self.steps}
+        self.label = label or name
+        self.source = None
+        self.source_file = None
+        self.schedule = None
+        if conf.get_option('SCHEDULE_CHECKS', options):
+            self.schedule = build_schedule(self.steps, self.checks)
+            self._scheduled = tuple(
+                (self.steps[step_index] if step_index is not None else None,
+                 tuple(self.checks[index] for index in check_indexes))
+                for step_index, check_indexes in self.schedule
+            )
+            self.run = self._run_scheduled
+        if any(step.cache is not None for step in self.steps):
+            if conf.get_option('CODEGEN', options) or self.schedule is not None:
+                warnings.warn(
+                    'The conversion cache of %s runs the params in the default order without a generated '
+                    'function, the CODEGEN and SCHEDULE_CHECKS options are ignored.' % self.label,
+                    RuntimeWarning,
+                )
+            # Only the validators which don't read other params can be skipped for a cached value.
+            self._cached_checks = tuple(
+                (validator, key, verbose_key, getattr(validator, 'dependencies', None) == ())
+                for validator, key, verbose_key in self.checks
+            )
+            self.run = self._run_cached
+        elif conf.get_option('CODEGEN', options):
+            from .codegen import generate_function
+            self.source, self.run = generate_function(self, name)
+            self.source_file = self.run.__code__.co_filename
+        # The optional features are imported only when used, to keep importing the decorators fast.
+        self.instruments = ()
+        if conf.get_option('INSTRUMENTS', options):
+            from .instrumentation import instrumented_function, instrumented_runner, load_instruments
+            self.instruments = load_instruments(conf.get_option('INSTRUMENTS', options))
+        if self.instruments:
+            if 'run' in self.__dict__:
+                # Another option selected the run, the instruments keep it.
+                self.run = instrumented_runner(self, self.instruments, self.run)
+            else:
+                self.run = instrumented_function(self, self.instruments)
+        self.collect_all = bool(conf.get_option('COLLECT_ERRORS', options))
+        if self.collect_all:
+            self._run_first = self.run
+            self.run = self._run_collecting
+            # Save kwargs before running only when a lookup may read it.
+            self._save_kwargs = any(step.lookup not in _KWARGS_FREE_LOOKUPS for step in self.steps)
+        self.result_cache = None
+        result_cache = conf.get_option('RESULT_CACHE', options)
+        if result_cache and not self.async_checks and all(step.lookup in _CACHEABLE_LOOKUPS for step in self.steps):
+            self.result_cache = _build_result_cache(result_cache)
+            self._query_names = tuple(step.name for step in self.steps if step.lookup is _get_lookup)
+            self._uri_names = tuple(step.name for step in self.steps if step.lookup is _uri_lookup)
+            self._result_names = tuple(step.related_name for step in self.steps)
+            self._run_uncached = self.run
+            self.run = self._run_result_cached
+        self.json_fields = None
+        if conf.get_option('STREAM_JSON', options):
+            body_steps = [step for step in self.steps if step.lookup in _BODY_LOOKUPS]
+            if body_steps:
+                from .jsonstream import build_field_checks, get_body_reader, read_body
+                self.json_fields = build_field_checks(body_steps)
+                self._get_body_reader = get_body_reader
+                self._read_body = read_body
+                self._run_without_json = self.run
+                self.run = self._run_json
+        self.upload_rules = None
+        if conf.get_option('STREAM_UPLOADS', options):
+            from .uploadhandlers import build_rules, install_handler
+            self.upload_rules = build_rules(self.steps, conf.get_option('SNIFF_UPLOADS', options)) or None
+            if self.upload_rules:
+                self._install_handler = install_handler
+                self._run_without_uploads = self.run
+                self.run = self._run_streaming
+
+    def is_stale(self, params, options=None):
+        return self.version != _registry_version() or len(params) != len(self.params) or options is not self.options
+
+    def run(self, request, kwargs, extra_kwargs):
+        sources = RequestSources(request)
+        # Checkout all the params first.
+        for step in self.steps:
+            step.parse(sources, kwargs, extra_kwargs)
+        # Validate after all the params has checked out, because some validators needs all the params.
+        for validator, key, verbose_key in self.checks:
+            validator(key, kwargs, verbose_key)
+
+    def _run_scheduled(self, request, kwargs, extra_kwargs):
+        sources = RequestSources(request)
+        for step, checks in self._scheduled:
+            if step is not None:
+                step.parse(sources, kwargs, extra_kwargs)
+            for validator, key, verbose_key in checks:
+                validator(key, kwargs, verbose_key)
+
+    def _run_cached(self, request, kwargs, extra_kwargs):
+        # Related names whose pure validators have passed with the cached value.
+        validated = set()
+        pending = []
+        sources = RequestSources(request)
+        for step in self.steps:
+            cache = step.cache
+            if cache is None:
+                step.parse(sources, kwargs, extra_kwargs)
+                continue
+            value = step.read(sources, step.name, step.default, kwargs, extra_kwargs)
+            if not isinstance(value, six.string_types):
+                kwargs[step.related_name] = step.convert_value(value)
+                continue
+            # The params may share a cache instance, the param is part of the key.
+            key = (step.param, value)
+            converted = cache.get(key, _MISSING)
+            if converted is not _MISSING:
+                # The view may change a list or a dict, each request gets a copy.
+                kwargs[step.related_name] = _copy_value(converted)
+                validated.add(step.related_name)
+            else:
+                converted = step.convert_value(value)
+                kwargs[step.related_name] = _copy_value(converted)
+                pending.append((cache, key, converted))
+        for validator, key, verbose_key, pure in self._cached_checks:
+            if pure and key in validated:
+                continue
+            validator(key, kwargs, verbose_key)
+        # Only the values which passed all the validators are cached.
+        for cache, key, converted in pending:
+            cache.set(key, converted)
+
+    def _run_result_cached(self, request, kwargs, extra_kwargs):
+        query = get_source(request, 'query') if self._query_names else None
+        if isinstance(query, dict):
+            # The values stored in a QueryDict are the lists of values, they decide the value of get and are
+            # faster to read.
+            values = [dict.get(query, name) for name in self._query_names]
+            values = [tuple(value) if type(value) is list else value for value in values]
+        else:
+            values = [query.get(name) for name in self._query_names] if query is not None else ()
+        try:
+            key = (
+                tuple(values),
+                frozenset(kwargs.items()),
+                tuple([extra_kwargs.get(name) for name in self._uri_names]),
+            )
+            result = self.result_cache.get(key, _MISSING)
+        except TypeError:
+            # Unhashable URI kwargs.
+            return self._run_uncached(request, kwargs, extra_kwargs)
+        if result is _MISSING:
+            try:
+                self._run_uncached(request, kwargs, extra_kwargs)
+            except ValidationError as e:
+                # The copy doesn't keep the traceback, which refers to the request.
+                self.result_cache.set(key, copy(e))
+                raise
+            # The view may change the values of any type, like the lists and dicts of json or object params, the
+            # cache and each request get their own copies.
+            result = {name: _copy_value(kwargs[name]) for name in self._result_names}
+            self.result_cache.set(key, result)
+            return
+        if isinstance(result, ValidationError):
+            raise copy(result)
+        for name, value in result.items():
+            kwargs[name] = _copy_value(value)
+
+    def _run_collecting(self, request, kwargs, extra_kwargs):
+        saved_kwargs = dict(kwargs) if self._save_kwargs else None
+        try:
+            self._run_first(request, kwargs, extra_kwargs)
+        except ValidationError:
+            if saved_kwargs is not None:
+                kwargs.clear()
+                kwargs.update(saved_kwargs)
+            self.collect_errors(request, kwargs, extra_kwargs)
+
+    def _run_json(self, request, kwargs, extra_kwargs):
+        read = self._get_body_reader(request)
+        if read is not None:
+            # With COLLECT_ERRORS, the fields are only read, and the errors are collected by the run.
+            request = self._read_body(request, read, self.json_fields, not self.collect_all)
+        self._run_without_json(request, kwargs, extra_kwargs)
+
+    def _run_streaming(self, request, kwargs, extra_kwargs):
+        handler = self._install_handler(request, self.upload_rules)
+        try:
+            self._run_without_uploads(request, kwargs, extra_kwargs)
+        except ValidationError as e:
+            if handler is None or handler.error is None:
+                raise
+            self._raise_upload_error(handler, e)
+        if handler is not None and handler.error is not None:
+            self._raise_upload_error(handler)
+
+    def _raise_upload_error(self, handler, error=None):
+        if not self.collect_all:
+            raise handler.error
+        errors = OrderedDict(error.error_dict) if error is not None and hasattr(error, 'error_dict') else OrderedDict()
+        errors[handler.error_field] = [handler.error]
+        raise ValidationError.aggregate(errors)
+
+    def collect_errors(self, request, kwargs, extra_kwargs):
+        """Run all the params and validators, raise a single error with all the failures.
+
+        The validators of a param will be skipped if it can't be converted, and the value of it will be None.
+
+        Raises:
+            ValidationError: Aggregated error, see ValidationError.aggregate.
+        """
+        errors = OrderedDict()
+        failed = set()
+        sources = RequestSources(request)
+        for step in self.steps:
+            try:
+                step.parse(sources, kwargs, extra_kwargs)
+            except ValidationError as e:
+                errors.setdefault(step.name, []).append(e)
+                failed.add(step.related_name)
+                kwargs[step.related_name] = None
+        for validator, key, verbose_key in self._collect_checks:
+            if key in failed:
+                continue
+            try:
+                validator(key, kwargs, verbose_key)
+            except ValidationError as e:
+                errors.setdefault(self.get_field_name(key), []).append(e)
+        if errors:
+            raise ValidationError.aggregate(errors)
+
+    def get_field_name(self, key):
+        """
+        Get the param name in the request of a related name.
+        """
+        return self._names[key]
+
+    def describe(self):
+        """Describe the compiled plan for debugging.
+
+        Returns:
+            List[dict]: One dict for each param, in the order they will be parsed.
+        """
+        return [step.describe() for step in self.steps]
+
+    def memory_report(self):
+        """Estimate the memory held by the validation metadata of the view, see utils.get_size.
+
+        Each object is counted once, in the first of validators, params, steps and plan. Validators are shared by
+        the params with the same validator string, so the shared ones are counted in each view.
+
+        Returns:
+            dict: Bytes of 'validators', 'params' (including the conversion caches), 'steps', 'plan' (the checks,
+                the generated source and the rest of the plan) and 'total'.
+        """
+        # The instruments are configured for the whole process.
+        seen = {id(self.instruments)} | {id(instrument) for instrument in self.instruments}
+        validators = [validator for step in self.steps for validator in step.validators]
+        validators.extend(check[0] for check in self.checks + self.async_checks)
+        report = OrderedDict([
+            ('validators', sum(get_size(validator, seen) for validator in validators)),
+            ('params', get_size(self.params, seen)),
+            ('steps', get_size(self.steps, seen)),
+            ('plan', get_size(self, seen)),
+        ])
+        report['total'] = sum(report.values())
+        return report
+
+    def __repr__(self):
+        return '<ValidationPlan: %s>' % ', '.join(step.name for step in self.steps)
+
+
+def _build_result_cache(result_cache):
+    if isinstance(result_cache, LRUCache):
+        # The plan may be rebuilt, the results of the previous one are dropped.
+        result_cache.clear()
+        return result_cache
+    return LRUCache(DEFAULT_RESULT_CACHE_SIZE if result_cache is True else result_cache)
+
+
+def get_plan(view):
+    """Get the compiled validation plan of a decorated view, compile it if needed.
+
+    Args:
+        view (function): A function decorated by GET, POST and other param decorators.
+
+    Returns:
+        ValidationPlan: The compiled plan.
+    """
+    params = view.__params__
+    options = getattr(view, '__options__', None)
+    plan = getattr(view, '__plan__', None)
+    if plan is None or plan.is_stale(params, options):
+        if plan is not None and plan.source_file is not None:
+            from .codegen import forget_source
+            forget_source(plan.source_file)
+        name = getattr(view, '__name__', 'view')
+        label = '%s.%s' % (getattr(view, '__module__', None), getattr(view, '__qualname__', name))
+        plan = ValidationPlan(params, options, name, label)
+        view.__plan__ = plan
+    return plan
+
+
+# All the decorated views, they are compiled ahead by freeze.
+_views = WeakSet()
+
+
+def register_view(view):
+    """
+    Remember a decorated view, so freeze can compile it.
+    """
+    _views.add(view)
+
+
+def _get_handler_request_classes():
+    from django.core.handlers.wsgi import WSGIRequest
+
+    try:
+        from django.core.handlers.asgi import ASGIRequest
+    except ImportError:
+        return (WSGIRequest,)
+    return WSGIRequest, ASGIRequest
+
+
+def freeze(gc_freeze=True):
+    """Compile the validation plans of all the decorated views ahead.
+
+    Call it in the master process of a preforked server after all the views are imported, for example in the
+    when_ready hook of gunicorn with preload_app. The workers then share the compiled plans, validators and
+    converters instead of building them after forking.
+
+    The view and request classes of Django and Django REST framework, and the functions which find the request
+    and its sources for the common request classes, are resolved too. The plans and the registries stay ordinary
+    objects, they are not made immutable. Registering a converter or a validator after freeze raises a
+    RuntimeWarning, because the plans are compiled again in each worker.
+
+    Args:
+        gc_freeze (bool): Also move all the objects to the permanent generation with gc.freeze, so the garbage
+            collector of the workers doesn't write to their pages. It's ignored before Python 3.7.
+
+    Returns:
+        int: The number of compiled plans.
+    """
+    from .decorators import _get_request_classes, _get_finder
+    from .lookups import _SOURCES, _resolve_getter
+
+    View, APIView, request_classes = _get_request_classes()
+    for request_class in request_classes + _get_handler_request_classes():
+        _get_finder(request_class)
+        for source in _SOURCES:
+            _resolve_getter(source, request_class)
+    views = list(_views)
+    for view in views:
+        get_plan(view)
+    ConverterRegistry._frozen = ValidatorRegistry._frozen = True
+    if gc_freeze and hasattr(gc, 'freeze'):
+        gc.freeze()
+    return len(views)
+
+
+def memory_report():
+    """Get the memory report of every decorated view, see ValidationPlan.memory_report.
+
+    The plans which are not compiled yet are compiled first.
+
+    Returns:
+        OrderedDict: The reports keyed by the labels of the views, in the order of the labels.
+    """
+    plans = [get_plan(view) for view in list(_views)]
+    return OrderedDict((plan.label, plan.memory_report()) for plan in sorted(plans, key=lambda plan: plan.label))
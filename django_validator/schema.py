@@ -0,0 +1,219 @@
+"""Module that compiles the nested schemas of object params.
+
+A schema maps the keys of a JSON object to their rules. A rule is a validator string, a nested schema, or a field
+with a type, many or a default. The schema is compiled once with the plan of the view, the converters are resolved
+and the validator chains are shared with the params which use the same validator strings.
+
+Example:
+    @POST('filters', type='object', schema={
+        'status': 'required | in: open,closed',
+        'price': field(type='float', validators='min: 0'),
+        'range': {
+            'start': field(type='int', validators='required'),
+            'end': field(type='int'),
+        },
+        'items': field(many=True, schema={'sku': 'required | max: 16', 'qty': field(type='int')}),
+    })
+    def view(request, filters):
+        pass
+
+The view receives a dict with the converted values of the declared keys, the missing keys are set to their defaults
+and the undeclared keys are dropped. The errors name the nested keys, like filters.range.start or filters.items[1].qty.
+"""
+import six
+
+from .converters import ConverterRegistry, StringConverter, ObjectConverter
+from .exceptions import ValidationError
+from .validators import BaseValidator, ValidatorRegistry, combine_regex_validators
+
+
+class Field(object):
+    """
+    Declaration of a key of a schema, see field.
+    """
+    __slots__ = ('type', 'validators', 'validator_classes', 'default', 'many', 'separator', 'schema')
+
+    def __init__(self, type, validators, validator_classes, default, many, separator, schema):
+        self.type = type
+        self.validators = validators
+        self.validator_classes = validator_classes
+        self.default = default
+        self.many = many
+        self.separator = separator
+        self.schema = schema
+
+
+def field(type='string', validators=None, validator_classes=None, default=None, many=False, separator=',',
+          schema=None):
+    """Declare a key of a schema, the arguments are the same as the ones of param.
+
+    A field with a schema is an object, its type defaults to object.
+    """
+    return Field(type, validators, validator_classes, default, many, separator, schema)
+
+
+def _to_field(rule):
+    if isinstance(rule, Field):
+        return rule
+    if rule is None or isinstance(rule, six.string_types):
+        return field(validators=rule)
+    if isinstance(rule, dict):
+        return field(schema=rule)
+    raise TypeError('A schema rule must be a validator string, a dict or a field, not %r.' % (rule,))
+
+
+def _get_validators(validators, validator_classes):
+    validators = ValidatorRegistry.get_validators(validators)
+    if validator_classes:
+        if hasattr(validator_classes, '__iter__'):
+            validators.extend(validator_classes)
+        else:
+            validators.append(validator_classes)
+    # The same as the validators of the params, see ValidationPlan.checks.
+    return tuple(combine_regex_validators(validators))
+
+
+def _get_values(value, separator):
+    if isinstance(value, six.string_types):
+        return value.split(separator)
+    elif value is None:
+        return []
+    return value
+
+
+class SchemaKey(object):
+    """
+    Compiled rule of a key, convert is None for the values which are kept as they are.
+    """
+    __slots__ = ('name', 'default', 'convert', 'many', 'separator', 'validators', 'node')
+
+    def __init__(self, name, rule):
+        rule = _to_field(rule)
+        self.name = name
+        self.default = rule.default
+        self.many = rule.many
+        self.separator = rule.separator
+        self.validators = _get_validators(rule.validators, rule.validator_classes)
+        self.node = None
+        if rule.schema is not None:
+            self.node = SchemaNode(rule.schema, ConverterRegistry.get(rule.type))
+            self.convert = self.node.convert
+        else:
+            converter = ConverterRegistry.get(rule.type)
+            self.convert = None if converter is StringConverter else converter.convert
+
+
+class SchemaNode(object):
+    """Compiled schema of an object.
+
+    Attributes:
+        parse (function): The converter of the object itself, it's the object converter unless the schema is
+            declared with another type which decodes JSON.
+        keys (tuple): A SchemaKey for each declared key, in the declared order.
+    """
+    __slots__ = ('parse', 'keys')
+
+    def __init__(self, schema, converter=ObjectConverter):
+        if not isinstance(schema, dict):
+            raise TypeError('A schema must be a dict, not %r.' % (schema,))
+        self.parse = (ObjectConverter if converter is StringConverter else converter).convert
+        self.keys = tuple(SchemaKey(name, rule) for name, rule in schema.items())
+
+    def convert(self, key, value):
+        """
+        Convert an object, the result only has the declared keys.
+        """
+        value = self.parse(key, value)
+        if value is None:
+            return None
+        if not isinstance(value, dict):
+            raise ValidationError(ObjectConverter.message.format(key=key), ObjectConverter.code)
+        converted = {}
+        for schema_key in self.keys:
+            name = schema_key.name
+            _value = value.get(name, schema_key.default)
+            if schema_key.many:
+                # The same as ParamStep, the values are split before they are converted.
+                _value = _get_values(_value, schema_key.separator)
+            convert = schema_key.convert
+            if convert is None:
+                converted[name] = list(_value) if schema_key.many else _value
+                continue
+            path = '%s.%s' % (key, name)
+            try:
+                if schema_key.many:
+                    converted[name] = [convert(path, item) for item in _value]
+                else:
+                    converted[name] = convert(path, _value)
+            except ValidationError:
+                raise
+            except Exception as e:
+                raise ValidationError('Type Convert error: %s' % e)
+        return converted
+
+    def validate(self, value, verbose_key):
+        """
+        Run the validators of the keys of a converted object, and of the nested objects.
+        """
+        for schema_key in self.keys:
+            name = schema_key.name
+            path = '%s.%s' % (verbose_key, name)
+            for validator in schema_key.validators:
+                validator(name, value, path)
+            node = schema_key.node
+            _value = value.get(name)
+            if node is None or _value is None:
+                continue
+            if schema_key.many:
+                for index, item in enumerate(_value):
+                    if item is not None:
+                        node.validate(item, '%s[%d]' % (path, index))
+            else:
+                node.validate(_value, path)
+
+
+class SchemaValidator(BaseValidator):
+    """
+    Run the compiled schema of an object param, the error is the one of the first failing validator of the keys.
+    """
+    __slots__ = ('node', 'many')
+    code = 'schema_validator'
+    # It only reads the value of its own param.
+    dependencies = ()
+
+    def __init__(self, node, many=False):
+        super(SchemaValidator, self).__init__()
+        self.node = node
+        self.many = many
+
+    def __call__(self, key, params, verbose_key=None):
+        value = params.get(key)
+        if value is None:
+            return True
+        if verbose_key is None:
+            verbose_key = key
+        if self.many:
+            for index, item in enumerate(value):
+                if item is not None:
+                    self.node.validate(item, '%s[%d]' % (verbose_key, index))
+        else:
+            self.node.validate(value, verbose_key)
+        return True
+
+    def is_valid(self, value, params):
+        return True
+
+
+def compile_schema(schema, converter, many=False):
+    """Compile the schema of a param.
+
+    Args:
+        schema (dict): See the module docstring.
+        converter (BaseConverter): The converter of the type of the param.
+        many (bool): The many attribute of the param, the validator checks each object of the list.
+
+    Returns:
+        tuple: (convert, validator), the function which converts a value of the param, and the SchemaValidator.
+    """
+    node = SchemaNode(schema, converter)
+    return node.convert, SchemaValidator(node, many)
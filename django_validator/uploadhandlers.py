@@ -0,0 +1,256 @@
+"""Module that validates uploaded files while the chunks arrive.
+
+With the STREAM_UPLOADS option, views with FILE params install a ValidatingUploadHandler before the request
+body is parsed. The ext_in, ext_not_in, max and between rules are checked as soon as the file name or enough
+bytes are received, and the upload is halted without reading the rest of the body. The min rule and the lower
+bound of between are checked when the file is complete.
+
+With the SNIFF_UPLOADS option, the first bytes of each file are compared with the signatures of common file
+types, and the detected extension is checked by ext_in and ext_not_in as well.
+
+Example:
+    @options(stream_uploads=True, sniff_uploads=True)
+    @FILE('avatar', validators='required | max: 1048576 | ext_in: jpg, png')
+    def view(request, avatar):
+        pass
+
+CsrfViewMiddleware reads request.POST before the views which are not csrf exempt, so the handler must be installed
+by StreamUploadsMiddleware, placed before CsrfViewMiddleware. Without it, the handler is only installed by the view,
+which is too late for those views, and a RuntimeWarning is raised when a multipart body has been parsed already.
+
+Example:
+    MIDDLEWARE = [
+        'django_validator.uploadhandlers.StreamUploadsMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+    ]
+"""
+import warnings
+
+from django.core.files.base import File
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+from .exceptions import ValidationError
+from .filevalidators import ExtInValidator
+from .lookups import _file_lookup
+from .validators import MinValidator, MaxValidator, BetweenValidator
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    MiddlewareMixin = object
+
+try:
+    from rest_framework.request import Empty
+except ImportError:
+    Empty = None
+
+# Extensions of the file types detected by their first bytes. Only signatures which can't start a text file are
+# listed, a short printable one like the BM of bitmaps would reject csv or txt files which start with it.
+SIGNATURES = (
+    (b'\xff\xd8\xff', ('.jpg', '.jpeg')),
+    (b'\x89PNG\r\n\x1a\n', ('.png',)),
+    (b'GIF87a', ('.gif',)),
+    (b'GIF89a', ('.gif',)),
+    (b'%PDF-', ('.pdf',)),
+    (b'PK\x03\x04', ('.zip', '.docx', '.xlsx', '.pptx', '.jar')),
+    (b'\x1f\x8b', ('.gz', '.tgz')),
+)
+
+
+def sniff_extensions(data):
+    """Detect the file type from the first bytes of a file.
+
+    Returns:
+        tuple: Possible extensions of the file, empty if the type is unknown.
+    """
+    for signature, extensions in SIGNATURES:
+        if data.startswith(signature):
+            return extensions
+    return ()
+
+
+class _PartialUpload(File):
+    """
+    Stand-in of a file which is still uploading, validators only read its name and size.
+    """
+
+    def __init__(self, name, size=0):
+        super(_PartialUpload, self).__init__(None, name)
+        self._partial_size = size
+
+    @property
+    def size(self):
+        return self._partial_size
+
+
+class FileRules(object):
+    """
+    The rules of a FILE param which can be checked while uploading.
+    """
+
+    def __init__(self, step, sniff=False):
+        self.key = step.related_name
+        self.verbose_key = step.verbose_name
+        self.sniff = sniff
+        self.ext_validators = [v for v in step.validators if isinstance(v, ExtInValidator)]
+        size_classes = (MinValidator, MaxValidator, BetweenValidator)
+        self.size_validators = [v for v in step.validators if isinstance(v, size_classes)]
+        self.max_size = min([v.max_value for v in self.size_validators if hasattr(v, 'max_value')] or [None])
+
+    def check_name(self, file_name):
+        partial = _PartialUpload(file_name)
+        for validator in self.ext_validators:
+            validator(self.key, {self.key: partial}, self.verbose_key)
+
+    def check_received(self, file_name, size):
+        if self.max_size is not None and size > self.max_size:
+            self.check_size(file_name, size)
+
+    def check_size(self, file_name, size):
+        partial = _PartialUpload(file_name, size)
+        for validator in self.size_validators:
+            validator(self.key, {self.key: partial}, self.verbose_key)
+
+    def check_content(self, file_name, data):
+        extensions = sniff_extensions(data)
+        if not extensions:
+            return
+        for validator in self.ext_validators:
+            if not any(validator.is_valid(extension, None) for extension in extensions):
+                validator.raise_error(_PartialUpload(file_name), extensions[0], self.verbose_key)
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """
+    Upload handler which checks the FileRules of each field, the chunks are passed to the next handlers.
+
+    The first error and its field name are kept in the error and error_field attributes, the upload is halted
+    when it happens.
+    """
+
+    def __init__(self, rules, request=None):
+        super(ValidatingUploadHandler, self).__init__(request)
+        self.rules = rules
+        self.error = None
+        self.error_field = None
+        self.current_rules = None
+        self.received = 0
+
+    def _fail(self, error, halt=True):
+        if self.error is None:
+            self.error = error
+            self.error_field = self.field_name
+        if halt:
+            raise StopUpload(connection_reset=True)
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super(ValidatingUploadHandler, self).new_file(field_name, file_name, *args, **kwargs)
+        self.current_rules = self.rules.get(field_name)
+        self.received = 0
+        if self.current_rules is not None:
+            try:
+                self.current_rules.check_name(file_name)
+            except ValidationError as e:
+                self._fail(e)
+
+    def receive_data_chunk(self, raw_data, start):
+        rules = self.current_rules
+        if rules is not None:
+            try:
+                if self.received == 0 and rules.sniff:
+                    rules.check_content(self.file_name, raw_data)
+                self.received += len(raw_data)
+                rules.check_received(self.file_name, self.received)
+            except ValidationError as e:
+                self._fail(e)
+        return raw_data
+
+    def file_complete(self, file_size):
+        rules = self.current_rules
+        if rules is not None:
+            try:
+                rules.check_size(self.file_name, file_size)
+            except ValidationError as e:
+                # The whole file has been received, keep parsing the other fields.
+                self._fail(e, halt=False)
+        return None
+
+
+def build_rules(steps, sniff=False):
+    """Build the FileRules of the FILE params in a plan.
+
+    Returns:
+        dict: Field name to FileRules mapping, empty if no rule can be checked while uploading.
+    """
+    rules = {}
+    for step in steps:
+        if step.lookup is _file_lookup:
+            file_rules = FileRules(step, sniff)
+            if file_rules.ext_validators or file_rules.size_validators:
+                rules[step.name] = file_rules
+    return rules
+
+
+def _body_loaded(request):
+    # Django sets _files after parsing the body, Django REST framework sets it to Empty before parsing.
+    files = getattr(request, '_files', None)
+    return files is not None and files is not Empty
+
+
+def _is_multipart(request):
+    return request.META.get('CONTENT_TYPE', '').lower().startswith('multipart/')
+
+
+def install_handler(request, rules):
+    """Install a ValidatingUploadHandler as the first upload handler of the request.
+
+    Returns:
+        Optional[ValidatingUploadHandler]: The handler installed by StreamUploadsMiddleware if any, None if the body
+            has been parsed or can't have uploads.
+    """
+    django_request = getattr(request, '_request', request)
+    handler = getattr(django_request, '_validating_upload_handler', None)
+    if handler is not None:
+        return handler
+    if _body_loaded(request) or _body_loaded(django_request):
+        if _is_multipart(django_request):
+            warnings.warn('The body of %s was parsed before the view, the uploads are not checked while they arrive. '
+                          'Add StreamUploadsMiddleware before CsrfViewMiddleware.' % django_request.path,
+                          RuntimeWarning)
+        return None
+    if not hasattr(django_request, 'upload_handlers'):
+        return None
+    handler = ValidatingUploadHandler(rules, django_request)
+    django_request.upload_handlers.insert(0, handler)
+    django_request._validating_upload_handler = handler
+    return handler
+
+
+def _find_decorated_view(view_func, method):
+    # Class-based views keep the class on the function returned by as_view, the params decorate the methods.
+    view_class = getattr(view_func, 'view_class', None)
+    if view_class is not None:
+        view_func = getattr(view_class, method.lower(), None)
+    # Skip the decorators applied after the params, like csrf_exempt.
+    while view_func is not None and not hasattr(view_func, '__params__'):
+        view_func = getattr(view_func, '__wrapped__', None)
+    return view_func
+
+
+class StreamUploadsMiddleware(MiddlewareMixin):
+    """
+    Install the upload handler of the view before the body is read by the next middlewares.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not _is_multipart(request):
+            return None
+        view = _find_decorated_view(view_func, request.method)
+        if view is not None:
+            # Imported here, the plans import this module when the STREAM_UPLOADS option is enabled.
+            from .plans import get_plan
+
+            rules = get_plan(view).upload_rules
+            if rules:
+                install_handler(request, rules)
+        return None
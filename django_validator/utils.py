@@ -0,0 +1,127 @@
+"""
+Utilities shared by the modules of django-validator.
+"""
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict, deque
+
+import six
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+# Objects shared by the whole process, they are not counted in the size of the objects which refer to them.
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType) + six.class_types
+
+
+class LRUCache(object):
+    """
+    Thread safe mapping with a size cap, which evicts the least recently used entry.
+
+    With ttl, entries also expire after ttl seconds since they were set.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if self.ttl is not None:
+                if value[1] <= _monotonic():
+                    self.misses += 1
+                    return default
+                # Insert it again to mark it as the most recently used.
+                self._data[key] = value
+                self.hits += 1
+                return value[0]
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.ttl is not None:
+            value = (value, _monotonic() + self.ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Get the statistics of this cache.
+
+        Returns:
+            dict: hits, misses, size and maxsize of this cache.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
+
+    def __contains__(self, key):
+        if self.ttl is not None:
+            value = self._data.get(key)
+            return value is not None and value[1] > _monotonic()
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _iter_slots(obj):
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        for name in (slots,) if isinstance(slots, six.string_types) else slots:
+            if name not in ('__dict__', '__weakref__') and hasattr(obj, name):
+                yield getattr(obj, name)
+
+
+def get_size(obj, seen=None):
+    """Estimate the memory held by an object, in bytes.
+
+    The items of containers and the attributes of instances, in __dict__ or __slots__, are counted too. Classes,
+    modules and functions are shared by the process, so they are not counted, neither are the objects bound methods
+    refer to.
+
+    Args:
+        obj (object): The object to measure.
+        seen (Optional[set]): Ids of the objects counted already, they are not counted again. It's updated with
+            the ids of the counted objects, so it can be passed to several calls.
+
+    Returns:
+        int: The total size of the counted objects.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (tuple, list, set, frozenset, deque)):
+            stack.extend(obj)
+        elif not isinstance(obj, types.MethodType):
+            if isinstance(getattr(obj, '__dict__', None), dict):
+                stack.append(obj.__dict__)
+            stack.extend(_iter_slots(obj))
+    return size
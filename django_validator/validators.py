@@ -2,14 +2,28 @@
 
 Inherit BaseValidator to implement the custom validators.
 """
-import os
 import re
+import warnings
 import six
 from django.core.files.base import File
-from django.utils.translation import ugettext_lazy as _
+from django.utils.functional import lazy
 
 from . import status
 from .exceptions import ValidationError
+from .utils import LRUCache
+
+
+def _gettext(message):
+    from django.utils import translation
+
+    return translation.ugettext(message) if six.PY2 else translation.gettext(message)
+
+
+# Same as ugettext_lazy, but django.utils.translation is imported only when a message is translated.
+_ = lazy(_gettext, six.text_type)
+
+# Format a lazy translation string without translating it, the result is translated when it is used.
+_format_lazy = lazy(lambda template, **kwargs: template.format(**kwargs), six.text_type)
 
 
 class ValidatorRegistry(object):
@@ -19,6 +33,14 @@ class ValidatorRegistry(object):
     You can register and get validator classes from its class methods.
     """
     _registry = {}
+    # Dotted paths of the validator classes registered by path, they are imported on the first lookup.
+    _paths = {}
+    # Increased on every register, compiled validation plans use it to detect changes.
+    _version = 0
+    # Set by plans.freeze, registering after it compiles the plans again in each worker.
+    _frozen = False
+    # Parsed validator chains keyed by validator string.
+    _cache = LRUCache(256)
 
     @classmethod
     def register(cls, name, _class):
@@ -26,22 +48,38 @@ class ValidatorRegistry(object):
 
         Args:
             name (str, iterable): Register key or name tuple.
-            _class (BaseConverter): Validator class.
+            _class (BaseValidator, str): Validator class, or its dotted path to import it on the first lookup.
         """
-        if isinstance(name, (tuple, set, list)):
-            for _name in name:
+        names = name if isinstance(name, (tuple, set, list)) else (name,)
+        for _name in names:
+            if isinstance(_class, six.string_types):
+                cls._registry.pop(_name, None)
+                cls._paths[_name] = _class
+            else:
+                cls._paths.pop(_name, None)
                 cls._registry[_name] = _class
-        else:
-            cls._registry[name] = _class
+        cls._version += 1
+        if cls._frozen:
+            warnings.warn('The validator %s is registered after freeze, the plans will be compiled again in each '
+                          'worker.' % (name,), RuntimeWarning)
+        cls.clear_cache()
 
     @classmethod
     def get(cls, name):
-        return cls._registry.get(name)
+        _class = cls._registry.get(name)
+        if _class is None and name in cls._paths:
+            from django.utils.module_loading import import_string
+
+            # The name is registered already, the plans compiled with it are still valid.
+            _class = cls._registry[name] = import_string(cls._paths.pop(name))
+        return _class
 
     @classmethod
     def get_validators(cls, validator_str):
         """Converter a validator string to a list of validator instances.
 
+        Validator instances are shared by all the params which use the same validator string.
+
         Args:
             validator_str (str):
 
@@ -51,14 +89,40 @@ class ValidatorRegistry(object):
         Raises:
             TODO: Determine a special error.
         """
-        validators = []
         if not validator_str:
-            return validators
+            return []
+        return list(cls.get_chain(validator_str))
+
+    @classmethod
+    def get_chain(cls, validator_str):
+        """Get the cached validator chain of a validator string, parse it if not cached.
 
+        Args:
+            validator_str (str):
+
+        Returns:
+            Tuple[BaseValidator]: A shared tuple of validator instances.
+        """
+        chain = cls._cache.get(validator_str)
+        if chain is None:
+            chain = cls._parse(validator_str)
+            cls._cache.set(validator_str, chain)
+        return chain
+
+    @classmethod
+    def clear_cache(cls):
+        """
+        Drop all the cached validator chains, it's called automatically when a validator is registered.
+        """
+        cls._cache.clear()
+
+    @classmethod
+    def _parse(cls, validator_str):
+        validators = []
         rules = validator_str.split('|')
         for rule in rules:
             if ':' in rule:
-                name, args = rule.split(':', 2)
+                name, args = rule.split(':', 1)
                 name = name.strip()
                 args = map(lambda x: x.strip(), args.split(','))
             else:
@@ -72,7 +136,7 @@ class ValidatorRegistry(object):
             else:
                 raise Exception('Can not resolve validator class: %s.' % name)
 
-        return validators
+        return tuple(validators)
 
 
 class BaseValidator(object):
@@ -84,13 +148,27 @@ class BaseValidator(object):
     code: error_code in the raised error.
     message: error_message in the raised error.
     nullable: when this param set to True, validator will skip when value is None.
+    dependencies: names of the other params that is_valid reads from params, None means unknown.
+    is_async: True for the validators whose is_valid is a coroutine function, see AsyncValidator.
+    cost: relative cost of a call, cheaper validators run first with the ORDER_BY_COST option.
+    guard: True for the format checks that the validators written after them rely on, like integer ahead of min.
+        The ORDER_BY_COST option doesn't move the validators across them.
     clean: class will call this function to clean value before validate it.
     is_valid: you must overwrite this function to implement your logic.
+
+    The built-in validators keep their own attributes in __slots__. The class defaults above can still be
+    overridden on an instance, and custom validators without __slots__ work as usual, they are stored in the
+    __dict__ which is only allocated when it's used.
     """
+    __slots__ = ('__dict__',)
     status_code = status.HTTP_400_BAD_REQUEST
     code = 'base_validator'
     message = _('The {key} is invalid.')
     nullable = True
+    dependencies = None
+    is_async = False
+    cost = 10
+    guard = False
 
     def clean(self, value):
         return value
@@ -107,14 +185,23 @@ class BaseValidator(object):
             verbose_key = key
 
         cleaned = self.clean(value)
-        message_params = {'show_value': cleaned, 'value': value, 'key': verbose_key}
         if not self.is_valid(cleaned, params):
-            raise ValidationError(self.message.format(**message_params), self.code, self.status_code)
+            self.raise_error(value, cleaned, verbose_key)
         return True
 
+    def raise_error(self, value, cleaned, verbose_key):
+        message_params = {'show_value': cleaned, 'value': value, 'key': verbose_key}
+        raise ValidationError(self.get_message(cleaned).format(**message_params), self.code, self.status_code)
+
     def is_valid(self, value, params):
         raise NotImplementedError
 
+    def get_message(self, value):
+        """
+        Get the message of the raised error, the value is the cleaned value.
+        """
+        return self.message
+
     def set_message(self, message):
         """
         Set custom message with function.
@@ -130,9 +217,12 @@ class RequiredValidator(BaseValidator):
     """
     Validate the value is required.
     """
+    __slots__ = ()
     code = 'required_validator'
     message = _('The {key} is required.')
     nullable = False
+    dependencies = ()
+    cost = 1
 
     def is_valid(self, value, params):
         return RequiredValidator.required_valid(value)
@@ -150,12 +240,15 @@ class RequiredWithValidator(BaseValidator):
     """
     Validate the value when other value is set.
     """
+    __slots__ = ('other', 'dependencies', 'message')
     code = 'required_with_validator'
     nullable = False
+    cost = 1
 
     def __init__(self, other, message=None):
         super(RequiredWithValidator, self).__init__(message)
         self.other = other
+        self.dependencies = (other,)
         self.message = _('The {{key}} is required with {other}'.format(other=other))
 
     def is_valid(self, value, params):
@@ -169,12 +262,15 @@ class RequiredWithoutValidator(BaseValidator):
     """
     Validate the value when other value is not set.
     """
+    __slots__ = ('other', 'dependencies', 'message')
     code = 'required_without_validator'
     nullable = False
+    cost = 1
 
     def __init__(self, other, message=None):
         super(RequiredWithoutValidator, self).__init__(message)
         self.other = other
+        self.dependencies = (other,)
         self.message = _('The {{key}} is required without {other}'.format(other=other))
 
     def is_valid(self, value, params):
@@ -188,12 +284,15 @@ class RequiredIfValidator(BaseValidator):
     """
     Validate the value if other value is equals to your expectation.
     """
+    __slots__ = ('other', 'other_value', 'dependencies', 'message')
     code = 'required_if_validator'
     nullable = False
+    cost = 1
 
     def __init__(self, other, other_value, message=None):
         super(RequiredIfValidator, self).__init__(message)
         self.other = other
+        self.dependencies = (other,)
         self.other_value = other_value
         self.message = _(
             'The {{key}} is required when {other} is {other_value}'.format(other=other, other_value=other_value)
@@ -207,89 +306,117 @@ class RequiredIfValidator(BaseValidator):
             return True
 
 
-class MinValidator(BaseValidator):
+class BaseSizeValidator(BaseValidator):
+    """
+    Base class for validators which check the length of strings, the size of files or the value of numbers.
+
+    The messages of the three kinds are prepared once in the constructor, and picked only when the value is invalid.
+    """
+    __slots__ = ('messages',)
+    message = None
+    dependencies = ()
+    cost = 1
+    string_message = None
+    file_message = None
+    number_message = None
+
+    def prepare_messages(self, **kwargs):
+        """
+        Format the string, file and number messages of the class into the messages tuple.
+        """
+        self.messages = tuple(
+            _format_lazy(message, **kwargs) for message in (self.string_message, self.file_message, self.number_message)
+        )
+
+    def get_message(self, value):
+        if self.message is not None:
+            return self.message
+        if isinstance(value, six.string_types):
+            return self.messages[0]
+        elif isinstance(value, File):
+            return self.messages[1]
+        else:
+            return self.messages[2]
+
+    @staticmethod
+    def get_size(value):
+        if isinstance(value, six.string_types):
+            return len(value)
+        elif isinstance(value, File):
+            return value.size
+        else:
+            return value
+
+
+class MinValidator(BaseSizeValidator):
     """
     Mix min value and min length validators.
     """
+    __slots__ = ('min_value',)
     code = 'min_validator'
+    string_message = _('The {{key}} must be at least {min} characters.')
+    file_message = _('The {{key}} must be at least {min} bytes.')
+    number_message = _('The {{key}} must be at least {min}.')
 
     def __init__(self, min_value):
         super(MinValidator, self).__init__()
         self.min_value = int(min_value)
+        self.prepare_messages(min=self.min_value)
 
     def is_valid(self, value, params):
-        if isinstance(value, six.string_types):
-            self.message = _('The {{key}} must be at least {min} characters.').format(min=self.min_value)
-            return len(value) >= self.min_value
-        elif isinstance(value, File):
-            self.message = _('The {{key}} must be at least {min} bytes.'.format(min=self.min_value))
-            return value.size >= self.min_value
-        else:
-            self.message = _('The {{key}} must be at least {min}.').format(min=self.min_value)
-            return value >= self.min_value
+        return self.get_size(value) >= self.min_value
 
 
-class MaxValidator(BaseValidator):
+class MaxValidator(BaseSizeValidator):
     """
     Mix max value and max length validators.
     """
+    __slots__ = ('max_value',)
     code = 'max_validator'
+    string_message = _('The {{key}} may not be greater than {max} characters.')
+    file_message = _('The {{key}} must not be at greater {max} bytes.')
+    number_message = _('The {{key}} may not be greater than {max}.')
 
     def __init__(self, max_value):
         super(MaxValidator, self).__init__()
         self.max_value = int(max_value)
+        self.prepare_messages(max=self.max_value)
 
     def is_valid(self, value, params):
-        if isinstance(value, six.string_types):
-            self.message = _('The {{key}} may not be greater than {max} characters.').format(max=self.max_value)
-            return len(value) <= self.max_value
-        elif isinstance(value, File):
-            self.message = _('The {{key}} must not be at greater {max} bytes.'.format(max=self.max_value))
-            return value.size <= self.max_value
-        else:
-            self.message = _('The {{key}} may not be greater than {max}.').format(max=self.max_value)
-            return value <= self.max_value
+        return self.get_size(value) <= self.max_value
 
 
-class BetweenValidator(BaseValidator):
+class BetweenValidator(BaseSizeValidator):
     """
     Mix min and max validators.
     """
+    __slots__ = ('min_value', 'max_value')
     code = 'between_validator'
+    string_message = _('The {{key}} must be between {min} and {max} characters.')
+    file_message = _('The {{key}} must be between {min} and {max} bytes.')
+    number_message = _('The {{key}} must be between {min} and {max}.')
 
     def __init__(self, min_value, max_value):
         super(BetweenValidator, self).__init__()
         self.min_value = int(min_value)
         self.max_value = int(max_value)
+        self.prepare_messages(min=self.min_value, max=self.max_value)
 
     def is_valid(self, value, params):
-        if isinstance(value, six.string_types):
-            self.message = _('The {{key}} must be between {min} and {max} characters.').format(
-                min=self.min_value,
-                max=self.max_value
-            )
-            return self.min_value <= len(value) <= self.max_value
-        elif isinstance(value, File):
-            self.message = _('The {{key}} must be between {min} and {max} bytes.').format(
-                min=self.min_value,
-                max=self.max_value
-            )
-            return self.min_value <= value.size <= self.max_value
-        else:
-            self.message = _('The {{key}} must be between {min} and {max}.').format(
-                min=self.min_value,
-                max=self.max_value
-            )
-            return self.min_value <= value <= self.max_value
+        return self.min_value <= self.get_size(value) <= self.max_value
 
 
 class BaseRegexValidator(BaseValidator):
     """
     Base class for regex validators.
     """
+    __slots__ = ()
     code = 'regex_validator'
     message = _('The {key} format is invalid.')
+    dependencies = ()
     regex = None
+    cost = 5
+    guard = True
 
     def clean(self, value):
         if value is None:
@@ -304,6 +431,7 @@ class RegexValidator(BaseRegexValidator):
     """
     Custom regex validator.
     """
+    __slots__ = ('regex',)
 
     def __init__(self, regex, message=None):
         super(RegexValidator, self).__init__(message)
@@ -314,6 +442,7 @@ class IntegerValidator(BaseRegexValidator):
     """
     Inherit regex validator to confirm integers.
     """
+    __slots__ = ()
     code = 'integer_validator'
     message = _('The {key} must be an integer.')
     regex = re.compile('^-?\d+\Z')
@@ -326,6 +455,7 @@ class NumericValidator(BaseRegexValidator):
     """
     Inherit regex validator to confirm numbers.
     """
+    __slots__ = ()
     code = 'numeric_validator'
     message = _('The {key} must be a number.')
     regex = re.compile('^-?\d*(\.\d+)?(e-?\d+)?\Z')
@@ -334,12 +464,97 @@ class NumericValidator(BaseRegexValidator):
         super(NumericValidator, self).__init__(message)
 
 
+# Backreferences and conditional group references would point to other groups once the patterns are combined.
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+
+class CombinedRegexValidator(BaseValidator):
+    """
+    Match the value against several regex validators with a single pattern of lookaheads.
+
+    The value is cleaned once for all of them. When the combined pattern doesn't match, the validators are
+    called one by one, so the error is raised by the first failing one as usual.
+    """
+    __slots__ = ('validators', 'regex', 'nullable')
+    dependencies = ()
+    cost = BaseRegexValidator.cost
+    guard = True
+
+    def __init__(self, validators, regex):
+        super(CombinedRegexValidator, self).__init__()
+        self.validators = tuple(validators)
+        self.regex = regex
+        self.nullable = self.validators[0].nullable
+
+    def __call__(self, key, params, verbose_key=None):
+        value = params.get(key)
+        if value is None:
+            if self.nullable:
+                return True
+            value = ''
+        if self.regex.match(str(value)):
+            return True
+        for validator in self.validators:
+            validator(key, params, verbose_key)
+        return True
+
+
+def _can_combine(validator):
+    validator_class = type(validator)
+    return (isinstance(validator, BaseRegexValidator) and
+            six.get_unbound_function(validator_class.__call__) is six.get_unbound_function(BaseValidator.__call__) and
+            six.get_unbound_function(validator_class.clean) is
+            six.get_unbound_function(BaseRegexValidator.clean) and
+            six.get_unbound_function(validator_class.is_valid) is
+            six.get_unbound_function(BaseRegexValidator.is_valid) and
+            isinstance(validator.regex.pattern, six.text_type) and
+            not _BACKREFERENCE.search(validator.regex.pattern))
+
+
+def _combine(validators):
+    first = validators[0]
+    if any(validator.regex.flags != first.regex.flags or validator.nullable != first.nullable
+           for validator in validators):
+        return validators
+    pattern = ''.join('(?=%s)' % validator.regex.pattern for validator in validators)
+    try:
+        regex = re.compile(pattern, first.regex.flags)
+    except re.error:
+        # Inline global flags or duplicate group names can't be combined.
+        return validators
+    return [CombinedRegexValidator(validators, regex)]
+
+
+def combine_regex_validators(validators):
+    """Replace each run of adjacent regex validators with a CombinedRegexValidator.
+
+    Only the validators which use the default clean, is_valid and __call__ of BaseRegexValidator are combined.
+
+    Returns:
+        list: The validators, in the same order.
+    """
+    combined = []
+    run = []
+    for validator in list(validators) + [None]:
+        if validator is not None and _can_combine(validator):
+            run.append(validator)
+            continue
+        combined.extend(_combine(run) if len(run) > 1 else run)
+        run = []
+        if validator is not None:
+            combined.append(validator)
+    return combined
+
+
 class InValidator(BaseValidator):
     """
     Check if the value is in the choices list.
     """
+    __slots__ = ('choices',)
     code = 'in_validator'
     message = _('The selected {key} is invalid.')
+    dependencies = ()
+    cost = 2
 
     def __init__(self, *choices):
         super(InValidator, self).__init__()
@@ -358,40 +573,54 @@ class NotInValidator(InValidator):
     """
     Check if the value is not in the choices list.
     """
+    __slots__ = ()
     code = 'not_in_validator'
 
     def is_valid(self, value, params):
         return value not in self.choices
 
 
-class ExtInValidator(BaseValidator):
+class InSourceValidator(InValidator):
     """
-    Check if the file extension type is in the choices list.
+    Check if the value is in the choices returned by a callable, see the choices module.
+
+    Args:
+        func (Union[str, function]): The callable or a dotted path to it.
+        interval (Optional[float]): Reload the choices after this many seconds.
     """
-    code = 'ext_in_validator'
-    message = _('The extension type of {key} is invalid.')
+    __slots__ = ('source',)
+    cost = 3
 
-    def __init__(self, *choices):
-        super(ExtInValidator, self).__init__()
-        choices = [choice.lower() for choice in choices]
-        self.choices = {choice if choice.startswith('.') else '.' + choice for choice in choices}
+    def __init__(self, func, interval=None):
+        from .choices import callable_source
 
-    def clean(self, value):
-        _, ext = os.path.splitext(value.name)
-        return ext.lower()
+        super(InValidator, self).__init__()
+        self.source = callable_source(func, _parse_interval(interval))
 
     def is_valid(self, value, params):
-        return value in self.choices
+        return value in self.source.get()
 
 
-class ExtNotInValidator(ExtInValidator):
+class InFileValidator(InSourceValidator):
     """
-    Check if the file extension type is not in the choices list.
+    Check if the value is in the lines of a file, see the choices module.
+
+    Args:
+        path (str): Path of the file, one choice per line.
+        interval (Optional[float]): Reload the file after this many seconds.
+        mode (Optional[str]): 'mmap' to map a normalized file instead of loading it, see ChoiceSet.from_file.
     """
-    code = 'ext_not_in_validator'
+    __slots__ = ()
 
-    def is_valid(self, value, params):
-        return value not in self.choices
+    def __init__(self, path, interval=None, mode=None):
+        from .choices import file_source
+
+        super(InValidator, self).__init__()
+        self.source = file_source(path, _parse_interval(interval), mode == 'mmap')
+
+
+def _parse_interval(interval):
+    return float(interval) if interval not in (None, '') else None
 
 
 # Register all validators
@@ -407,5 +636,8 @@ ValidatorRegistry.register('integer', IntegerValidator)
 ValidatorRegistry.register('numeric', NumericValidator)
 ValidatorRegistry.register('in', InValidator)
 ValidatorRegistry.register('not_in', NotInValidator)
-ValidatorRegistry.register('ext_in', ExtInValidator)
-ValidatorRegistry.register('ext_not_in', ExtNotInValidator)
+ValidatorRegistry.register('in_file', InFileValidator)
+ValidatorRegistry.register('in_source', InSourceValidator)
+# The file validators are imported when they are first used.
+ValidatorRegistry.register('ext_in', 'django_validator.filevalidators.ExtInValidator')
+ValidatorRegistry.register('ext_not_in', 'django_validator.filevalidators.ExtNotInValidator')
@@ -0,0 +1,115 @@
+"""Module that converts and validates many=True numeric params with NumPy.
+
+Enable it with vectorize=True on an int or float param with many=True. The separated string is checked by a
+single regex and parsed straight into an array, then min, max and between validators check all the elements at
+once. The view gets a NumPy array, or a list when vectorize='list'.
+
+Example:
+    @GET('ids', type='int', many=True, vectorize=True, validators='min: 1')
+    def view(request, ids):
+        pass
+
+Values that the fast path can't handle, including the invalid ones, go through the pure-Python converters, so
+the raised errors are the same. When NumPy is not installed, the pure-Python path is always used and the view
+gets a list.
+"""
+import re
+
+import six
+
+from .converters import IntegerConverter, FloatConverter
+from .exceptions import ValidationError
+from .validators import BaseValidator, MinValidator, MaxValidator, BetweenValidator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Only ASCII digits are accepted by the fast path, 18 digits always fit in int64.
+_ELEMENT_PATTERNS = {
+    IntegerConverter: (r'-?[0-9]{1,18}', 'int64'),
+    FloatConverter: (r'-?(?:[0-9]+(?:\.[0-9]+)?|\.[0-9]+)(?:e-?[0-9]+)?', 'float64'),
+}
+
+_RANGE_VALIDATORS = (MinValidator, MaxValidator, BetweenValidator)
+
+
+def can_vectorize(step):
+    return step.many and step.converter in _ELEMENT_PATTERNS
+
+
+class VectorConverter(object):
+    """
+    Convert a separated string to an array, fall back to the pure-Python converter of the step.
+    """
+    __slots__ = ('regex', 'separator', 'dtype', 'as_list', 'fallback')
+
+    def __init__(self, step, output=True):
+        pattern, dtype = _ELEMENT_PATTERNS[step.converter]
+        separator = re.escape(step.separator)
+        self.regex = re.compile(r'%s(?:%s%s)*\Z' % (pattern, separator, pattern))
+        self.separator = step.separator
+        self.dtype = dtype
+        self.as_list = output == 'list'
+        self.fallback = step.convert_value
+
+    def __call__(self, value):
+        if numpy is None:
+            return self.fallback(value)
+        if isinstance(value, six.string_types) and self.regex.match(value):
+            array = numpy.fromstring(value, dtype=self.dtype, sep=self.separator)
+            if len(array) == value.count(self.separator) + 1:
+                return array.tolist() if self.as_list else array
+
+        values = self.fallback(value)
+        if self.as_list:
+            return values
+        try:
+            return numpy.array(values, dtype=self.dtype)
+        except (OverflowError, ValueError) as e:
+            raise ValidationError('Type Convert error: %s' % e)
+
+
+class ElementsValidator(BaseValidator):
+    """
+    Apply a min, max or between validator to every element of an array or a list.
+
+    Only the smallest and the largest elements are checked, which is enough for range validators.
+    """
+    __slots__ = ('validator', 'code', 'status_code')
+    dependencies = ()
+    cost = 2
+
+    def __init__(self, validator):
+        super(ElementsValidator, self).__init__()
+        self.validator = validator
+        self.code = validator.code
+        self.status_code = validator.status_code
+
+    def is_valid(self, value, params):
+        if len(value) == 0:
+            return True
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            smallest, largest = value.min(), value.max()
+        else:
+            smallest, largest = min(value), max(value)
+        return self.validator.is_valid(smallest, params) and self.validator.is_valid(largest, params)
+
+    def get_message(self, value):
+        # The number message of the range validator.
+        return self.validator.get_message(0)
+
+
+def vectorize_step(step, output=True):
+    """Replace the converter and range validators of a step with the vectorized ones.
+
+    Args:
+        step (ParamStep): A many=True step with int or float type.
+        output (Union[bool, str]): 'list' to pass a list to the view, otherwise an array.
+    """
+    step.convert_value = VectorConverter(step, output)
+    step.validators = tuple(
+        ElementsValidator(validator) if type(validator) in _RANGE_VALIDATORS else validator
+        for validator in step.validators
+    )
@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+
+echo "Running benchmarks..."
+export DJANGO_SETTINGS_MODULE=${DJANGO_SETTINGS_MODULE:-"settings.test"}
+python -m benchmarks.run "$@"
@@ -0,0 +1,96 @@
+import asyncio
+
+from django.test import TestCase, RequestFactory
+
+from django_validator.aio import AsyncValidator
+from django_validator.decorators import GET, options
+from django_validator.exceptions import ValidationError
+from django_validator.plans import get_plan
+
+
+class SlowValidator(AsyncValidator):
+    """
+    Async validator which records the order of the calls.
+    """
+    code = 'slow_validator'
+    dependencies = ()
+
+    def __init__(self, delay, log, valid=True):
+        super(SlowValidator, self).__init__()
+        self.delay = delay
+        self.log = log
+        self.valid = valid
+
+    async def is_valid(self, value, params):
+        self.log.append(('start', self.delay))
+        await asyncio.sleep(self.delay)
+        self.log.append(('end', self.delay))
+        return self.valid
+
+
+class AsyncViewTest(TestCase):
+    """
+    Test cases for async views and async validators.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_async_view(self):
+        @GET('a', type='int', validators='required')
+        async def view(request, a):
+            return a
+
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        self.assertEqual(asyncio.run(view(self.factory.get('/test', data={'a': '1'}))), 1)
+        with self.assertRaises(ValidationError):
+            asyncio.run(view(self.factory.get('/test')))
+
+    def test_concurrent_validators(self):
+        log = []
+
+        @GET('a', validator_classes=SlowValidator(0.02, log))
+        @GET('b', validator_classes=SlowValidator(0.01, log))
+        async def view(request, a, b):
+            return a, b
+
+        self.assertEqual(len(get_plan(view).async_checks), 2)
+        self.assertEqual(asyncio.run(view(self.factory.get('/test', data={'a': 'a', 'b': 'b'}))), ('a', 'b'))
+        # Both validators started before any of them ended.
+        self.assertEqual([event for event, _ in log], ['start', 'start', 'end', 'end'])
+
+    def test_first_error_in_order(self):
+        log = []
+
+        @GET('a', validator_classes=SlowValidator(0.02, log, valid=False))
+        @GET('b', validator_classes=SlowValidator(0.01, log, valid=False))
+        async def view(request, a, b):
+            pass
+
+        with self.assertRaisesRegexp(ValidationError, 'The b is invalid.'):
+            asyncio.run(view(self.factory.get('/test', data={'a': 'a', 'b': 'b'})))
+
+    def test_sync_error_skips_async(self):
+        log = []
+
+        @options(collect_errors=True)
+        @GET('a', validators='required', validator_classes=SlowValidator(0, log, valid=False))
+        @GET('b', validator_classes=SlowValidator(0, log, valid=False))
+        async def view(request, a, b):
+            pass
+
+        with self.assertRaises(ValidationError) as context:
+            asyncio.run(view(self.factory.get('/test', data={'b': 'b'})))
+        self.assertEqual(context.exception.code_dict, {'a': ['required_validator'], 'b': ['slow_validator']})
+        self.assertEqual(len(log), 2)
+
+    def test_sync_view(self):
+        log = []
+
+        @GET('a', validator_classes=SlowValidator(0, log, valid=False))
+        def view(request, a):
+            pass
+
+        with self.assertRaises(ValidationError):
+            view(self.factory.get('/test', data={'a': 'a'}))
+        self.assertEqual(len(log), 2)
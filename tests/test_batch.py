@@ -0,0 +1,63 @@
+from django.test import TestCase
+
+from django_validator.batch import BatchValidator
+from django_validator.decorators import param
+from django_validator.exceptions import ValidationError
+
+
+class BatchValidatorTest(TestCase):
+    """
+    Test cases for batch validation.
+    """
+
+    def setUp(self):
+        self.validator = BatchValidator([
+            param('id', type='int', validators='required | min: 1'),
+            param('name', validators='required_with: id | max: 4'),
+            param('tags', many=True, default=[]),
+        ])
+
+    def test_rows(self):
+        result = self.validator.validate([
+            {'id': '1', 'name': 'a', 'tags': 'x,y'},
+            {'id': 'x', 'name': 'b'},
+            {'id': '0'},
+            {'name': 'abcde'},
+        ])
+        self.assertEqual(result.size, 4)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.columns['id'], [1, None, 0, None])
+        self.assertEqual(result.columns['tags'], [['x', 'y'], [], [], []])
+        self.assertNotIn(0, result.errors)
+        self.assertEqual([e.code for e in result.errors[1]['id']], ['integer_validator'])
+        self.assertEqual([e.code for e in result.errors[2]['id']], ['min_validator'])
+        self.assertEqual([e.code for e in result.errors[2]['name']], ['required_with_validator'])
+        self.assertEqual([e.code for e in result.errors[3]['id']], ['required_validator'])
+        self.assertEqual([e.code for e in result.errors[3]['name']], ['max_validator'])
+        self.assertEqual(result.get_error(3).code_dict, {'id': ['required_validator'], 'name': ['max_validator']})
+        self.assertIsNone(result.get_error(0))
+        self.assertEqual(result.rows()[0], {'id': 1, 'name': 'a', 'tags': ['x', 'y']})
+
+    def test_columns(self):
+        result = self.validator.validate({'id': ['1', '2'], 'name': ['a', 'b']})
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.columns['id'], [1, 2])
+        self.assertEqual(result.columns['tags'], [[], []])
+
+    def test_columns_length(self):
+        with self.assertRaises(ValueError):
+            self.validator.validate({'id': ['1', '2'], 'name': ['a']})
+
+    def test_callable_validator(self):
+        def not_equal_id(key, params, verbose_key=None):
+            if params.get(key) == params.get('id'):
+                raise ValidationError('%s equals id.' % verbose_key, 'not_equal_id')
+            return True
+
+        validator = BatchValidator([
+            param('id', type='int'),
+            param('parent', type='int', validator_classes=not_equal_id),
+        ])
+        result = validator.validate([{'id': '1', 'parent': '2'}, {'id': '3', 'parent': '3'}])
+        self.assertEqual(list(result.errors), [1])
+        self.assertEqual([e.code for e in result.errors[1]['parent']], ['not_equal_id'])
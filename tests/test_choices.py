@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+
+import mock
+from django.test import TestCase, RequestFactory
+
+from django_validator.choices import ChoiceSet, ChoiceSource, file_source
+from django_validator.decorators import GET
+from django_validator.exceptions import ValidationError
+from django_validator.validators import ValidatorRegistry, InFileValidator, InSourceValidator
+
+REGIONS = ['us-east', 'EU-West', 'ap-south', u'北京']
+
+
+def load_regions():
+    return REGIONS
+
+
+class ChoiceSetTest(TestCase):
+    """
+    Test cases for the sorted choice buffer.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_contains(self):
+        choices = ChoiceSet.from_iterable(['b', 'A', 'c ', 'aa', 'a', '', u'é'])
+        self.assertEqual(len(choices), 5)
+        self.assertEqual(choices.buffer, u'a\naa\nb\nc\né\n'.encode('utf-8'))
+        self.assertEqual(list(choices.offsets), [0, len(choices.buffer)])
+        for value in ('a', 'aa', 'b', 'c', u'é'):
+            self.assertIn(value, choices)
+        for value in ('', 'A', '0', 'ab', 'bb', 'd', 'a\naa', u'ê'):
+            self.assertNotIn(value, choices)
+
+    def test_empty(self):
+        choices = ChoiceSet.from_iterable([])
+        self.assertEqual(len(choices), 0)
+        self.assertNotIn('a', choices)
+
+    def test_many(self):
+        skus = ['sku%06d' % index for index in range(0, 20000, 3)]
+        choices = ChoiceSet.from_iterable(skus)
+        self.assertEqual(len(choices.index), len(skus) // ChoiceSet.BLOCK_SIZE + 1)
+        self.assertTrue(all(sku in choices for sku in skus))
+        self.assertFalse(any('sku%06d' % index in choices for index in range(1, 20000, 3)))
+        self.assertFalse(any(value in choices for value in ('sku', 'sku0', 'sku00000', 'sku0000000', 'sku1')))
+
+    def test_file(self):
+        path = self._write('choices.txt', b'B\r\na\n\nb\n')
+        choices = ChoiceSet.from_file(path)
+        self.assertEqual(choices.buffer, b'a\nb\n')
+
+    def test_mmap(self):
+        path = self._write('choices.txt', b'a\nab\nb\n')
+        choices = ChoiceSet.from_file(path, use_mmap=True)
+        self.assertEqual(len(choices), 3)
+        self.assertIn('ab', choices)
+        self.assertNotIn('aa', choices)
+
+    def test_mmap_not_normalized(self):
+        for content in (b'b\na\n', b'a\na\n', b'A\n', b'a', b'\na\n'):
+            path = self._write('choices.txt', content)
+            self.assertRaises(ValueError, ChoiceSet.from_file, path, use_mmap=True)
+
+
+class ChoiceSourceTest(TestCase):
+    """
+    Test cases for the reloadable choice sources.
+    """
+
+    def test_reload_in_background(self):
+        values = [['a'], ['b']]
+        source = ChoiceSource(lambda: ChoiceSet.from_iterable(values.pop(0)), interval=10)
+        self.assertIn('a', source.get())
+        with mock.patch('threading.Thread') as thread:
+            with mock.patch('django_validator.choices._monotonic', return_value=source.loaded_at + 10):
+                # The old choices are returned while reloading.
+                self.assertIn('a', source.get())
+                source.get()
+            self.assertEqual(thread.call_count, 1)
+            thread.call_args[1]['target']()
+        self.assertIn('b', source.get())
+        self.assertNotIn('a', source.get())
+
+    def test_shared(self):
+        path = os.path.join(os.path.dirname(__file__), '__init__.py')
+        self.assertIs(file_source(path), file_source(path))
+        self.assertIsNot(file_source(path), file_source(path, 60))
+
+
+class InSourceValidatorTest(TestCase):
+    """
+    Test cases for the in_file and in_source validators.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        handle, self.path = tempfile.mkstemp()
+        with os.fdopen(handle, 'w') as f:
+            f.write('SKU-1\nsku-2\n')
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_registry(self):
+        validator, = ValidatorRegistry.get_validators('in_file: %s, 60' % self.path)
+        self.assertIsInstance(validator, InFileValidator)
+        self.assertEqual(validator.source.interval, 60)
+        validator, = ValidatorRegistry.get_validators('in_source: tests.test_choices.load_regions')
+        self.assertIsInstance(validator, InSourceValidator)
+        self.assertIsNone(validator.source.interval)
+
+    def test_view(self):
+        @GET('sku', validators='required | in_file: %s' % self.path)
+        @GET('region', validators='in_source: tests.test_choices.load_regions')
+        def view(request, sku, region):
+            return sku, region
+
+        self.assertEqual(view(self.factory.get('/test', data={'sku': 'Sku-1', 'region': 'eu-west'})),
+                         ('Sku-1', 'eu-west'))
+        self.assertEqual(view(self.factory.get('/test', data={'sku': 'sku-2'})), ('sku-2', None))
+        with self.assertRaises(ValidationError) as context:
+            view(self.factory.get('/test', data={'sku': 'sku-3'}))
+        self.assertEqual(context.exception.code, 'in_validator')
+        self.assertEqual(context.exception.messages, ['The selected sku is invalid.'])
+        with self.assertRaises(ValidationError):
+            view(self.factory.get('/test', data={'sku': 'sku-2', 'region': 'us'}))
@@ -0,0 +1,100 @@
+import linecache
+
+import ddt
+from django.test import TestCase, RequestFactory, override_settings
+
+from django_validator.decorators import GET, POST, POST_OR_GET, HEADER, URI, options
+from django_validator.exceptions import ValidationError
+from django_validator.plans import get_plan
+
+
+def _view(request, a, b, c, d, e, f):
+    return a, b, c, d, e, f
+
+
+def _decorate(view):
+    view = GET('a', type='int', validators='required | between: 1, 10')(view)
+    view = POST('b', validators='min: 2 | max: 4 | in: ab, abc, abcd')(view)
+    view = POST_OR_GET('c', type='int', default=0, validators='max: 5')(view)
+    view = HEADER('HTTP_D', related_name='d', validators='not_in: x')(view)
+    view = URI('e', type='int', default=1, validators='min: 1')(view)
+    view = GET('f', type='int', many=True, validators='required')(view)
+    return view
+
+
+@ddt.ddt
+class CodegenTest(TestCase):
+    """
+    Test cases for generated validate functions.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.generic_view = _decorate(_view)
+        self.generated_view = options(codegen=True)(_decorate(_view))
+        self.scheduled_view = options(schedule_checks=True)(_decorate(_view))
+        self.generated_scheduled_view = options(codegen=True, schedule_checks=True)(_decorate(_view))
+
+    def test_source(self):
+        self.assertIsNone(get_plan(self.generic_view).source)
+        source = get_plan(self.generated_view).source
+        self.assertIn('def validate__view(request, kwargs, extra_kwargs):', source)
+        self.assertIn('_query.get(', source)
+
+    def test_rebuild_forgets_source(self):
+        plan = get_plan(self.generated_view)
+        self.assertIn(plan.source_file, linecache.cache)
+        # New options rebuild the plan, the source of the replaced function is removed.
+        self.generated_view.__options__ = dict(self.generated_view.__options__)
+        rebuilt = get_plan(self.generated_view)
+        self.assertIsNot(rebuilt, plan)
+        self.assertNotIn(plan.source_file, linecache.cache)
+        self.assertEqual(linecache.getline(rebuilt.source_file, 1), rebuilt.source.splitlines(True)[0])
+
+    @override_settings(DJANGO_VALIDATOR={'CODEGEN': True})
+    def test_global_setting(self):
+        self.assertIsNotNone(get_plan(self.generic_view).source)
+
+    def _call(self, view, query, data, headers, kwargs):
+        request = self.factory.post('/test?' + query, data=data, **headers)
+        try:
+            return view(request, **kwargs)
+        except ValidationError as e:
+            return e.code, e.messages
+
+    @ddt.data(
+        ('a=5&f=1,2', {'b': 'abc'}, {}, {}),
+        ('a=5&f=1,2&c=3', {'b': 'abc'}, {'HTTP_D': 'y'}, {'e': '3'}),
+        ('a=5&f=1,2', {'b': 'abc', 'c': '4'}, {}, {}),
+        ('f=1,2', {'b': 'abc'}, {}, {}),
+        ('a=11&f=1', {'b': 'abc'}, {}, {}),
+        ('a=x&f=1', {'b': 'abc'}, {}, {}),
+        ('a=5&f=1', {'b': 'a'}, {}, {}),
+        ('a=5&f=1', {'b': 'abcde'}, {}, {}),
+        ('a=5&f=1', {'b': 'abd'}, {}, {}),
+        ('a=5&f=1&c=6', {'b': 'abc'}, {}, {}),
+        ('a=5&f=1', {'b': 'abc'}, {'HTTP_D': 'X'}, {}),
+        ('a=5&f=1', {'b': 'abc'}, {}, {'e': '0'}),
+        ('a=5&f=', {'b': 'abc'}, {}, {}),
+        ('a=5&f=1,x', {'b': 'abc'}, {}, {}),
+    )
+    @ddt.unpack
+    def test_same_result(self, query, data, headers, kwargs):
+        self.assertEqual(
+            self._call(self.generic_view, query, data, headers, kwargs),
+            self._call(self.generated_view, query, data, headers, kwargs),
+        )
+
+    @ddt.data(
+        ('a=5&f=1,2', {'b': 'abc'}, {}, {}),
+        ('a=11&f=1', {'b': 'abc'}, {}, {}),
+        ('a=11&f=x', {'b': 'abc'}, {}, {}),
+        ('a=5&f=1', {'b': 'abd'}, {'HTTP_D': 'X'}, {}),
+        ('a=5&f=', {'b': 'abc'}, {}, {'e': '0'}),
+    )
+    @ddt.unpack
+    def test_same_schedule(self, query, data, headers, kwargs):
+        self.assertEqual(
+            self._call(self.scheduled_view, query, data, headers, kwargs),
+            self._call(self.generated_scheduled_view, query, data, headers, kwargs),
+        )
@@ -1,8 +1,12 @@
+import itertools
+
 import ddt
 from django.test import TestCase
 
 from django_validator.converters import ConverterRegistry, BaseConverter, StringConverter, IntegerConverter, \
-    BooleanConverter, FloatConverter
+    BooleanConverter, FloatConverter, JSONConverter, ObjectConverter, _is_integer, _is_numeric
+from django_validator.exceptions import ValidationError
+from django_validator.validators import IntegerValidator, NumericValidator
 
 
 @ddt.ddt
@@ -56,7 +60,51 @@ class ConverterTests(TestCase):
         (BooleanConverter, 0, False),
         (BooleanConverter, 1, True),
         (BooleanConverter, 'true', True),
+        (JSONConverter, '[1, "a"]', [1, 'a']),
+        (JSONConverter, None, None),
+        (ObjectConverter, '{"a": 1}', {'a': 1}),
+        (ObjectConverter, {'a': 1}, {'a': 1}),
     )
     @ddt.unpack
     def test_converter(self, converter, value, excepted):
         self.assertEqual(converter.convert('test', value), excepted)
+
+    @ddt.data(
+        (IntegerConverter, 10, 10),
+        (IntegerConverter, '-10', -10),
+        (IntegerConverter, u'\u0661\u0662', 12),
+        (FloatConverter, 1.5, 1.5),
+        (FloatConverter, '-.5', -0.5),
+        (FloatConverter, '2e-1', 0.2),
+    )
+    @ddt.unpack
+    def test_fast_path(self, converter, value, excepted):
+        self.assertEqual(converter.convert('test', value), excepted)
+
+    @ddt.data(
+        (IntegerConverter, '1.0', 'integer_validator'),
+        (IntegerConverter, ' 1', 'integer_validator'),
+        (IntegerConverter, '+1', 'integer_validator'),
+        (IntegerConverter, '1_000', 'integer_validator'),
+        (IntegerConverter, '1\n', 'integer_validator'),
+        (IntegerConverter, '', 'integer_validator'),
+        (FloatConverter, '1E5', 'numeric_validator'),
+        (FloatConverter, 'inf', 'numeric_validator'),
+        (FloatConverter, '1.', 'numeric_validator'),
+        (FloatConverter, '+1.5', 'numeric_validator'),
+        (JSONConverter, '{"a": ', 'json_validator'),
+        (ObjectConverter, '[1]', 'object_validator'),
+        (ObjectConverter, 'x', 'json_validator'),
+    )
+    @ddt.unpack
+    def test_invalid(self, converter, value, code):
+        with self.assertRaises(ValidationError) as context:
+            converter.convert('test', value)
+        self.assertEqual(context.exception.code, code)
+
+    def test_same_as_regex(self):
+        for length in range(5):
+            for chars in itertools.product('1-.e+ ', repeat=length):
+                string = ''.join(chars)
+                self.assertEqual(_is_integer(string), bool(IntegerValidator.regex.match(string)), string)
+                self.assertEqual(_is_numeric(string), bool(NumericValidator.regex.match(string)), string)
@@ -1,9 +1,17 @@
+import inspect
 import io
+import os
+import subprocess
+import sys
+import unittest
 
 from django.core.files.base import File
 from django.test import TestCase, RequestFactory
+from django.views.generic import View
 
-from django_validator.decorators import param, POST_OR_GET, HEADER, URI, FILE
+import django_validator
+from django_validator.decorators import param, options, GET, POST_OR_GET, HEADER, URI, FILE, iscoroutinefunction, \
+    _finders, _find_view_request, _find_first_request, _get_request_classes
 from django_validator.exceptions import ValidationError
 
 
@@ -133,3 +141,121 @@ class DecoratorTest(TestCase):
         request = self.factory.get('/test')
         self.assertEquals(view(request, a=1), 1)
         self.assertEquals(view(request, a='1'), 1)
+
+    def test_class_based_view(self):
+        class TestView(View):
+            @GET('a', type='int')
+            def get(self, request, a):
+                return a
+
+        @GET('a', type='int')
+        def view(request, a):
+            return a
+
+        request = self.factory.get('/test', data={'a': '1'})
+        self.assertEqual(TestView.as_view()(request), 1)
+        self.assertIs(_finders[TestView], _find_view_request)
+        self.assertEqual(view(request), 1)
+        self.assertIs(_finders[type(request)], _find_first_request)
+
+    def test_request_not_first(self):
+        @GET('a', type='int')
+        def view(context, request, a):
+            return a
+
+        self.assertEqual(view(None, self.factory.get('/test', data={'a': '1'})), 1)
+        self.assertEqual(view(object(), self.factory.get('/test', data={'a': '2'})), 2)
+
+    def test_request_arg(self):
+        @options(request_arg=1)
+        @GET('a', type='int')
+        def view(other, request, a):
+            return a
+
+        @options(request_arg='request')
+        @GET('a', type='int')
+        def keyword_view(request, a):
+            return a
+
+        # The first arg is also a request, but it's not the one.
+        self.assertEqual(view(self.factory.get('/test'), self.factory.get('/test', data={'a': '1'})), 1)
+        self.assertEqual(keyword_view(request=self.factory.get('/test', data={'a': '2'})), 2)
+        with self.assertRaises(ValidationError):
+            keyword_view(request=self.factory.get('/test', data={'a': 'a'}))
+
+    def test_request_arg_uri(self):
+        APIView = _get_request_classes()[1]
+
+        class TestView(APIView):
+            @options(request_arg=1)
+            @URI('pk', type='int')
+            def get(self, request, pk):
+                return pk
+
+            @options(request_arg='request')
+            @URI('pk', type='int')
+            def post(self, request, pk):
+                return pk
+
+        view = TestView()
+        # The URI kwargs of an APIView are read from the view, the same as without request_arg.
+        view.kwargs = {'pk': '3'}
+        self.assertEqual(view.get(self.factory.get('/test')), 3)
+        self.assertEqual(view.post(request=self.factory.post('/test')), 3)
+
+    def test_immutable_param(self):
+        _param = param('a', validators='required')
+        self.assertFalse(hasattr(_param, '__dict__'))
+        with self.assertRaises(AttributeError):
+            _param.name = 'b'
+        with self.assertRaises(AttributeError):
+            del _param.default
+        self.assertEqual(_param.name, 'a')
+
+
+class LazyImportTest(TestCase):
+    """
+    Test cases for the import-light entry points.
+    """
+
+    def test_heavy_modules_not_imported(self):
+        script = ('import sys, django_validator.decorators; '
+                  'print(",".join(name for name in ("django.http", "django.conf", "rest_framework", "asyncio", '
+                  '"django.utils.translation", "django_validator.codegen", "django_validator.filevalidators") '
+                  'if name in sys.modules))')
+        output = subprocess.check_output([sys.executable, '-c', script], env=dict(os.environ))
+        self.assertEqual(output.strip(), b'')
+
+    def test_package_exports(self):
+        from django_validator.decorators import GET
+        from django_validator.plans import freeze
+
+        self.assertIs(django_validator.GET, GET)
+        self.assertIs(django_validator.freeze, freeze)
+        self.assertIn('GET', dir(django_validator))
+        self.assertRaises(AttributeError, getattr, django_validator, 'missing')
+
+    def test_iscoroutinefunction(self):
+        import asyncio
+
+        async def coroutine_function():
+            pass
+
+        def function():
+            pass
+
+        def marked():
+            pass
+
+        marked._is_coroutine = asyncio.coroutines._is_coroutine
+        self.assertTrue(iscoroutinefunction(coroutine_function))
+        self.assertTrue(iscoroutinefunction(marked))
+        self.assertFalse(iscoroutinefunction(function))
+        self.assertFalse(iscoroutinefunction(len))
+
+    @unittest.skipUnless(hasattr(inspect, 'markcoroutinefunction'), 'Python 3.12 and above.')
+    def test_markcoroutinefunction(self):
+        def marked():
+            pass
+
+        self.assertTrue(iscoroutinefunction(inspect.markcoroutinefunction(marked)))
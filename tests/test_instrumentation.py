@@ -0,0 +1,157 @@
+import sys
+import traceback
+import warnings
+
+from django.test import TestCase, RequestFactory, override_settings
+
+from django_validator.decorators import GET, options
+from django_validator.exceptions import ValidationError
+from django_validator.instrumentation import Instrument, MetricsCollector, StatsdInstrument
+from django_validator.plans import ValidationPlan, get_plan
+
+collector = MetricsCollector()
+
+
+class FakeStatsdClient(object):
+    def __init__(self):
+        self.calls = []
+
+    def timing(self, stat, milliseconds):
+        self.calls.append(('timing', stat))
+
+    def incr(self, stat):
+        self.calls.append(('incr', stat))
+
+
+class InstrumentationTest(TestCase):
+    """
+    Test cases for the INSTRUMENTS option.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.collector = MetricsCollector()
+
+        @options(instruments=[self.collector])
+        @GET('a', type='int', validators='required | max: 10')
+        @GET('b')
+        def view(request, a, b):
+            return a, b
+
+        self.view = view
+
+    def test_disabled(self):
+        @GET('a', type='int')
+        def view(request, a):
+            return a
+
+        plan = get_plan(view)
+        self.assertEqual(plan.instruments, ())
+        self.assertEqual(plan.run.__func__, ValidationPlan.run)
+
+    def test_timings(self):
+        self.assertEqual(self.view(self.factory.get('/test', data={'a': '1', 'b': 'b'})), (1, 'b'))
+        label = get_plan(self.view).label
+        self.assertEqual(label, 'tests.test_instrumentation.InstrumentationTest.setUp.<locals>.view')
+        timings = self.collector.snapshot()['timings']
+        self.assertEqual(list(timings), [
+            (label, 'b', 'lookup'),
+            (label, 'b', 'convert'),
+            (label, 'a', 'lookup'),
+            (label, 'a', 'convert'),
+            (label, 'a', 'RequiredValidator'),
+            (label, 'a', 'MaxValidator'),
+            (label, None, 'validate'),
+        ])
+        self.assertEqual(timings[(label, None, 'validate')]['count'], 1)
+        self.assertGreaterEqual(timings[(label, None, 'validate')]['sum'], 0)
+        self.assertEqual(self.collector.snapshot()['failures'], {})
+
+    def test_failures(self):
+        label = get_plan(self.view).label
+        with self.assertRaises(ValidationError):
+            self.view(self.factory.get('/test', data={'a': '11'}))
+        with self.assertRaises(ValidationError):
+            self.view(self.factory.get('/test', data={'a': 'x'}))
+        self.assertEqual(self.collector.snapshot()['failures'], {
+            (label, 'a', 'max_validator'): 1,
+            (label, 'a', 'integer_validator'): 1,
+        })
+        timings = self.collector.snapshot()['timings']
+        self.assertEqual(timings[(label, 'a', 'convert')]['count'], 2)
+        self.assertEqual(timings[(label, 'a', 'MaxValidator')]['count'], 1)
+        self.assertEqual(timings[(label, None, 'validate')]['count'], 2)
+
+    def test_export(self):
+        with self.assertRaises(ValidationError):
+            self.view(self.factory.get('/test', data={'a': '11'}))
+        text = self.collector.export()
+        self.assertIn('# TYPE django_validator_duration_seconds summary', text)
+        self.assertIn('django_validator_duration_seconds_count{operation="MaxValidator",param="a",view="', text)
+        self.assertIn('django_validator_failures_total{code="max_validator",param="a",view="', text)
+
+    def test_statsd(self):
+        client = FakeStatsdClient()
+
+        @options(instruments=[StatsdInstrument(client, prefix='api')])
+        @GET('a', validators='required')
+        def view(request, a):
+            pass
+
+        with self.assertRaises(ValidationError):
+            view(self.factory.get('/test'))
+        label = get_plan(view).label.replace('.', '_')
+        self.assertEqual(client.calls, [
+            ('timing', 'api.%s.a.lookup' % label),
+            ('timing', 'api.%s.a.convert' % label),
+            ('incr', 'api.%s.a.failure.required_validator' % label),
+            ('timing', 'api.%s.a.RequiredValidator' % label),
+            ('timing', 'api.%s.validate' % label),
+        ])
+
+    @override_settings(DJANGO_VALIDATOR={'INSTRUMENTS': ['tests.test_instrumentation.collector'], 'CODEGEN': True})
+    def test_dotted_path(self):
+        @GET('a', type='int')
+        def view(request, a):
+            return a
+
+        collector.reset()
+        self.assertEqual(view(self.factory.get('/test', data={'a': '1'})), 1)
+        plan = get_plan(view)
+        self.assertEqual(plan.instruments, (collector,))
+        self.assertIsNotNone(plan.source)
+        self.assertEqual(list(collector.snapshot()['timings']), [(plan.label, None, 'validate')])
+
+    def test_generated_function(self):
+        @options(instruments=[self.collector], codegen=True)
+        @GET('a', type='int', validators='max: 10')
+        def view(request, a):
+            return a
+
+        self.assertEqual(view(self.factory.get('/test', data={'a': '1'})), 1)
+        try:
+            view(self.factory.get('/test', data={'a': '11'}))
+        except ValidationError:
+            filenames = [frame[0] for frame in traceback.extract_tb(sys.exc_info()[2])]
+        # The instruments wrap the generated function instead of replacing it.
+        self.assertIn(get_plan(view).source_file, filenames)
+        label = get_plan(view).label
+        self.assertEqual(self.collector.snapshot()['timings'][(label, None, 'validate')]['count'], 2)
+        self.assertEqual(self.collector.snapshot()['failures'], {(label, None, 'max_validator'): 1})
+
+    def test_cache_conflict(self):
+        @options(codegen=True)
+        @GET('a', type='int', cache=True)
+        def view(request, a):
+            return a
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertEqual(view(self.factory.get('/test', data={'a': '1'})), 1)
+        self.assertEqual([warning.category for warning in caught], [RuntimeWarning])
+        self.assertIsNone(get_plan(view).source)
+
+    def test_base_instrument(self):
+        instrument = Instrument()
+        instrument.timing('view', 'a', 'lookup', 0.1)
+        instrument.failure('view', 'a', 'required_validator')
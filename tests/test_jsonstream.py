@@ -0,0 +1,133 @@
+import io
+import json
+
+import ddt
+from django.test import TestCase, RequestFactory
+
+from django_validator.decorators import GET, POST, options
+from django_validator.exceptions import ValidationError
+from django_validator.jsonstream import JSONFieldReader
+
+DOCUMENT = {
+    'id': 12,
+    'skip': {'nested': [1, {'a': '}]"'}, 'b\\'], 'x': None},
+    'name': 'a "quoted" \\ name é',
+    'tags': ['a', 'b', {'c': [1.5e3, -2]}],
+    'flag': True,
+    'empty': {},
+    'text': '\\\\"',
+    'none': None,
+}
+
+
+@ddt.ddt
+class JSONFieldReaderTest(TestCase):
+    """
+    Test cases for reading the fields of JSON objects.
+    """
+
+    @staticmethod
+    def read_fields(body, names, chunk_size):
+        return dict(JSONFieldReader(io.BytesIO(body).read, chunk_size).fields(names))
+
+    @ddt.data(1, 2, 3, 7, 64, 65536)
+    def test_same_as_json(self, chunk_size):
+        names = {'id', 'name', 'tags', 'flag', 'empty', 'text', 'none', 'missing'}
+        for indent in (None, 2):
+            body = json.dumps(DOCUMENT, indent=indent).encode('utf-8')
+            expected = {name: value for name, value in DOCUMENT.items() if name in names}
+            self.assertEqual(self.read_fields(body, names, chunk_size), expected)
+
+    def test_empty_object(self):
+        self.assertEqual(self.read_fields(b' { } ', {'a'}, 1), {})
+
+    @ddt.data(b'', b'[1]', b'{"a" 1}', b'{"a": 1,}', b'{"a": 1} x', b'{"a": tru}', b'{"a": "x', b'{"b": [1, 2',
+              b'{1: 2}', b'{"a": 1 "b": 2}')
+    def test_invalid(self, body):
+        for chunk_size in (1, 65536):
+            with self.assertRaises(ValidationError) as context:
+                self.read_fields(body, {'a'}, chunk_size)
+            self.assertEqual(context.exception.code, 'json_parse_error')
+
+    @ddt.data(b'{"id": 1, "x": [1, 2}, "y": true}', b'{"id": 1, "y": tru}', b'{"id": 1, "x": {"a": [1}}',
+              b'{"id": 1, "x": [[1], {"a": "]"}]]}', b'{"id": 1, "x": 01}', b'{"id": 1, "x": 1.}',
+              b'{"id": 1, "x": -}', b'{"id": 1, "x": nul}', b'{"id": 1, "x": truex}', b'{"id": 1, "x": "a"b}')
+    def test_invalid_skipped(self, body):
+        for chunk_size in (1, 2, 5, 65536):
+            with self.assertRaises(ValidationError) as context:
+                self.read_fields(body, {'id'}, chunk_size)
+            self.assertEqual(context.exception.code, 'json_parse_error')
+
+    def test_valid_skipped(self):
+        body = b'{"x": [1, {"a": ["}", {}]}, [[]]], "y": -0.5e+3, "z": null, "w": false, "v": [], "id": 1}'
+        for chunk_size in (1, 2, 5, 65536):
+            self.assertEqual(self.read_fields(body, {'id'}, chunk_size), {'id': 1})
+
+
+class StreamJSONTest(TestCase):
+    """
+    Test cases for validating the JSON bodies while they arrive.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        @options(stream_json=True)
+        @POST('id', type='int', validators='required')
+        @POST('name', validators='required | max: 8')
+        @GET('page', type='int', default=1)
+        def view(request, id, name, page):
+            return id, name, page
+
+        self.view = view
+
+    def post(self, data, chunks=None):
+        body = json.dumps(data).encode('utf-8')
+        request = self.factory.post('/test?page=2', data=body, content_type='application/json')
+        if chunks is not None:
+            stream = io.BytesIO(body)
+
+            def read(size):
+                chunks.append(size)
+                return stream.read(size)
+
+            request.read = read
+        return request
+
+    def test_valid(self):
+        data = {'id': 1, 'large': ['x' * 100] * 100, 'name': 'abc'}
+        self.assertEqual(self.view(self.post(data)), (1, 'abc', 2))
+
+    def test_early_failure(self):
+        chunks = []
+        data = {'name': 'too long name', 'large': 'x' * 1024 * 1024, 'id': 1}
+        with self.assertRaises(ValidationError) as context:
+            self.view(self.post(data, chunks))
+        self.assertEqual(context.exception.code, 'max_validator')
+        # Only the first chunk is read.
+        self.assertEqual(len(chunks), 1)
+
+    def test_required(self):
+        with self.assertRaises(ValidationError) as context:
+            self.view(self.post({'name': 'abc'}))
+        self.assertEqual(context.exception.code, 'required_validator')
+
+    def test_body_read(self):
+        request = self.post({'id': 1, 'name': 'abc'})
+        self.assertTrue(request.body)
+        self.assertEqual(self.view(request), (1, 'abc', 2))
+
+    def test_not_json(self):
+        request = self.factory.post('/test', data={'id': '1', 'name': 'abc'})
+        self.assertEqual(self.view(request), (1, 'abc', 1))
+
+    def test_collect_errors(self):
+        @options(stream_json=True, collect_errors=True)
+        @POST('id', type='int', validators='required')
+        @POST('name', validators='required | max: 8')
+        def view(request, id, name):
+            return id, name
+
+        with self.assertRaises(ValidationError) as context:
+            view(self.post({'name': 'too long name'}))
+        self.assertEqual(context.exception.code_dict, {'id': ['required_validator'], 'name': ['max_validator']})
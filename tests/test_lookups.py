@@ -0,0 +1,80 @@
+from django.http import HttpRequest, QueryDict
+from django.test import TestCase
+
+from django_validator.decorators import GET, POST, POST_OR_GET, HEADER
+from django_validator.lookups import RequestSources, get_source, _getters, _query_params
+
+
+class CountingRequest(HttpRequest):
+    """
+    Request with the sources as properties, which count how many times they are read.
+    """
+
+    def __init__(self, get=None, post=None):
+        super(CountingRequest, self).__init__()
+        self.reads = {'query_params': 0, 'data': 0}
+        self._query_params = get or {}
+        self._data = post or {}
+
+    @property
+    def query_params(self):
+        self.reads['query_params'] += 1
+        return self._query_params
+
+    @property
+    def data(self):
+        self.reads['data'] += 1
+        return self._data
+
+
+class LookupTest(TestCase):
+    """
+    Test cases for reading the sources of the requests.
+    """
+
+    def test_sources_read_once(self):
+        @POST('a')
+        @POST('b')
+        @POST_OR_GET('c')
+        @GET('d')
+        def view(request, a, b, c, d):
+            return a, b, c, d
+
+        request = CountingRequest(get={'c': '3', 'd': '4'}, post={'a': '1', 'b': '2'})
+        self.assertEqual(view(request), ('1', '2', '3', '4'))
+        self.assertEqual(request.reads, {'query_params': 1, 'data': 1})
+
+    def test_body_not_read(self):
+        @GET('a')
+        @HEADER('HTTP_B')
+        def view(request, a, HTTP_B):
+            return a, HTTP_B
+
+        request = CountingRequest(get={'a': '1'})
+        request.META['HTTP_B'] = '2'
+        self.assertEqual(view(request), ('1', '2'))
+        self.assertEqual(request.reads, {'query_params': 1, 'data': 0})
+
+    def test_instance_attributes(self):
+        # The attributes set on some requests of a class are still found.
+        with_query_params = HttpRequest()
+        with_query_params.query_params = {'a': '1'}
+        without_query_params = HttpRequest()
+        without_query_params.GET = QueryDict('a=2')
+        self.assertEqual(get_source(with_query_params, 'query'), {'a': '1'})
+        self.assertEqual(get_source(without_query_params, 'query'), without_query_params.GET)
+
+    def test_getters_by_class(self):
+        self.assertEqual(get_source(CountingRequest(get={'a': '1'}), 'query'), {'a': '1'})
+        self.assertEqual(get_source(HttpRequest(), 'query'), QueryDict())
+        # The property of the class is read directly, other classes still check the request.
+        self.assertIsNot(_getters['query'][CountingRequest], _query_params)
+        self.assertIs(_getters['query'][HttpRequest], _query_params)
+
+    def test_request_sources(self):
+        request = CountingRequest(get={'a': '1'})
+        sources = RequestSources(request)
+        self.assertIsNone(sources.query)
+        self.assertEqual(sources.load('query'), {'a': '1'})
+        self.assertIs(sources.query, request._query_params)
+        self.assertEqual(request.reads, {'query_params': 1, 'data': 0})
@@ -0,0 +1,515 @@
+import json
+import warnings
+
+import ddt
+import mock
+from django.core.handlers.wsgi import WSGIRequest
+from django.test import TestCase, RequestFactory, override_settings
+
+from django_validator.converters import ConverterRegistry, IntegerConverter, StringConverter
+from django_validator.decorators import GET, POST, URI, options, _finders, _find_first_request
+from django_validator.exceptions import ValidationError
+from django_validator.lookups import _getters
+from django_validator.plans import CostOrderedChain, build_schedule, freeze, get_plan, memory_report
+from django_validator.schema import field
+from django_validator.utils import LRUCache
+from django_validator.validators import ValidatorRegistry, BaseValidator, RequiredValidator, MaxValidator, \
+    IntegerValidator
+
+
+class PlanTest(TestCase):
+    """
+    Test cases for compiled validation plans.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_compile_once(self):
+        @GET('a', type='int', validators='required | max: 10')
+        @GET('b')
+        def view(request, a, b):
+            return a, b
+
+        self.assertIsNone(view.__plan__)
+        request = self.factory.get('/test', data={'a': '1', 'b': 'b'})
+        self.assertEqual(view(request), (1, 'b'))
+        plan = view.__plan__
+        self.assertIs(plan, get_plan(view))
+        view(request)
+        self.assertIs(plan, view.__plan__)
+
+    def test_describe(self):
+        @GET('a', type='int', validators='required | max: 10')
+        @GET('b')
+        def view(request, a, b):
+            pass
+
+        plan = get_plan(view)
+        self.assertEqual([step.name for step in plan.steps], ['b', 'a'])
+        self.assertEqual(plan.steps[1].converter, IntegerConverter)
+        self.assertEqual(plan.steps[0].converter, StringConverter)
+        self.assertEqual([type(check[0]) for check in plan.checks], [RequiredValidator, MaxValidator])
+        description = plan.describe()
+        self.assertEqual(description[1]['validators'], ['RequiredValidator', 'MaxValidator'])
+        self.assertEqual(description[1]['lookup'], '_get_lookup')
+
+    def test_rebuild_when_registry_changes(self):
+        @GET('a', validators='required')
+        def view(request, a):
+            pass
+
+        plan = get_plan(view)
+        ValidatorRegistry.register('required', RequiredValidator)
+        self.assertIsNot(plan, get_plan(view))
+
+
+class CollectErrorsTest(TestCase):
+    """
+    Test cases for the COLLECT_ERRORS option.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        @options(collect_errors=True)
+        @GET('a', type='int', validators='required | max: 10')
+        @GET('b', validators='required | min: 3 | in: abc, abcd')
+        @URI('c', type='int', validators='min: 1')
+        def view(request, a, b, c):
+            return a, b, c
+
+        self.view = view
+
+    def test_success(self):
+        request = self.factory.get('/test', data={'a': '1', 'b': 'abc'})
+        self.assertEqual(self.view(request, c='1'), (1, 'abc', 1))
+
+    def test_collect(self):
+        request = self.factory.get('/test', data={'a': 'x', 'b': 'ab'})
+        with self.assertRaises(ValidationError) as context:
+            self.view(request, c='0')
+        error = context.exception
+        self.assertEqual(error.code, 'invalid_params')
+        self.assertEqual(error.status_code, 400)
+        self.assertEqual(error.code_dict, {
+            'a': ['integer_validator'],
+            'b': ['min_validator', 'in_validator'],
+            'c': ['min_validator'],
+        })
+        self.assertEqual(error.message_dict['a'], ['The a must be an integer.'])
+
+    @override_settings(DJANGO_VALIDATOR={'COLLECT_ERRORS': True, 'CODEGEN': True})
+    def test_global_setting(self):
+        @GET('a', type='int', validators='required')
+        @GET('b', validators='required')
+        def view(request, a, b):
+            pass
+
+        with self.assertRaises(ValidationError) as context:
+            view(self.factory.get('/test'))
+        self.assertEqual(context.exception.code_dict, {'a': ['required_validator'], 'b': ['required_validator']})
+
+
+class CountingValidator(BaseValidator):
+    """
+    Pure validator which counts the calls.
+    """
+    dependencies = ()
+
+    def __init__(self):
+        super(CountingValidator, self).__init__()
+        self.calls = 0
+
+    def is_valid(self, value, params):
+        self.calls += 1
+        return value != [0]
+
+
+class NotEqualValidator(BaseValidator):
+    """
+    Validator which reads another param, dependencies is unknown.
+    """
+
+    def __init__(self, other):
+        super(NotEqualValidator, self).__init__()
+        self.other = other
+
+    def is_valid(self, value, params):
+        return value != params.get(self.other)
+
+
+class CacheTest(TestCase):
+    """
+    Test cases for the conversion cache of params.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.counter = CountingValidator()
+
+        @GET('ids', type='int', many=True, cache=True, validator_classes=self.counter)
+        @GET('name', cache=2, validators='required | max: 3', validator_classes=NotEqualValidator('other'))
+        @GET('other')
+        def view(request, ids, name, other):
+            ids.append(-1)
+            return ids, name
+
+        self.view = view
+
+    def test_hit(self):
+        request = self.factory.get('/test', data={'ids': '1,2', 'name': 'abc'})
+        self.assertEqual(self.view(request), ([1, 2, -1], 'abc'))
+        self.assertEqual(self.view(request), ([1, 2, -1], 'abc'))
+        self.assertEqual(self.counter.calls, 1)
+        other, name, ids = self.view.__params__
+        self.assertEqual(ids.cache_info(), {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 256})
+        self.assertEqual(name.cache_info()['hits'], 1)
+        self.assertEqual(get_plan(self.view).describe()[1]['cache']['maxsize'], 2)
+
+    def test_failure_not_cached(self):
+        request = self.factory.get('/test', data={'ids': '0', 'name': 'abc'})
+        for _ in range(2):
+            with self.assertRaises(ValidationError) as context:
+                self.view(request)
+            self.assertEqual(context.exception.code, 'base_validator')
+        self.assertEqual(self.counter.calls, 2)
+        self.assertEqual(self.view.__params__[2].cache_info()['size'], 0)
+
+    def test_impure_validators_run(self):
+        self.view(self.factory.get('/test', data={'ids': '1', 'name': 'abc'}))
+        with self.assertRaises(ValidationError) as context:
+            self.view(self.factory.get('/test', data={'ids': '1', 'name': 'abc', 'other': 'abc'}))
+        self.assertEqual(context.exception.code, 'base_validator')
+        self.assertEqual(self.view.__params__[1].cache_info()['hits'], 1)
+
+    def test_shared_instance(self):
+        cache = LRUCache(10)
+
+        @GET('a', type='int', cache=cache)
+        @GET('b', cache=cache)
+        def view(request, a, b):
+            return a, b
+
+        self.assertEqual(view(self.factory.get('/test', data={'b': '1'})), (None, '1'))
+        self.assertEqual(view(self.factory.get('/test', data={'a': '1', 'b': '1'})), (1, '1'))
+        self.assertEqual(len(cache), 2)
+
+    def test_cache_disabled(self):
+        @GET('a', type='int')
+        def view(request, a):
+            pass
+
+        self.assertIsNone(view.__params__[0].cache_info())
+        self.assertIsNone(get_plan(view).describe()[0]['cache'])
+
+
+class ScheduleTest(TestCase):
+    """
+    Test cases for the SCHEDULE_CHECKS option.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.converted = []
+
+        def lookup(request, name, default, kwargs, extra_kwargs):
+            self.converted.append(name)
+            return request.GET.get(name, default)
+
+        @options(schedule_checks=True)
+        @GET('a', validators='required_with: b', validator_classes=NotEqualValidator('b'))
+        @GET('b', type='int', validators='max: 10', lookup=lookup)
+        @GET('c', validators='required', lookup=lookup)
+        def view(request, a, b, c):
+            return a, b, c
+
+        self.view = view
+
+    def test_schedule(self):
+        plan = get_plan(self.view)
+        self.assertEqual([step.name for step in plan.steps], ['c', 'b', 'a'])
+        self.assertEqual(plan.schedule, build_schedule(plan.steps, plan.checks))
+        # required of c, max of b, required_with of a, then the validator with unknown dependencies.
+        self.assertEqual(plan.schedule, ((0, (0,)), (1, (1,)), (2, (2,)), (None, (3,))))
+
+    def test_stop_early(self):
+        with self.assertRaises(ValidationError) as context:
+            self.view(self.factory.get('/test', data={'b': '1'}))
+        self.assertEqual(context.exception.code, 'required_validator')
+        self.assertEqual(self.converted, ['c'])
+
+    def test_success(self):
+        self.assertEqual(self.view(self.factory.get('/test', data={'a': 'x', 'b': '1', 'c': 'y'})), ('x', 1, 'y'))
+        self.assertEqual(self.converted, ['c', 'b'])
+        with self.assertRaises(ValidationError) as context:
+            self.view(self.factory.get('/test', data={'b': '1', 'c': 'y'}))
+        self.assertEqual(context.exception.code, 'required_with_validator')
+
+
+def _cost_view(**view_options):
+    @options(**view_options)
+    @GET('a', validators=r'max: 3 | in: ab, abc, abcd | required | regex: ^[a-z]+$')
+    @GET('b', type='int', validators='required | max: 10')
+    def view(request, a, b):
+        return a, b
+
+    return view
+
+
+@ddt.ddt
+class OrderByCostTest(TestCase):
+    """
+    Test cases for the ORDER_BY_COST option.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_chain(self):
+        plan = get_plan(_cost_view(order_by_cost=True))
+        # The validators of b are already cheapest first.
+        self.assertEqual([type(check[0]) for check in plan.checks],
+                         [RequiredValidator, MaxValidator, CostOrderedChain])
+        chain = plan.checks[2][0]
+        self.assertEqual([validator.code for validator in chain.ordered],
+                         ['max_validator', 'required_validator', 'in_validator', 'regex_validator'])
+        self.assertEqual(chain.dependencies, ())
+
+    def test_cheap_first(self):
+        counter = CountingValidator()
+        counter.cost = 20
+
+        @options(order_by_cost=True)
+        @GET('a', validator_classes=[counter, MaxValidator(1)])
+        def view(request, a):
+            pass
+
+        for _ in range(2):
+            with self.assertRaises(ValidationError) as context:
+                view(self.factory.get('/test', data={'a': 'abc'}))
+            self.assertEqual(context.exception.code, 'max_validator')
+        # The expensive validator doesn't run when a cheaper one fails.
+        self.assertEqual(counter.calls, 0)
+        view(self.factory.get('/test', data={'a': 'a'}))
+        self.assertEqual(counter.calls, 1)
+
+    @ddt.data(
+        ('abc', None),
+        ('ABC', 'regex_validator'),
+        ('abcde', 'max_validator'),
+        ('ABCDE', 'max_validator'),
+        ('ab1', 'in_validator'),
+        ('a', 'in_validator'),
+        # required is cheaper than in, which is written first.
+        ('', 'required_validator'),
+    )
+    @ddt.unpack
+    def test_cheapest_error(self, value, code):
+        def call(view):
+            try:
+                view(self.factory.get('/test', data={'a': value, 'b': '1'}))
+            except ValidationError as e:
+                return e.code
+
+        self.assertEqual(call(_cost_view(order_by_cost=True)), code)
+        self.assertEqual(call(_cost_view(order_by_cost=True, codegen=True)), code)
+        if value:
+            self.assertEqual(call(_cost_view()), code)
+        else:
+            self.assertEqual(call(_cost_view()), 'in_validator')
+
+    def test_guard(self):
+        plan = get_plan(_cost_view(order_by_cost=True))
+        self.assertIs(plan.checks[2][0].ordered[-1], plan.checks[2][0].validators[-1])
+        counter = CountingValidator()
+        counter.cost = 0
+
+        @options(order_by_cost=True)
+        @GET('a', validators='max: 3 | integer', validator_classes=counter)
+        def view(request, a):
+            pass
+
+        # The validators written after a guard are not moved ahead of it.
+        self.assertEqual([type(check[0]) for check in get_plan(view).checks],
+                         [MaxValidator, IntegerValidator, CountingValidator])
+        with self.assertRaises(ValidationError):
+            view(self.factory.get('/test', data={'a': 'x'}))
+        self.assertEqual(counter.calls, 0)
+
+    def test_other_exception(self):
+        # min is cheaper than integer, but raises TypeError for the values integer rejects.
+        for view_options in ({}, {'order_by_cost': True}, {'order_by_cost': True, 'codegen': True}):
+            @options(**view_options)
+            @GET('a', many=True, validators='integer | min: 3')
+            def view(request, a):
+                pass
+
+            with self.assertRaises(ValidationError) as context:
+                view(self.factory.get('/test', data={'a': 'x'}))
+            self.assertEqual(context.exception.code, 'integer_validator')
+
+    def test_collect_errors(self):
+        view = _cost_view(order_by_cost=True, collect_errors=True)
+        with self.assertRaises(ValidationError) as context:
+            view(self.factory.get('/test', data={'a': 'ABCDE', 'b': '1'}))
+        self.assertEqual(context.exception.code_dict, {'a': ['max_validator', 'in_validator', 'regex_validator']})
+
+
+class ResultCacheTest(TestCase):
+    """
+    Test cases for the result cache of GET views.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.counter = CountingValidator()
+
+        @options(result_cache=2)
+        @GET('ids', type='int', many=True, validator_classes=self.counter)
+        @GET('limit', type='int', validators='max: 10')
+        @URI('slug')
+        def view(request, ids, limit, slug):
+            ids.append(-1)
+            return ids, limit, slug
+
+        self.view = view
+
+    def test_hit(self):
+        first = self.factory.get('/test?ids=1,2&limit=5&utm=a')
+        second = self.factory.get('/test?utm=b&limit=5&ids=1,2')
+        self.assertEqual(self.view(first, slug='a'), ([1, 2, -1], 5, 'a'))
+        self.assertEqual(self.view(second, slug='a'), ([1, 2, -1], 5, 'a'))
+        self.assertEqual(self.counter.calls, 1)
+        self.assertEqual(get_plan(self.view).result_cache.info()['hits'], 1)
+        # The URI kwargs are part of the key.
+        self.assertEqual(self.view(first, slug='b'), ([1, 2, -1], 5, 'b'))
+        self.assertEqual(self.counter.calls, 2)
+
+    def test_error_cached(self):
+        request = self.factory.get('/test?ids=1&limit=11')
+        errors = []
+        for _ in range(2):
+            with self.assertRaises(ValidationError) as context:
+                self.view(request, slug='a')
+            errors.append(context.exception)
+        self.assertEqual([error.code for error in errors], ['max_validator', 'max_validator'])
+        self.assertIsNot(errors[0], errors[1])
+        self.assertEqual(get_plan(self.view).result_cache.info()['hits'], 1)
+
+    def test_eviction(self):
+        for limit in (1, 2, 3, 1):
+            self.view(self.factory.get('/test', data={'ids': '1', 'limit': limit}), slug='a')
+        self.assertEqual(self.counter.calls, 4)
+        self.assertEqual(len(get_plan(self.view).result_cache), 2)
+
+    def test_mutable_values(self):
+        @options(result_cache=True)
+        @GET('f', type='json')
+        @GET('r', type='object', schema={'range': {'start': field(type='int')}})
+        def view(request, f, r):
+            f.append(-1)
+            r['range']['start'] += 1
+            return f, r
+
+        request = self.factory.get('/test', {'f': '[1]', 'r': json.dumps({'range': {'start': 1}})})
+        for _ in range(3):
+            self.assertEqual(view(request), ([1, -1], {'range': {'start': 2}}))
+        self.assertEqual(get_plan(view).result_cache.info()['hits'], 2)
+
+    def test_unhashable_kwargs(self):
+        self.assertEqual(self.view(self.factory.get('/test?ids=1'), slug=['a']), ([1, -1], None, ['a']))
+
+    def test_not_cacheable(self):
+        cache = LRUCache(8)
+
+        @options(result_cache=cache)
+        @GET('a')
+        @POST('b')
+        def view(request, a, b):
+            return a, b
+
+        self.assertEqual(view(self.factory.get('/test?a=1')), ('1', None))
+        self.assertIsNone(get_plan(view).result_cache)
+        self.assertEqual(len(cache), 0)
+
+
+class FreezeTest(TestCase):
+    """
+    Test cases for compiling all the views ahead.
+    """
+
+    def test_freeze(self):
+        @GET('a', type='int')
+        def view(request, a):
+            pass
+
+        @options(codegen=True)
+        @GET('b')
+        async def async_view(request, b):
+            pass
+
+        self.addCleanup(setattr, ValidatorRegistry, '_frozen', False)
+        self.addCleanup(setattr, ConverterRegistry, '_frozen', False)
+        with mock.patch('gc.freeze') as gc_freeze:
+            self.assertGreaterEqual(freeze(), 2)
+        self.assertEqual(gc_freeze.call_count, 1)
+        self.assertIs(_finders[WSGIRequest], _find_first_request)
+        self.assertIn(WSGIRequest, _getters['query'])
+        self.assertIsNotNone(view.__plan__)
+        self.assertIsNotNone(async_view.__plan__.source)
+
+        plan = view.__plan__
+        with mock.patch('gc.freeze') as gc_freeze:
+            freeze(gc_freeze=False)
+        self.assertEqual(gc_freeze.call_count, 0)
+        self.assertIs(view.__plan__, plan)
+
+    def test_register_after_freeze(self):
+        self.addCleanup(setattr, ValidatorRegistry, '_frozen', False)
+        self.addCleanup(setattr, ConverterRegistry, '_frozen', False)
+        self.addCleanup(ValidatorRegistry._registry.pop, 'frozen_test', None)
+        with mock.patch('gc.freeze'):
+            freeze()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            ValidatorRegistry.register('frozen_test', RequiredValidator)
+        self.assertEqual([warning.category for warning in caught], [RuntimeWarning])
+
+
+class MemoryReportTest(TestCase):
+    """
+    Test cases for the memory reports of the views.
+    """
+
+    def test_memory_report(self):
+        @GET('a', type='int', validators='required | max: 10', cache=True)
+        @GET('b', validators='in: x, y')
+        def view(request, a, b):
+            pass
+
+        reports = memory_report()
+        # The size of the instance dicts depends on the other plans, which are all compiled now.
+        report = get_plan(view).memory_report()
+        self.assertEqual(list(report), ['validators', 'params', 'steps', 'plan', 'total'])
+        self.assertTrue(all(size > 0 for size in report.values()))
+        self.assertEqual(report['total'], sum(report.values()) - report['total'])
+        self.assertEqual(reports[get_plan(view).label], report)
+
+    def test_more_params(self):
+        @GET('a', validators='required')
+        def small(request, a):
+            pass
+
+        @GET('a', validators='required')
+        @GET('b', validators='required')
+        @GET('c', validators='required')
+        def large(request, a, b, c):
+            pass
+
+        small_report = get_plan(small).memory_report()
+        large_report = get_plan(large).memory_report()
+        self.assertGreater(large_report['params'], small_report['params'])
+        self.assertGreater(large_report['steps'], small_report['steps'])
+        # The validators of the same string are shared.
+        self.assertEqual(large_report['validators'], small_report['validators'])
@@ -0,0 +1,143 @@
+import json
+
+import ddt
+from django.test import TestCase, RequestFactory
+
+from django_validator.decorators import GET, URI, options
+from django_validator.exceptions import ValidationError
+from django_validator.plans import get_plan
+from django_validator.schema import field, SchemaValidator
+from django_validator.validators import ValidatorRegistry
+
+SCHEMA = {
+    'status': 'required | in: open,closed',
+    'price': field(type='float', validators='min: 0'),
+    'range': {
+        'start': field(type='int', validators='required'),
+        'end': field(type='int', default=100),
+    },
+    'items': field(many=True, schema={'sku': 'required | max: 4', 'qty': field(type='int')}),
+}
+
+
+@ddt.ddt
+class SchemaTest(TestCase):
+    """
+    Test cases for the params with nested schemas.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        @GET('filters', type='object', schema=SCHEMA)
+        def view(request, filters):
+            return filters
+
+        self.view = view
+
+    def get(self, filters):
+        return self.view(self.factory.get('/test', {'filters': json.dumps(filters)}))
+
+    def test_valid(self):
+        filters = {
+            'status': 'open',
+            'price': '1.5',
+            'range': {'start': '2'},
+            'items': [{'sku': 'a1', 'qty': 3}, None],
+            'other': 1,
+        }
+        self.assertEqual(self.get(filters), {
+            'status': 'open',
+            'price': 1.5,
+            'range': {'start': 2, 'end': 100},
+            'items': [{'sku': 'a1', 'qty': 3}, None],
+        })
+
+    def test_missing(self):
+        @GET('filters', schema={'a': 'required'})
+        def view(request, filters):
+            return filters
+
+        self.assertIsNone(view(self.factory.get('/test')))
+
+    @ddt.data(
+        ({'status': 'x', 'range': {'start': 1}}, 'in_validator', 'filters.status'),
+        ({'status': 'open', 'price': -1, 'range': {'start': 1}}, 'min_validator', 'filters.price'),
+        ({'status': 'open', 'range': {}}, 'required_validator', 'filters.range.start'),
+        ({'status': 'open', 'range': {'start': 1}, 'items': [{'sku': 'a'}, {'sku': 'long sku'}]}, 'max_validator',
+         'filters.items[1].sku'),
+        ({'status': 'open', 'range': {'start': 'x'}}, 'integer_validator', 'filters.range.start'),
+        ({'status': 'open', 'range': [1]}, 'object_validator', 'filters.range'),
+        ([], 'object_validator', 'filters'),
+    )
+    @ddt.unpack
+    def test_invalid(self, filters, code, key):
+        with self.assertRaises(ValidationError) as context:
+            self.get(filters)
+        self.assertEqual(context.exception.code, code)
+        self.assertIn(key, context.exception.message)
+
+    def test_not_json(self):
+        with self.assertRaises(ValidationError) as context:
+            self.view(self.factory.get('/test', {'filters': '{'}))
+        self.assertEqual(context.exception.code, 'json_validator')
+
+    def test_many(self):
+        @URI('rows', many=True, schema={'id': field(type='int', validators='required')})
+        def view(request, rows):
+            return rows
+
+        request = self.factory.get('/test')
+        self.assertEqual(view(request, rows=['{"id": "1"}', {'id': 2}]), [{'id': 1}, {'id': 2}])
+        with self.assertRaises(ValidationError) as context:
+            view(request, rows=[{'id': 1}, {}])
+        self.assertIn('rows[1].id', context.exception.message)
+
+    def test_many_strings(self):
+        @GET('f', schema={'tags': field(many=True), 'ids': field(type='int', many=True)})
+        def view(request, f):
+            return f
+
+        request = self.factory.get('/test', {'f': json.dumps({'tags': 'a,b', 'ids': '1,2'})})
+        self.assertEqual(view(request), {'tags': ['a', 'b'], 'ids': [1, 2]})
+        request = self.factory.get('/test', {'f': json.dumps({'tags': ['a', 'b']})})
+        self.assertEqual(view(request), {'tags': ['a', 'b'], 'ids': []})
+
+    def test_cached_object(self):
+        @GET('f', type='object', cache=True, schema={'range': {'start': field(type='int')}})
+        def view(request, f):
+            f['other'] = 1
+            f['range']['start'] += 1
+            return f
+
+        request = self.factory.get('/test', {'f': json.dumps({'range': {'start': 1}})})
+        for _ in range(2):
+            self.assertEqual(view(request), {'range': {'start': 2}, 'other': 1})
+        self.assertEqual(view.__params__[0].cache_info()['hits'], 1)
+
+    def test_compiled_once(self):
+        plan = get_plan(self.view)
+        validator = plan.steps[0].validators[-1]
+        self.assertIsInstance(validator, SchemaValidator)
+        self.assertIs(get_plan(self.view).steps[0].validators[-1], validator)
+        # The leaf validators are the shared chains of the registry.
+        status = validator.node.keys[0]
+        self.assertEqual(status.validators, ValidatorRegistry.get_chain('required | in: open,closed'))
+
+    def test_collect_errors(self):
+        @options(collect_errors=True)
+        @GET('filters', schema={'a': 'required'})
+        @GET('b', validators='required')
+        def view(request, filters, b):
+            return filters, b
+
+        with self.assertRaises(ValidationError) as context:
+            view(self.factory.get('/test', {'filters': '{}'}))
+        self.assertEqual(context.exception.code_dict, {'filters': ['required_validator'], 'b': ['required_validator']})
+
+    def test_invalid_schema(self):
+        @GET('a', schema={'b': 1})
+        def view(request, a):
+            return a
+
+        self.assertRaises(TypeError, get_plan, view)
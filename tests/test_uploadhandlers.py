@@ -0,0 +1,126 @@
+import io
+import warnings
+
+from django.conf.urls import url
+from django.http import HttpResponse
+from django.middleware.csrf import _get_new_csrf_token
+from django.test import TestCase, RequestFactory, Client, override_settings
+
+from django_validator.decorators import FILE, POST, options
+from django_validator.exceptions import ValidationError
+from django_validator.uploadhandlers import ValidatingUploadHandler, sniff_extensions
+
+PNG = b'\x89PNG\r\n\x1a\n'
+
+
+@options(stream_uploads=True)
+@FILE('f', validators='max: 100')
+def upload_view(request, f):
+    return HttpResponse(type(request.upload_handlers[0]).__name__)
+
+
+urlpatterns = [url(r'^upload$', upload_view)]
+
+
+def upload(name, content):
+    stream = io.BytesIO(content)
+    stream.name = name
+    return stream
+
+
+class UploadHandlerTest(TestCase):
+    """
+    Test cases for validating files while uploading.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        @options(stream_uploads=True, sniff_uploads=True)
+        @FILE('f', validators='required | between: 4, 1000 | ext_in: png, gif')
+        @POST('a', validators='required')
+        def view(request, f, a):
+            return f.read(), a
+
+        self.view = view
+
+    def post(self, data):
+        request = self.factory.post('/test', data=data)
+        try:
+            return self.view(request)
+        except ValidationError as e:
+            return e
+        finally:
+            self.handler = request.upload_handlers[0]
+
+    def test_valid(self):
+        self.assertEqual(self.post({'f': upload('a.png', PNG + b'data'), 'a': 'a'}), (PNG + b'data', 'a'))
+        self.assertIsInstance(self.handler, ValidatingUploadHandler)
+        self.assertIsNone(self.handler.error)
+
+    def test_extension(self):
+        error = self.post({'f': upload('a.jpg', PNG), 'a': 'a'})
+        self.assertEqual(error.code, 'ext_in_validator')
+        self.assertEqual(self.handler.received, 0)
+
+    def test_sniff(self):
+        error = self.post({'f': upload('a.png', b'%PDF-1.4 data'), 'a': 'a'})
+        self.assertEqual(error.code, 'ext_in_validator')
+
+    def test_too_large(self):
+        error = self.post({'f': upload('a.png', PNG + b'0' * 300000), 'a': 'a'})
+        self.assertEqual(error.code, 'between_validator')
+        self.assertEqual(error.messages, ['The f must be between 4 and 1000 bytes.'])
+        # The upload is halted after the first chunk.
+        self.assertLess(self.handler.received, 300000)
+
+    def test_too_small(self):
+        error = self.post({'f': upload('a.png', b'GIF'), 'a': 'a'})
+        self.assertEqual(error.code, 'between_validator')
+
+    def test_collect_errors(self):
+        @options(stream_uploads=True, collect_errors=True)
+        @FILE('f', validators='ext_in: png')
+        @POST('a', validators='required')
+        def view(request, f, a):
+            pass
+
+        with self.assertRaises(ValidationError) as context:
+            view(self.factory.post('/test', data={'f': upload('a.jpg', PNG)}))
+        self.assertEqual(context.exception.code_dict, {'a': ['required_validator'], 'f': ['ext_in_validator']})
+
+    def test_sniff_extensions(self):
+        self.assertEqual(sniff_extensions(PNG), ('.png',))
+        self.assertEqual(sniff_extensions(b'\xff\xd8\xff\xe0'), ('.jpg', '.jpeg'))
+        self.assertEqual(sniff_extensions(b'text'), ())
+        self.assertEqual(sniff_extensions(b'BMW,Audi\n'), ())
+
+
+@override_settings(ROOT_URLCONF='tests.test_uploadhandlers')
+class StreamUploadsMiddlewareTest(TestCase):
+    """
+    Test cases for installing the upload handler before CsrfViewMiddleware reads the body.
+    """
+
+    def post(self, content):
+        client = Client(enforce_csrf_checks=True)
+        token = _get_new_csrf_token()
+        client.cookies['csrftoken'] = token
+        return client.post('/upload', data={'f': upload('a.txt', content)}, HTTP_X_CSRFTOKEN=token)
+
+    @override_settings(MIDDLEWARE=['django_validator.uploadhandlers.StreamUploadsMiddleware',
+                                   'django.middleware.csrf.CsrfViewMiddleware'])
+    def test_installed_before_csrf(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            self.assertEqual(self.post(b'data').content, b'ValidatingUploadHandler')
+            with self.assertRaises(ValidationError) as context:
+                self.post(b'x' * 300 * 1024)
+        self.assertEqual(context.exception.code, 'max_validator')
+
+    @override_settings(MIDDLEWARE=['django.middleware.csrf.CsrfViewMiddleware'])
+    def test_parsed_by_csrf(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertNotEqual(self.post(b'data').content, b'ValidatingUploadHandler')
+        self.assertEqual([warning.category for warning in caught], [RuntimeWarning])
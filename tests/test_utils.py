@@ -0,0 +1,67 @@
+import sys
+
+import mock
+from django.test import TestCase
+
+from django_validator.utils import LRUCache, get_size
+
+
+class LRUCacheTest(TestCase):
+    """
+    Test cases for the LRU cache.
+    """
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_info(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+        self.assertEqual(cache.info(), {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2})
+        cache.clear()
+        self.assertEqual(cache.info(), {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 2})
+
+    def test_ttl(self):
+        cache = LRUCache(2, ttl=10)
+        with mock.patch('django_validator.utils._monotonic', return_value=100):
+            cache.set('a', 1)
+        with mock.patch('django_validator.utils._monotonic', return_value=105):
+            self.assertEqual(cache.get('a'), 1)
+            self.assertIn('a', cache)
+        with mock.patch('django_validator.utils._monotonic', return_value=110):
+            self.assertNotIn('a', cache)
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.info(), {'hits': 1, 'misses': 1, 'size': 0, 'maxsize': 2})
+
+
+class GetSizeTest(TestCase):
+    """
+    Test cases for estimating the memory of objects.
+    """
+
+    def test_containers(self):
+        value = 'x' * 100
+        self.assertEqual(get_size([value, value]), sys.getsizeof([value, value]) + sys.getsizeof(value))
+        self.assertEqual(get_size({'a': value}), sys.getsizeof({'a': value}) + sys.getsizeof('a') + sys.getsizeof(value))
+
+    def test_instances(self):
+        cache = LRUCache(2)
+        self.assertGreater(get_size(cache), sys.getsizeof(cache) + sys.getsizeof(cache.__dict__))
+        # Functions and classes are not counted.
+        self.assertEqual(get_size([len, LRUCache]), sys.getsizeof([len, LRUCache]))
+
+    def test_seen(self):
+        value = ['x' * 100]
+        seen = set()
+        size = get_size(value, seen)
+        self.assertEqual(get_size(value, seen), 0)
+        self.assertEqual(get_size([value], seen), get_size([value]) - size)
@@ -2,6 +2,7 @@ import ddt
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 
+from django_validator.filevalidators import ExtInValidator, ExtNotInValidator
 from django_validator.validators import *
 
 
@@ -11,6 +12,18 @@ def string2byte(_str):
     return bytes(_str, encoding='utf8')
 
 
+def get_state(validator):
+    """
+    Get the attributes of a validator, in both the __slots__ and the __dict__.
+    """
+    state = dict(validator.__dict__)
+    for cls in type(validator).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if name != '__dict__' and hasattr(validator, name):
+                state[name] = getattr(validator, name)
+    return state
+
+
 @ddt.ddt
 class ValidatorTest(TestCase):
     """
@@ -169,3 +182,126 @@ class ValidatorTest(TestCase):
         validator = RequiredValidator()
         self.assertRaisesRegexp(ValidationError, 'TEST_VERBOSE_KEY', self._validator, validator,
                                 None, verbose_key='TEST_VERBOSE_KEY')
+
+    def test_chain_cache(self):
+        """ Test if the same validator string shares the same validator instances. """
+        chain = ValidatorRegistry.get_chain('required | in: 1, 2, 3')
+        self.assertIs(chain, ValidatorRegistry.get_chain('required | in: 1, 2, 3'))
+        self.assertIsInstance(chain, tuple)
+        self.assertEqual([type(validator) for validator in chain], [RequiredValidator, InValidator])
+
+        validators = ValidatorRegistry.get_validators('required | in: 1, 2, 3')
+        self.assertEqual(list(chain), validators)
+        validators.append(RequiredValidator())
+        self.assertEqual(len(ValidatorRegistry.get_chain('required | in: 1, 2, 3')), 2)
+
+    def test_chain_cache_invalidation(self):
+        chain = ValidatorRegistry.get_chain('required')
+        ValidatorRegistry.register('required', RequiredValidator)
+        self.assertIsNot(chain, ValidatorRegistry.get_chain('required'))
+
+    def test_regex_with_colon(self):
+        validator, = ValidatorRegistry.get_validators('regex: ^\\d+:\\d+$')
+        self.assertTrue(self._validator(validator, '10:20'))
+
+    @ddt.data(
+        (MinValidator(10), 'test', 'The test must be at least 10 characters.'),
+        (MinValidator(10), 5, 'The test must be at least 10.'),
+        (MinValidator(10), SimpleUploadedFile('test', string2byte('test')), 'The test must be at least 10 bytes.'),
+        (MaxValidator(2), 'test', 'The test may not be greater than 2 characters.'),
+        (MaxValidator(2), 5, 'The test may not be greater than 2.'),
+        (MaxValidator(2), SimpleUploadedFile('test', string2byte('test')), 'The test must not be at greater 2 bytes.'),
+        (BetweenValidator(5, 10), 'test', 'The test must be between 5 and 10 characters.'),
+        (BetweenValidator(5, 10), 1, 'The test must be between 5 and 10.'),
+        (BetweenValidator(5, 10), SimpleUploadedFile('test', string2byte('test')),
+         'The test must be between 5 and 10 bytes.'),
+    )
+    @ddt.unpack
+    def test_size_message(self, validator, value, message):
+        state = get_state(validator)
+        with self.assertRaises(ValidationError) as context:
+            self._validator(validator, value)
+        self.assertEqual(context.exception.messages, [message])
+        # The validator should not be changed when validating, so it can be shared between threads.
+        self.assertEqual(state, get_state(validator))
+
+    def test_size_custom_message(self):
+        validator = MaxValidator(2).set_message('Too long {key}')
+        self.assertRaisesRegexp(ValidationError, 'Too long test', self._validator, validator, 'test')
+
+    @ddt.data(
+        RequiredValidator(),
+        RequiredWithValidator('other'),
+        RequiredIfValidator('other', '1'),
+        MaxValidator(2),
+        BetweenValidator(1, 2),
+        RegexValidator('^a'),
+        InValidator('a'),
+        ExtInValidator('txt'),
+    )
+    def test_slots(self, validator):
+        # The built-in validators keep all their attributes in slots.
+        self.assertEqual(validator.__dict__, {})
+        validator.set_message('Invalid {key}')
+        self.assertEqual(validator.message, 'Invalid {key}')
+
+    def test_custom_validator_attributes(self):
+        class PrefixValidator(BaseValidator):
+            def __init__(self, prefix):
+                super(PrefixValidator, self).__init__()
+                self.prefix = prefix
+
+            def is_valid(self, value, params):
+                return value.startswith(self.prefix)
+
+        validator = PrefixValidator('a').set_message('Invalid {key}')
+        self.assertEqual(validator.__dict__, {'prefix': 'a', 'message': 'Invalid {key}'})
+        self.assertTrue(self._validator(validator, 'abc'))
+        self.assertRaisesRegexp(ValidationError, 'Invalid test', self._validator, validator, 'b')
+
+    def test_register_path(self):
+        self.assertIs(ValidatorRegistry.get('ext_in'), ExtInValidator)
+        self.addCleanup(ValidatorRegistry._registry.pop, 'path_test', None)
+        self.addCleanup(ValidatorRegistry._paths.pop, 'path_test', None)
+        ValidatorRegistry.register('path_test', 'django_validator.filevalidators.ExtNotInValidator')
+        self.assertNotIn('path_test', ValidatorRegistry._registry)
+        validator, = ValidatorRegistry.get_validators('path_test: txt')
+        self.assertIsInstance(validator, ExtNotInValidator)
+        self.assertEqual(validator.choices, {'.txt'})
+
+    def test_combine_regex(self):
+        validators = ValidatorRegistry.get_validators(r'required | regex: ^[a-z0-9]+$ | regex: ^a | integer | max: 3')
+        combined = combine_regex_validators(validators)
+        self.assertEqual([type(validator) for validator in combined],
+                         [RequiredValidator, CombinedRegexValidator, MaxValidator])
+        self.assertEqual(combined[1].validators, tuple(validators[1:4]))
+        self.assertEqual(combine_regex_validators(validators[:2]), validators[:2])
+
+    @ddt.data(
+        ('123', None),
+        ('a12', 'integer_validator'),
+        ('b12', 'regex_validator'),
+        ('A12', 'regex_validator'),
+        (None, None),
+        (12, None),
+    )
+    @ddt.unpack
+    def test_combined_regex_error(self, value, code):
+        validators = ValidatorRegistry.get_validators(r'regex: ^[a-z0-9]+$ | regex: ^[0-9a] | integer')
+        combined, = combine_regex_validators(validators)
+        if code is None:
+            self.assertTrue(self._validator(combined, value))
+        else:
+            with self.assertRaises(ValidationError) as context:
+                self._validator(combined, value)
+            self.assertEqual(context.exception.code, code)
+
+    @ddt.data(
+        [RegexValidator(r'^(a)\1$'), IntegerValidator()],
+        [RegexValidator(r'^(b)?'), RegexValidator(r'^(a)?(?(1)b|c)$')],
+        [RegexValidator(r'^(?P<x>a)?(?(x)b|c)$'), IntegerValidator()],
+        [RegexValidator(r'^(?P<x>a)'), RegexValidator(r'^(?P<x>a)')],
+        [RegexValidator('^a'), RegexValidator(re.compile('^a', re.I))],
+    )
+    def test_combine_regex_skipped(self, validators):
+        self.assertEqual(combine_regex_validators(validators), validators)
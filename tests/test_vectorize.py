@@ -0,0 +1,92 @@
+import unittest
+
+import ddt
+from django.test import TestCase, RequestFactory
+
+from django_validator import vectorize
+from django_validator.decorators import GET
+from django_validator.exceptions import ValidationError
+
+
+@ddt.ddt
+class VectorizeTest(TestCase):
+    """
+    Test cases for vectorized many=True params.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get(self, view, value):
+        try:
+            result = view(self.factory.get('/test', data={'a': value} if value is not None else {}))
+        except ValidationError as e:
+            return e.code, e.messages
+        return list(result) if not isinstance(result, list) else result
+
+    @ddt.data(
+        ('int', '1,2,3'),
+        ('int', '-1,20,300'),
+        ('int', None),
+        ('int', ''),
+        ('int', '1,,2'),
+        ('int', '1,a'),
+        ('int', '1.5'),
+        ('int', '0,10'),
+        ('int', '1,11'),
+        ('float', '1.5,.5,1e2,-3'),
+        ('float', '1.,2'),
+        ('float', '0,9.5'),
+        ('float', '1,x'),
+    )
+    @ddt.unpack
+    def test_same_result(self, _type, value):
+        @GET('a', type=_type, many=True, validators='between: 1, 10')
+        def view(request, a):
+            return a
+
+        @GET('a', type=_type, many=True, vectorize=True, validators='between: 1, 10')
+        def array_view(request, a):
+            return a
+
+        @GET('a', type=_type, many=True, vectorize='list', validators='between: 1, 10')
+        def list_view(request, a):
+            self.assertIsInstance(a, list)
+            return a
+
+        # Range validators can't check lists without vectorize, so compare the converted values only.
+        expected = self.get(GET('a', type=_type, many=True)(lambda request, a: a), value)
+        array_result = self.get(array_view, value)
+        if isinstance(expected, list) and expected and not all(1 <= item <= 10 for item in expected):
+            self.assertEqual(array_result[0], 'between_validator')
+        else:
+            self.assertEqual(expected, array_result)
+        self.assertEqual(array_result, self.get(list_view, value))
+
+    @unittest.skipIf(vectorize.numpy is None, 'NumPy is not installed.')
+    def test_array(self):
+        @GET('a', type='int', many=True, vectorize=True, validators='max: 5')
+        def view(request, a):
+            return a
+
+        result = view(self.factory.get('/test', data={'a': '1,2,3'}))
+        self.assertIsInstance(result, vectorize.numpy.ndarray)
+        self.assertEqual(result.tolist(), [1, 2, 3])
+        with self.assertRaisesRegexp(ValidationError, 'The a may not be greater than 5.'):
+            view(self.factory.get('/test', data={'a': '1,6'}))
+        # Arrays are limited to int64.
+        with self.assertRaisesRegexp(ValidationError, 'Type Convert error'):
+            view(self.factory.get('/test', data={'a': '12345678901234567890'}))
+
+    def test_without_numpy(self):
+        @GET('a', type='int', many=True, vectorize=True, validators='min: 1')
+        def view(request, a):
+            return a
+
+        numpy, vectorize.numpy = vectorize.numpy, None
+        try:
+            self.assertEqual(view(self.factory.get('/test', data={'a': '1,2'})), [1, 2])
+            with self.assertRaises(ValidationError):
+                view(self.factory.get('/test', data={'a': '0,2'}))
+        finally:
+            vectorize.numpy = numpy